@@ -0,0 +1,95 @@
+import numpy as np
+
+BASE_COLUMNS = ['First_Base', 'Second_Base', 'Third_Base']
+
+
+def apply_base_corrections(decision_df, caught_stealing_events):
+    """
+    Whole-game version of verify_previous_at_bat_bases. Runs once over a finished game instead of at every
+    at-bat boundary and produces the same corrections.
+
+    At-bat numbers are contiguous within a game, so every at-bat is a run of rows [start, end) and the state we
+    trust for it is the first row of the following at-bat (the row written right after synchronize_bases).
+    """
+    import pandas as pd
+
+    if decision_df.empty:
+        return decision_df
+
+    at_bat = decision_df['At_Bat'].to_numpy(dtype=object)
+    event_type = decision_df['Event_Type'].to_numpy(dtype=object)
+    n_rows = len(at_bat)
+
+    # Row index where each at-bat starts, and where the at-bat after it starts
+    starts = np.flatnonzero(np.r_[True, at_bat[1:] != at_bat[:-1]])
+    ends = np.r_[starts[1:], n_rows]
+
+    # The last at-bat never gets verified and neither does one that is followed by a caught stealing event,
+    # since that event shares its at-bat number with the play after it
+    verified = ends < n_rows
+    verified[verified] = ~np.isin(event_type[ends[verified]], caught_stealing_events)
+
+    segment_of_row = np.repeat(np.arange(len(starts)), ends - starts)
+    row_verified = verified[segment_of_row]
+    reference_row = np.where(row_verified, ends[segment_of_row], 0)
+
+    original = {col: decision_df[col].to_numpy(dtype=object) for col in BASE_COLUMNS}
+    first, second, third = (original[col].copy() for col in BASE_COLUMNS)
+
+    # Part 1: a runner now on first can't have been on second or third earlier in the at-bat,
+    # and a runner now on second can't have been on third
+    runner_on_first = original['First_Base'][reference_row]
+    runner_on_second = original['Second_Base'][reference_row]
+    has_first = row_verified & pd.notna(runner_on_first)
+    has_second = row_verified & pd.notna(runner_on_second)
+
+    first_was_on_second = has_first & (original['Second_Base'] == runner_on_first)
+    first_was_on_third = has_first & (original['Third_Base'] == runner_on_first)
+    fix_first = first_was_on_second | first_was_on_third
+    second[first_was_on_second] = None
+    third[first_was_on_third] = None
+    first[fix_first] = runner_on_first[fix_first]
+
+    fix_second = has_second & (original['Third_Base'] == runner_on_second)
+    third[fix_second] = None
+    second[fix_second] = runner_on_second[fix_second]
+
+    corrected = {'First_Base': first, 'Second_Base': second, 'Third_Base': third}
+
+    # Part 2: pinch-runner fix-ups, only a handful of rows per game
+    sub_rows = np.flatnonzero(row_verified & (event_type == 'Offensive Substitution'))
+    if len(sub_rows):
+        columns = [col for col in decision_df.columns if col != 'Event_Type']
+        values = decision_df[columns].to_numpy(dtype=object)
+        base_positions = [columns.index(col) for col in BASE_COLUMNS]
+        for index in sub_rows:
+            segment = segment_of_row[index]
+            # The next row has to belong to the same at-bat, it didn't exist yet when the inline check ran
+            if index + 1 >= ends[segment]:
+                continue
+            sub_row = values[index]
+            next_row = values[index + 1].copy()
+            for col, pos in zip(BASE_COLUMNS, base_positions):
+                next_row[pos] = corrected[col][index + 1]
+            changed = np.flatnonzero(sub_row != next_row)
+            if len(changed) != 2:
+                continue
+
+            changed_column = changed[0]
+            old_player_id = sub_row[changed_column]
+            new_player_id = next_row[changed_column]
+            if not any(sub_row[pos] == new_player_id for pos in base_positions):
+                continue
+
+            # Use the lineup column that contained the old player before the sub as the source of truth
+            window = slice(starts[segment], index + 1)
+            source_column = columns[changed_column]
+            source = corrected[source_column] if source_column in corrected else values[:, changed_column]
+            had_old_player = source[window] == old_player_id
+            for col in BASE_COLUMNS:
+                column_window = corrected[col][window]
+                column_window[had_old_player & (column_window == new_player_id)] = old_player_id
+
+    for col in BASE_COLUMNS:
+        decision_df[col] = pd.Series(corrected[col], index=decision_df.index, dtype=object)
+    return decision_df
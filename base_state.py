@@ -0,0 +1,73 @@
+from game_state import Base, BASE_BITS
+
+# How many bases the runners already on base move up on each batter action
+BASES_TO_ADVANCE = {
+    'walks': 1,
+    'intentionally walks': 1,
+    'hit by pitch': 1,
+    'singles': 1,
+    'reaches': 1,
+    'doubles': 2,
+    'triples': 3,
+    'homers': 4,
+    'hits a grand slam': 4,
+    'hits a home run': 4,
+    'grounds into a force out': 1,
+    'grounds into a double play': 1,
+    "grounds into a fielder's choice": 1,
+}
+
+# Where the batter ends up on each action, HOME means the batter scored
+HOME = 'home'
+BATTER_DESTINATIONS = {
+    'walks': Base.FIRST,
+    'intentionally walks': Base.FIRST,
+    'hit by pitch': Base.FIRST,
+    'singles': Base.FIRST,
+    'reaches': Base.FIRST,
+    'doubles': Base.SECOND,
+    'triples': Base.THIRD,
+    'homers': HOME,
+    'hits a grand slam': HOME,
+    'hits a home run': HOME,
+    # For force outs and double plays the batter may or may not reach first, the runner movements sort it out
+    'grounds into a force out': Base.FIRST,
+    'grounds into a double play': Base.FIRST,
+    "grounds into a fielder's choice": Base.FIRST,
+}
+
+
+def _build_advance_table():
+    """
+    ADVANCE_TABLE[mask][advance] lists what happens to every runner when all of them try to move up advance bases.
+    Runners go lead runner first, and one only moves if the base in front of them is free by the time it's their turn.
+    Each entry is (moves, blocked), moves being (from_base, to_base) pairs in the order they have to be applied with
+    to_base HOME for a runner that scores, and blocked the (from_base, to_base) pairs of the runners that stay put.
+    """
+    table = []
+    for mask in range(8):
+        by_advance = [((), ())]
+        for advance in range(1, 5):
+            occupied = mask
+            moves = []
+            blocked = []
+            for base in [Base.THIRD, Base.SECOND, Base.FIRST]:
+                if not occupied & BASE_BITS[base]:
+                    continue
+                new_base_index = base.value + advance
+                if new_base_index >= 4:
+                    occupied &= ~BASE_BITS[base]
+                    moves.append((base, HOME))
+                else:
+                    new_base = Base(new_base_index)
+                    if occupied & BASE_BITS[new_base]:
+                        blocked.append((base, new_base))
+                    else:
+                        occupied = (occupied & ~BASE_BITS[base]) | BASE_BITS[new_base]
+                        moves.append((base, new_base))
+            by_advance.append((tuple(moves), tuple(blocked)))
+        table.append(by_advance)
+    return table
+
+
+ADVANCE_TABLE = _build_advance_table()
@@ -0,0 +1,65 @@
+import logging
+import time
+import pandas as pd
+from tqdm import tqdm
+from main import GameProcessor, process_game
+
+
+def benchmark_base_corrections(input_csv, num_games=None, scraped_data_dir="scraped_games",
+                               statcast_csv='helper_files/statcast_reduced2023.csv'):
+    """Replay each game with inline and with vectorized base corrections and check both give the same decisions."""
+    game_url_df = pd.read_csv(input_csv)
+    if num_games:
+        game_url_df = game_url_df.head(num_games)
+    processor = GameProcessor(scraped_data_dir)
+
+    all_statcast_reduced = pd.read_csv(statcast_csv).sort_values(
+        ['game_pk', 'inning', 'at_bat_number', 'pitch_number']
+    ).drop_duplicates(
+        subset=['game_pk', 'inning', 'inning_topbot', 'at_bat_number'],
+        keep='first'
+    ).reset_index(drop=True)
+
+    inline_time = 0.0
+    vectorized_time = 0.0
+    mismatched_games = []
+    games_compared = 0
+
+    for game_pk in tqdm(game_url_df['game_pk']):
+        try:
+            game_data = processor.load_game_data(str(game_pk))
+        except ValueError:
+            continue
+        at_bat_summary = all_statcast_reduced[all_statcast_reduced["game_pk"] == game_pk]
+
+        try:
+            ts = time.time()
+            inline_df = process_game(game_data, at_bat_summary, vectorized_corrections=False)
+            inline_time += time.time() - ts
+
+            ts = time.time()
+            vectorized_df = process_game(game_data, at_bat_summary, vectorized_corrections=True)
+            vectorized_time += time.time() - ts
+        except Exception as e:
+            print(f"Error processing game {game_pk}: {e}")
+            continue
+
+        games_compared += 1
+        # Compare what would be written to disk, the in-memory dtypes of empty cells can differ
+        if inline_df.to_csv(index=False) != vectorized_df.to_csv(index=False):
+            mismatched_games.append(game_pk)
+
+    print(f"Compared {games_compared} games")
+    print(f"Inline corrections:     {inline_time:.2f} seconds")
+    print(f"Vectorized corrections: {vectorized_time:.2f} seconds")
+    if mismatched_games:
+        print(f"{len(mismatched_games)} games differ between inline and vectorized corrections:")
+        for game_pk in mismatched_games:
+            print(game_pk)
+    else:
+        print("Inline and vectorized corrections match for every game.")
+
+
+if __name__ == "__main__":
+    logging.disable(logging.CRITICAL)
+    benchmark_base_corrections("urls/gameday_urls2023.csv")
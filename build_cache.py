@@ -0,0 +1,79 @@
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from description_parser import PARSER_VERSION
+
+MANIFEST_FILENAME = "build_manifest.json"
+
+# Bump whenever a change to the replay (handlers, corrections, output columns) can change the decisions of a game
+PROCESSING_VERSION = 1
+
+
+def game_fingerprint(game_json, at_bat_summary, registry=None, game_data=None):
+    """
+    Everything a game's decisions depend on: the scraped JSON (game_json, as saved in scraped_games/), the game's
+    Statcast at-bats, the code versions and, with a registry, the registry spellings of the game's players that
+    names can be resolved from. Passing game_data, the GameData of game_json, saves parsing the JSON for its players.
+    Processing options like vectorized_corrections and statcast_first aren't part of it, they give the same decisions.
+    Anything else a game's output depends on needs a rebuild (--rebuild) to be picked up.
+    """
+    import pandas as pd
+
+    if isinstance(game_json, str):
+        game_json = game_json.encode()
+    fingerprint = hashlib.sha256()
+    fingerprint.update(f"processing {PROCESSING_VERSION} parser {PARSER_VERSION}\n".encode())
+    fingerprint.update(hashlib.sha256(game_json).digest())
+    fingerprint.update(pd.util.hash_pandas_object(at_bat_summary, index=False).to_numpy().tobytes())
+    if registry is not None:
+        if game_data is not None:
+            player_maps = [game_data.home_player_map, game_data.away_player_map]
+        else:
+            parsed = json.loads(game_json)
+            player_maps = [parsed.get('home_player_map', {}), parsed.get('away_player_map', {})]
+        roster = {int(player_id) for player_map in player_maps for player_id in player_map}
+        fingerprint.update(json.dumps(registry.roster_spellings(roster)).encode())
+    return fingerprint.hexdigest()
+
+class BuildCache:
+    """
+    Manifest of the fingerprint each game's output was built from, kept next to the outputs.
+    A game whose fingerprint hasn't changed and whose output file is still there doesn't need to be processed again.
+    """
+
+    def __init__(self, output_dir='games'):
+        self.path = Path(output_dir) / MANIFEST_FILENAME
+        self.fingerprints = {}
+        self.dirty = False
+        if self.path.exists():
+            with open(self.path) as f:
+                self.fingerprints = json.load(f)
+
+    def is_fresh(self, game_pk, fingerprint, output_path):
+        return self.fingerprints.get(str(game_pk)) == fingerprint and Path(output_path).exists()
+
+    def record(self, game_pk, fingerprint):
+        self.fingerprints[str(game_pk)] = fingerprint
+        self.dirty = True
+
+    def forget(self, game_pk):
+        if self.fingerprints.pop(str(game_pk), None) is not None:
+            self.dirty = True
+
+    def merge(self, other):
+        """Take over the fingerprints of another manifest, e.g. a shard's whose outputs are moved in here"""
+        self.fingerprints.update(other.fingerprints)
+        if other.fingerprints:
+            self.dirty = True
+
+    def save(self):
+        if not self.dirty:
+            return
+        temp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(temp_path, 'w') as f:
+            json.dump(self.fingerprints, f, indent=0, sort_keys=True)
+        os.replace(temp_path, self.path)
+        self.dirty = False
+        logging.info(f"Saved build manifest with {len(self.fingerprints)} games to {self.path}")
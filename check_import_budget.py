@@ -0,0 +1,99 @@
+"""
+Checks that the processing entry points stay cheap to import: no Selenium, no pandas or tqdm until a run
+actually needs them, and each import under its time budget. Every import is timed in a fresh interpreter.
+
+    python check_import_budget.py
+    python check_import_budget.py --first-game 718768
+
+With --first-game the time from starting the interpreter to having that game reprocessed is checked too. The game
+is reprocessed from a copy of its scraped JSON, so the registry and play cache in scraped_games/ are left alone.
+Exits with 1 if anything is over budget. tests/test_import_budget.py checks the forbidden modules under pytest,
+the timings depend too much on the machine for a unit test.
+"""
+import argparse
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# module -> (budget in seconds, modules it must not pull in)
+IMPORT_BUDGETS = {
+    'main': (0.35, ['selenium', 'pandas', 'tqdm']),
+    'cli': (0.1, ['selenium', 'pandas', 'numpy', 'tqdm']),
+    'game_data': (0.05, ['selenium', 'pandas', 'numpy']),
+}
+FIRST_GAME_BUDGET = 1.0
+# The probes import the repo's modules and run cli.py, whatever directory this is run from
+REPO_DIR = Path(__file__).resolve().parent
+
+IMPORT_PROBE = """
+import sys, time
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start)
+print(' '.join(sorted(name for name in sys.modules if name.split('.')[0] in {forbidden!r})))
+"""
+
+
+def check_import(module, budget, forbidden):
+    """Import module in a new interpreter, return the problems found. A budget of None only checks forbidden."""
+    output = subprocess.run([sys.executable, '-c', IMPORT_PROBE.format(module=module, forbidden=forbidden)],
+                            capture_output=True, text=True, check=True, cwd=REPO_DIR).stdout.splitlines()
+    elapsed = float(output[0])
+    loaded = output[1].split() if len(output) > 1 else []
+    print(f"import {module}: {elapsed:.3f}s" + (f" (budget {budget:.2f}s)" if budget is not None else ""))
+    problems = []
+    if budget is not None and elapsed > budget:
+        problems.append(f"importing {module} took {elapsed:.3f}s, over its {budget:.2f}s budget")
+    top_level = sorted({name.split('.')[0] for name in loaded})
+    if top_level:
+        problems.append(f"importing {module} loaded {', '.join(top_level)}")
+    return problems
+
+
+def check_first_game(game_pk, budget=FIRST_GAME_BUDGET, scraped_dir=REPO_DIR / "scraped_games"):
+    """
+    Reprocess one game from a cold interpreter. Everything it writes, the registry and play cache it builds
+    included, goes to a scratch directory. A budget of None only checks the decisions were written.
+    """
+    with tempfile.TemporaryDirectory() as scratch_dir:
+        scratch_dir = Path(scratch_dir)
+        scratch_scraped_dir = scratch_dir / "scraped_games"
+        scratch_scraped_dir.mkdir()
+        shutil.copy(Path(scraped_dir) / f"game_{game_pk}.json", scratch_scraped_dir)
+        start = time.perf_counter()
+        subprocess.run([sys.executable, 'cli.py', 'process', '--game-id', str(game_pk), '--rebuild',
+                        '--scraped-dir', str(scratch_scraped_dir), '--games-dir', str(scratch_dir / "games"),
+                        '--stats-dir', str(scratch_dir / "events_data"), '--log-level', 'ERROR'],
+                       capture_output=True, check=True, cwd=REPO_DIR)
+        elapsed = time.perf_counter() - start
+        written = any((scratch_dir / "games").glob(f"game_{game_pk}_decisions.*"))
+    print(f"reprocessing game {game_pk}: {elapsed:.3f}s" + (f" (budget {budget:.2f}s)" if budget is not None else ""))
+    problems = []
+    if not written:
+        problems.append(f"reprocessing game {game_pk} didn't write its decisions")
+    if budget is not None and elapsed > budget:
+        problems.append(f"reprocessing game {game_pk} took {elapsed:.3f}s, over its {budget:.2f}s budget")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--first-game', type=int, help="also time reprocessing this game end to end")
+    args = parser.parse_args(argv)
+
+    problems = []
+    for module, (budget, forbidden) in IMPORT_BUDGETS.items():
+        problems += check_import(module, budget, forbidden)
+    if args.first_game:
+        problems += check_first_game(args.first_game)
+
+    for problem in problems:
+        print(f"FAIL: {problem}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
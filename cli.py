@@ -0,0 +1,405 @@
+"""
+Command line entry point for unattended runs.
+
+    python cli.py scrape --start-date 2023-04-01 --end-date 2023-04-30
+    python cli.py process --workers 8 --shard 2/4 --format parquet --log-level WARNING
+    python cli.py validate --games-dir games/shard_2_of_4 --shard 2/4
+    python cli.py merge games/shard_*_of_4
+    python cli.py pipeline --workers 4       # scrape and process at once, see pipeline.py
+    python cli.py export --output-dir features   # see feature_export.py
+    python cli.py postings 543037 --roles Home_Pitcher Away_Pitcher --together 660271 --together-roles First_Base
+    python cli.py serve                      # see processing_daemon.py
+    python cli.py send process 718768
+
+A shard (--shard i/N) takes the games whose game_pk hashes to i out of N, so a season can be split across
+machines. A sharded process run writes its game files, build manifest, event stats and error log to its own
+games/shard_i_of_N directory, and merge moves any number of those back into games/ and events_data/.
+"""
+import argparse
+import datetime
+import logging
+import shutil
+import sys
+import zlib
+from pathlib import Path
+
+DEFAULT_URLS_CSV = "urls/gameday_urls2023.csv"
+LOG_LEVELS = ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']
+
+
+def parse_shard(value):
+    """'i/N' -> (i, N)"""
+    try:
+        index, count = (int(part) for part in value.split('/'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Shard '{value}' should look like i/N, e.g. 0/4")
+    if count < 1 or not 0 <= index < count:
+        raise argparse.ArgumentTypeError(f"Shard '{value}' needs 0 <= i < N")
+    return index, count
+
+
+def in_shard(game_pk, shard):
+    # crc32 rather than hash() so every machine agrees on the split
+    index, count = shard
+    return zlib.crc32(str(int(game_pk)).encode()) % count == index
+
+
+def shard_dir(base_dir, shard):
+    index, count = shard
+    return Path(base_dir) / f"shard_{index}_of_{count}"
+
+
+def select_games(game_url_df, shard=None, start_date=None, end_date=None):
+    """The rows of a urls CSV in the shard and between the dates (both inclusive)"""
+    import pandas as pd
+
+    selected = pd.Series(True, index=game_url_df.index)
+    if start_date or end_date:
+        dates = pd.to_datetime(game_url_df[['year', 'month', 'day']]).dt.date
+        if start_date:
+            selected &= dates >= start_date
+        if end_date:
+            selected &= dates <= end_date
+    if shard:
+        selected &= game_url_df['game_pk'].map(lambda game_pk: in_shard(game_pk, shard))
+    return game_url_df[selected]
+
+
+def _filters_games(args):
+    return args.shard is not None or args.start_date is not None or args.end_date is not None
+
+
+def run_scrape(args):
+    from scraper import GameScraper
+
+    scraper = GameScraper(args.csv, args.scraped_dir, trust_seeded_rosters=args.trust_seeded_rosters)
+    logging.getLogger().setLevel(args.log_level)
+    if _filters_games(args):
+        scraper.games_df = select_games(scraper.games_df, args.shard, args.start_date, args.end_date)
+    scraper.scrape_games(args.start_index, args.end_index)
+    return 0
+
+
+def processing_options(args):
+    """The create_dataset options shared by process and pipeline"""
+    options = dict(scraped_data_dir=args.scraped_dir, vectorized_corrections=args.vectorized_corrections,
+                   output_format=args.format, rebuild=args.rebuild, verify_alignment=args.verify_alignment,
+                   statcast_first=args.engine == 'statcast', workers=args.workers)
+    if args.shard:
+        # Everything the shard writes stays in its own directory until it's merged
+        output_dir = shard_dir(args.games_dir, args.shard)
+        options.update(output_dir=str(output_dir), stats_dir=str(output_dir),
+                       error_log_path=str(output_dir / 'game_processing_errors.log'))
+    else:
+        options.update(output_dir=args.games_dir, stats_dir=args.stats_dir)
+    return options
+
+
+def run_process(args):
+    import pandas as pd
+    from main import create_dataset
+
+    options = processing_options(args)
+    options['debug_game_pk'] = args.debug_game
+    game_ids = None
+    if _filters_games(args):
+        game_ids = select_games(pd.read_csv(args.csv), args.shard, args.start_date, args.end_date)['game_pk']
+        game_ids = list(game_ids)[:args.num_games]
+        logging.info(f"Processing {len(game_ids)} selected games")
+    create_dataset(args.num_games, args.csv, args.game_id, game_ids=game_ids, **options)
+    return 0
+
+
+def run_pipeline(args):
+    from pipeline import run_pipeline as run
+
+    games_df = None
+    if _filters_games(args):
+        import pandas as pd
+
+        games_df = select_games(pd.read_csv(args.csv), args.shard, args.start_date, args.end_date)
+    run(args.csv, games_df=games_df, start_index=args.start_index, end_index=args.end_index,
+        queue_size=args.queue_size, trust_seeded_rosters=args.trust_seeded_rosters, **processing_options(args))
+    return 0
+
+
+def run_validate(args):
+    """Check written games for missing pitchers and, unless --no-alignment, against the urls CSV timelines"""
+    import pandas as pd
+    from defensive_timeline import build_game_timelines, find_alignment_disagreements
+
+    game_url_df = select_games(pd.read_csv(args.csv), args.shard, args.start_date, args.end_date)
+    games_dir = Path(args.games_dir)
+    missing_pitchers = []
+    unreadable = []
+    disagreements = []
+    checked = 0
+    for _, row in game_url_df.iterrows():
+        game_pk = row['game_pk']
+        paths = [games_dir / f"game_{game_pk}_decisions.{output_format}" for output_format in ['csv', 'parquet']]
+        path = next((path for path in paths if path.exists()), None)
+        if path is None:
+            continue
+        try:
+            decision_df = pd.read_parquet(path) if path.suffix == '.parquet' else pd.read_csv(path)
+        except Exception as e:
+            logging.warning(f"Couldn't read {path}: {e}")
+            unreadable.append(game_pk)
+            continue
+        checked += 1
+        if decision_df['Home_Pitcher'].isnull().any() or decision_df['Away_Pitcher'].isnull().any():
+            missing_pitchers.append(game_pk)
+        if args.alignment:
+            game_disagreements = find_alignment_disagreements(decision_df, build_game_timelines(row))
+            if len(game_disagreements):
+                game_disagreements.insert(0, 'game_pk', game_pk)
+                disagreements.append(game_disagreements)
+
+    print(f"Checked {checked} games in {games_dir}")
+    print(f"  {len(unreadable)} unreadable, {len(missing_pitchers)} with missing pitchers")
+    if missing_pitchers:
+        print(f"  Missing pitchers: {missing_pitchers}")
+    if args.alignment:
+        print(f"  {sum(len(df) for df in disagreements)} pitcher and fielder disagreements "
+              f"in {len(disagreements)} games")
+        if disagreements and args.report:
+            pd.concat(disagreements, ignore_index=True).to_csv(args.report, index=False)
+            print(f"  Written to {args.report}")
+    return 1 if unreadable or missing_pitchers else 0
+
+
+def run_merge(args):
+    """Move the outputs of shard directories into the main games and stats directories"""
+    from build_cache import BuildCache
+    from event_stats import EventStats
+    from player_postings import PlayerPostings
+
+    games_dir = Path(args.games_dir)
+    games_dir.mkdir(parents=True, exist_ok=True)
+    build_cache = BuildCache(games_dir)
+    event_stats = EventStats.load_dir(args.stats_dir)
+    postings = PlayerPostings.load_dir(games_dir)
+    error_logs = []
+    merged_files = []
+    for directory in map(Path, args.shard_dirs):
+        moved = 0
+        for path in directory.glob("game_*_decisions.*"):
+            if not path.name.endswith('.tmp'):
+                shutil.move(str(path), games_dir / path.name)
+                moved += 1
+        shard_cache = BuildCache(directory)
+        shard_stats = EventStats.load_dir(directory)
+        shard_postings = PlayerPostings.load_dir(directory)
+        build_cache.merge(shard_cache)
+        event_stats.merge(shard_stats)
+        postings.merge(shard_postings)
+        error_log = directory / 'game_processing_errors.log'
+        if error_log.exists():
+            error_logs.append(error_log.read_text())
+        merged_files += [shard_cache.path, shard_stats.index.path, shard_stats.counts_path,
+                         Path(shard_stats.stats_csv), shard_postings.path, error_log]
+        logging.info(f"Merged {moved} games from {directory}")
+    build_cache.save()
+    event_stats.save()
+    postings.save()
+    if error_logs:
+        with open(args.error_log, 'a') as f:
+            f.write("".join(error_logs))
+    # Only once everything is saved, the shards' state is in the main directories now and merging a shard again
+    # mustn't apply it a second time
+    for path in merged_files:
+        path.unlink(missing_ok=True)
+    return 0
+
+
+def run_export(args):
+    from feature_export import export_features
+
+    game_pks = None
+    if _filters_games(args):
+        import pandas as pd
+
+        game_pks = select_games(pd.read_csv(args.csv), args.shard, args.start_date, args.end_date)['game_pk']
+    export_features(args.games_dir, args.output_dir, game_pks)
+    return 0
+
+
+def run_postings(args):
+    """Print the decision points of a player, or of two players together"""
+    from player_postings import PlayerPostings, ROLES
+
+    if args.build:
+        postings = PlayerPostings.build(args.games_dir)
+        postings.save()
+    else:
+        paths = args.postings or [str(Path(args.games_dir) / 'player_postings.npz')]
+        postings = PlayerPostings.load(*paths)
+    if args.player is None:
+        return 0
+    if args.together is None:
+        game_pks, rows, roles = postings.find(args.player, args.roles)
+        print(f"Player {args.player}: {len(rows)} postings in {len(set(game_pks.tolist()))} games")
+        for game_pk, row, role in list(zip(game_pks, rows, roles))[:args.limit]:
+            print(f"  {game_pk} row {row}: {ROLES[role]}")
+    else:
+        game_pks, rows = postings.find_together(args.player, args.together, args.roles, args.together_roles)
+        print(f"Players {args.player} and {args.together}: {len(rows)} decision points "
+              f"in {len(set(game_pks.tolist()))} games")
+        for game_pk, row in list(zip(game_pks, rows))[:args.limit]:
+            print(f"  {game_pk} row {row}")
+    return 0
+
+
+def run_serve(args):
+    from processing_daemon import ProcessingService, serve
+
+    service = ProcessingService(args.csv, args.scraped_dir, args.output_dir, args.format)
+    serve(service, args.host, args.port)
+    return 0
+
+
+def run_send(args):
+    import json
+    from processing_daemon import send_request
+
+    request = {'command': args.request}
+    if args.request == 'process':
+        if args.game_pk is None:
+            raise SystemExit("process needs a game_pk")
+        request.update(game_pk=args.game_pk, rows=args.rows, vectorized_corrections=args.vectorized_corrections,
+                       statcast_first=args.engine == 'statcast')
+    elif args.request == 'reload':
+        request['data'] = args.data
+    response = send_request(request, args.host, args.port)
+    print(json.dumps(response))
+    return 0 if response.get('ok') else 1
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Scrape MLB gameday data and build the decision point dataset")
+    commands = parser.add_subparsers(dest='command', required=True)
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--log-level', default='WARNING', choices=LOG_LEVELS, type=str.upper)
+
+    def add_game_selection(command):
+        command.add_argument('--csv', default=DEFAULT_URLS_CSV, help="urls CSV listing the games")
+        command.add_argument('--shard', type=parse_shard, help="only the games of shard i of N, as i/N")
+        command.add_argument('--start-date', type=datetime.date.fromisoformat, help="first game date, YYYY-MM-DD")
+        command.add_argument('--end-date', type=datetime.date.fromisoformat, help="last game date, YYYY-MM-DD")
+        command.add_argument('--scraped-dir', default="scraped_games")
+
+    def add_scrape_options(command):
+        command.add_argument('--trust-seeded-rosters', action='store_true',
+                             help="use the urls CSV rosters and skip the box page of games whose players are all known")
+
+    scrape = commands.add_parser('scrape', parents=[common], help="scrape box scores and play-by-play into the scraped games directory")
+    add_game_selection(scrape)
+    scrape.add_argument('--start-index', type=int, default=0)
+    scrape.add_argument('--end-index', type=int)
+    add_scrape_options(scrape)
+    scrape.set_defaults(run=run_scrape)
+
+    def add_processing_options(command):
+        command.add_argument('--workers', type=int, default=1, help="worker processes replaying games")
+        command.add_argument('--format', default='csv', choices=['csv', 'parquet'])
+        command.add_argument('--engine', default='replay', choices=['replay', 'statcast'],
+                             help="statcast only parses the events whose effect Statcast doesn't give us")
+        command.add_argument('--vectorized-corrections', action='store_true')
+        command.add_argument('--rebuild', action='store_true', help="reprocess games even if they're up to date")
+        command.add_argument('--verify-alignment', action='store_true',
+                             help="check pitchers and fielders against the urls CSV")
+        command.add_argument('--games-dir', default='games')
+        command.add_argument('--stats-dir', default='events_data')
+
+    process = commands.add_parser('process', parents=[common], help="replay scraped games into decision point files")
+    add_game_selection(process)
+    add_processing_options(process)
+    process.add_argument('--num-games', type=int, default=10000)
+    process.add_argument('--game-id', type=int, help="only this game")
+    process.add_argument('--debug-game', type=int, help="dump the replay trace of this game")
+    process.set_defaults(run=run_process)
+
+    pipeline = commands.add_parser('pipeline', parents=[common],
+                                   help="scrape games and replay each one as soon as it's scraped")
+    add_game_selection(pipeline)
+    add_processing_options(pipeline)
+    pipeline.add_argument('--start-index', type=int, default=0)
+    pipeline.add_argument('--end-index', type=int)
+    add_scrape_options(pipeline)
+    pipeline.add_argument('--queue-size', type=int, default=16,
+                          help="scraped games waiting to be processed before the scraper waits")
+    pipeline.set_defaults(run=run_pipeline)
+
+    validate = commands.add_parser('validate', parents=[common], help="check written decision point files")
+    add_game_selection(validate)
+    validate.add_argument('--games-dir', default='games')
+    validate.add_argument('--no-alignment', dest='alignment', action='store_false',
+                          help="skip the check against the urls CSV timelines")
+    validate.add_argument('--report', help="CSV to write the alignment disagreements to")
+    validate.set_defaults(run=run_validate)
+
+    merge = commands.add_parser('merge', parents=[common], help="move the outputs of sharded process runs into games/")
+    merge.add_argument('shard_dirs', nargs='+')
+    merge.add_argument('--games-dir', default='games')
+    merge.add_argument('--stats-dir', default='events_data')
+    merge.add_argument('--error-log', default='game_processing_errors.log')
+    merge.set_defaults(run=run_merge)
+
+    export = commands.add_parser('export', parents=[common],
+                                 help="write the decision points as memory-mapped NumPy arrays for training")
+    add_game_selection(export)
+    export.add_argument('--games-dir', default='games')
+    export.add_argument('--output-dir', default='features')
+    export.set_defaults(run=run_export)
+
+    postings = commands.add_parser('postings', parents=[common],
+                                   help="look up the decision points of a player, or of two players together")
+    postings.add_argument('player', type=int, nargs='?')
+    postings.add_argument('--roles', nargs='+', help="only these columns, e.g. Home_Pitcher Away_Pitcher")
+    postings.add_argument('--together', type=int, help="only decision points this player is also in")
+    postings.add_argument('--together-roles', nargs='+', help="the columns of the --together player")
+    postings.add_argument('--games-dir', default='games')
+    postings.add_argument('--postings', nargs='+', help="postings files to query, e.g. one per season")
+    postings.add_argument('--build', action='store_true',
+                          help="index the decision files in --games-dir again first")
+    postings.add_argument('--limit', type=int, default=20, help="decision points to print")
+    postings.set_defaults(run=run_postings)
+
+    def add_address(command):
+        command.add_argument('--host', default='127.0.0.1')
+        command.add_argument('--port', type=int, default=8765)
+
+    serve = commands.add_parser('serve', parents=[common],
+                                help="keep Statcast and the registry in memory and process games on request")
+    add_address(serve)
+    serve.add_argument('--csv', default=DEFAULT_URLS_CSV)
+    serve.add_argument('--scraped-dir', default="scraped_games")
+    serve.add_argument('--output-dir', default="daemon_games")
+    serve.add_argument('--format', default='csv', choices=['csv', 'parquet'])
+    serve.set_defaults(run=run_serve)
+
+    send = commands.add_parser('send', parents=[common], help="send a request to a running serve")
+    add_address(send)
+    send.add_argument('request', choices=['process', 'reload', 'ping', 'shutdown'])
+    send.add_argument('game_pk', type=int, nargs='?')
+    send.add_argument('--rows', action='store_true', help="return the decision rows instead of writing a file")
+    send.add_argument('--engine', default='replay', choices=['replay', 'statcast'])
+    send.add_argument('--vectorized-corrections', action='store_true')
+    send.add_argument('--data', action='store_true', help="with reload, also re-read Statcast and the registry")
+    send.set_defaults(run=run_send)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command in ('scrape', 'pipeline'):
+        # The scraper sets up its own queued console and file logging, only the level is ours
+        logging.getLogger().setLevel(args.log_level)
+    else:
+        logging.basicConfig(level=args.log_level, format="%(asctime)s - %(levelname)s - %(message)s")
+    return args.run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+from bisect import bisect_left, bisect_right
+import numpy as np
+from url_encodings import parse_appearances, parse_position_appearances
+
+FIELDING_POSITIONS = ['C', '1B', '2B', '3B', 'SS', 'LF', 'CF', 'RF']
+
+
+def half_inning_ordinal(inning, half):
+    """Top 1 -> 0, Bot 1 -> 1, Top 2 -> 2, ..."""
+    return (int(inning) - 1) * 2 + (0 if half == 'Top' else 1)
+
+
+class Timeline:
+    """Who held one role (the mound, a position) from which half-inning on, looked up by bisecting the start halves"""
+
+    def __init__(self):
+        self.starts = []
+        self.players = []
+
+    def add(self, ordinal, player_id):
+        # Entries come in game order, the odd out of order one is put in its place
+        position = bisect_right(self.starts, ordinal)
+        self.starts.insert(position, ordinal)
+        self.players.insert(position, player_id)
+
+    def at(self, ordinal):
+        """The player holding the role by the end of this half-inning, None before anyone has"""
+        position = bisect_right(self.starts, ordinal)
+        return self.players[position - 1] if position else None
+
+    def candidates(self, ordinal):
+        """Everyone who held the role at some point of this half-inning: who started it and anyone who came in"""
+        first = bisect_left(self.starts, ordinal)
+        last = bisect_right(self.starts, ordinal)
+        players = set(self.players[first:last])
+        if first:
+            players.add(self.players[first - 1])
+        return players
+
+
+class TeamTimeline:
+    """
+    The pitcher and fielders of one team over a game, from the urls CSV encodings.
+    The encodings list a player when they enter the game, so a switch between two players already in the game
+    isn't in here and the timeline keeps them at their old positions.
+    """
+
+    def __init__(self, pitchers, position_players):
+        self.pitcher = Timeline()
+        for player_id, half, inning in parse_appearances(pitchers):
+            self.pitcher.add(half_inning_ordinal(inning, half), player_id)
+        self.fielders = {position: Timeline() for position in FIELDING_POSITIONS}
+        for player_id, half, inning, position in parse_position_appearances(position_players):
+            if position in self.fielders:
+                self.fielders[position].add(half_inning_ordinal(inning, half), player_id)
+        # The starters are listed from the team's first half in the field, but they hold their roles from the first
+        # pitch (the away team's while it bats in the top of the first)
+        for timeline in [self.pitcher, *self.fielders.values()]:
+            if timeline.starts and timeline.starts[0] <= 1:
+                timeline.starts[0] = 0
+
+    def pitcher_at(self, inning, half):
+        return self.pitcher.at(half_inning_ordinal(inning, half))
+
+    def fielder_at(self, position, inning, half):
+        return self.fielders[position].at(half_inning_ordinal(inning, half))
+
+    def alignment_at(self, inning, half):
+        ordinal = half_inning_ordinal(inning, half)
+        return {position: timeline.at(ordinal) for position, timeline in self.fielders.items()}
+
+
+def build_game_timelines(row):
+    """{'home': TeamTimeline, 'away': TeamTimeline} from a urls CSV row"""
+    return {team: TeamTimeline(row[f'{team}_pitchers'], row[f'{team}_position_players']) for team in ['home', 'away']}
+
+
+def find_alignment_disagreements(decision_df, timelines):
+    """
+    Every decision point whose pitcher or fielders don't match the timelines, as rows of
+    (row, column, recorded, expected). Only the half-inning a change happens in is known, so during that
+    half either the outgoing or the incoming player is accepted.
+    """
+    import pandas as pd
+
+    columns = []
+    for team in ['home', 'away']:
+        columns.append((f'{team.capitalize()}_Pitcher', timelines[team].pitcher))
+        for position in FIELDING_POSITIONS:
+            columns.append((f'{team.capitalize()}_{position}', timelines[team].fielders[position]))
+
+    disagreements = []
+    ordinals = [half_inning_ordinal(inning, half) for inning, half in zip(decision_df['Inning'], decision_df['Half'])]
+    ordinals = np.array(ordinals, dtype=int)
+    for ordinal in np.unique(ordinals):
+        rows = np.flatnonzero(ordinals == ordinal)
+        for column, timeline in columns:
+            if not timeline.starts:
+                continue
+            recorded = decision_df[column].to_numpy()[rows]
+            allowed = list(timeline.candidates(ordinal))
+            mismatched = ~pd.Series(recorded).isin(allowed).to_numpy()
+            expected = timeline.at(ordinal)
+            for row, value in zip(rows[mismatched], recorded[mismatched]):
+                disagreements.append((int(decision_df.index[row]), column, value, expected))
+    return pd.DataFrame(disagreements, columns=['Row', 'Column', 'Recorded', 'Expected']).sort_values(
+        ['Row', 'Column'], ignore_index=True)
@@ -0,0 +1,277 @@
+import json
+import logging
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+# Bump whenever the parsing rules below change so anything derived from parsed records gets rebuilt
+PARSER_VERSION = 2
+
+PLAY_CACHE_FILENAME = "parsed_plays.json"
+
+# Expanded action keywords and sorted from longest to shortest
+ACTION_KEYWORDS = sorted([
+    'grounds into a fielder\'s choice',
+    'grounds into a double play',
+    'grounds into a force out',
+    'intentionally walks',
+    'hits a grand slam',
+    'hits a home run',
+    'hit by pitch',
+    'intentionally walk',
+    'grounds out',
+    'grounds into',
+    'walks',
+    'singles',
+    'doubles',
+    'triples',
+    'homers',
+    'reaches',
+    'hits'
+], key=len, reverse=True)
+ACTION_KEYWORDS_PATTERN = '|'.join(map(re.escape, ACTION_KEYWORDS))
+
+CHALLENGE_REGEX = re.compile(r'(overturned|upheld):\s*(.*)', re.IGNORECASE)
+INTENTIONAL_WALK_REGEX = re.compile(r"^(.*?)\s+intentionally walks\s+(.*?)\.?$", re.IGNORECASE)
+ACTION_REGEX = re.compile(
+    rf"^(.*?)\s+({ACTION_KEYWORDS_PATTERN})(?:\s+\(.*?\))?(?:\s+[^,]*)?(?:,|$)",
+    re.IGNORECASE
+)
+ALT_ACTION_REGEX = re.compile(
+    rf"^(.*?)\s+({ACTION_KEYWORDS_PATTERN})\s+(.*?)\.?$",
+    re.IGNORECASE
+)
+
+# Runner movements, including "advances to" and trailing clauses after a comma
+MOVEMENT_PATTERNS = [
+    re.compile(r"^(.*?)\s+(?:to|advances to)\s+(1st|2nd|3rd|home)(?:,.*)?$", re.IGNORECASE),
+    re.compile(r"^(.*?)\s+(scores|out at home|out at 1st|out at 2nd|out at 3rd)(?:,.*)?$", re.IGNORECASE),
+]
+
+# Lead runners move first so they free up the base the runners behind them are heading to
+MOVEMENT_PRIORITY = {
+    'scores': 0,
+    'home': 0,
+    'out at home': 0,
+    '3rd': 1,
+    'out at 3rd': 1,
+    '2nd': 2,
+    'out at 2nd': 2,
+    '1st': 3,
+    'out at 1st': 3,
+}
+
+# Shared by the handlers that parse substitutions and by remove_middle_initials
+OFFENSIVE_SUB_REGEX = re.compile(r'(?:runner|hitter)\s+(.+?)\s+replaces\s+(.+?)$', re.IGNORECASE)
+PITCHING_CHANGE_REGEX = re.compile(
+    r"Pitching Change:\s*(.+?)\s+replaces\s+(.+?)(?:,\s*batting\s+(\d+)(?:th|st|nd|rd))?(?:,\s*replacing.*)?\.?$")
+DEFENSIVE_SUB_OLD_PLAYER_REGEX = re.compile(r'replaces\s+(.*?)(?:,|\s*$)')
+DEFENSIVE_SUB_POSITION_REGEX = re.compile(r'playing\s+(.*?)(?:,|\s*$)')
+DEFENSIVE_SUB_POSITION_PREFIX_REGEX = re.compile(
+    r'\b(first baseman|second baseman|shortstop|third baseman|left fielder|right fielder|catcher|center fielder|pitcher)\s+')
+# Plays without a batter action, only runners moving: wild pitches, passed balls and balks
+PITCH_PLAY_REGEX = re.compile(r"^(wild pitch|passed ball) by (?:pitcher|catcher)\s+(.+)$", re.IGNORECASE)
+BALK_REGEX = re.compile(r"^With\s+(.+?)\s+batting,\s+(.+)$")
+BALK_SUFFIX_REGEX = re.compile(r"\s+on a balk\.?$")
+# A sentence ends at a period, but not the one of a name suffix or middle initial like Jr. or Josh H. Smith
+SENTENCE_END_REGEX = re.compile(r"(?<!\bJr)(?<!\bSr)(?<!\b[A-Z])\.\s+")
+
+MIDDLE_INITIALS_REGEX = re.compile(r'^(\w+)\s+(?:[A-Za-z]\.?\s+)+(\w+)$')
+PINCH_RUNNER_REGEX = re.compile(r'runner\s+(.+?)\s+replaces', re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class PlayRecord:
+    """
+    What a play description says happened: who batted, what they did and how the runners moved.
+    For wild pitches, passed balls and balks batter is None and action is the play, e.g. 'wild pitch'.
+    """
+    batter: str
+    action: str
+    # (runner name, movement) pairs, already in the order they have to be applied
+    movements: tuple
+
+
+# Parsed records by description, for the generic path and the wild pitch, passed ball and balk handlers alike.
+# Descriptions never change once scraped so this can be kept across runs
+_play_cache = {}
+_play_cache_dirty = False
+# Records parsed since the last take_new_plays(), a worker process hands these back to the process that saves
+_new_plays = {}
+
+
+def load_play_cache(scraped_dir="scraped_games"):
+    """Load the records parsed on previous runs, unless they were parsed by a different PARSER_VERSION"""
+    global _play_cache_dirty
+    cache_path = Path(scraped_dir) / PLAY_CACHE_FILENAME
+    if not cache_path.exists():
+        return
+
+    with open(cache_path) as f:
+        data = json.load(f)
+    if data.get('parser_version') != PARSER_VERSION:
+        logging.info(f"Discarding parsed play cache from parser version {data.get('parser_version')}")
+        _play_cache_dirty = True
+        return
+
+    for description, record in data['plays'].items():
+        if record is None:
+            _play_cache[description] = None
+        else:
+            batter, action, movements = record
+            _play_cache[description] = PlayRecord(batter, action, tuple(tuple(movement) for movement in movements))
+    logging.info(f"Loaded {len(data['plays'])} parsed plays from {cache_path}")
+
+
+def save_play_cache(scraped_dir="scraped_games"):
+    """Write the parsed records next to the scraped games if anything new was parsed"""
+    global _play_cache_dirty
+    if not _play_cache_dirty:
+        return
+
+    plays = {
+        description: None if record is None else [record.batter, record.action, record.movements]
+        for description, record in _play_cache.items()
+    }
+    cache_path = Path(scraped_dir) / PLAY_CACHE_FILENAME
+    # Renamed into place so an interrupted save leaves the previous cache
+    temp_path = cache_path.with_name(cache_path.name + ".tmp")
+    with open(temp_path, 'w') as f:
+        json.dump({'parser_version': PARSER_VERSION, 'plays': plays}, f)
+    os.replace(temp_path, cache_path)
+    _play_cache_dirty = False
+
+
+def clear_play_cache():
+    """
+    Forget every parsed record, e.g. after the parser was edited in a running process. The next save_play_cache
+    replaces the saved records with the ones parsed from then on.
+    """
+    global _play_cache_dirty
+    _play_cache.clear()
+    _new_plays.clear()
+    _play_cache_dirty = True
+
+
+def take_new_plays():
+    """The records parsed since the last call, description -> record"""
+    plays = dict(_new_plays)
+    _new_plays.clear()
+    return plays
+
+
+def add_plays(plays):
+    """Add records parsed in another process, so the next save_play_cache keeps them"""
+    global _play_cache_dirty
+    for description, record in plays.items():
+        if description not in _play_cache:
+            _play_cache[description] = record
+            _play_cache_dirty = True
+
+
+def get_play(description):
+    """parse_play, but every description is only ever parsed once"""
+    global _play_cache_dirty
+    if description in _play_cache:
+        return _play_cache[description]
+
+    record = parse_play(description)
+    _play_cache[description] = record
+    _new_plays[description] = record
+    _play_cache_dirty = True
+    return record
+
+
+def parse_play(description):
+    """
+    Parse the description of a plate appearance, wild pitch, passed ball or balk into a PlayRecord.
+    Returns None when the description has no batter action or runner play we know how to apply.
+    """
+    # Step 1: Handle challenge descriptions
+    if 'challenged' in description.lower():
+        challenge_index = description.lower().find('challenged')
+        description = description[challenge_index:]
+        match = CHALLENGE_REGEX.search(description)
+        if match:
+            description = match.group(2).strip()
+            logging.info(f"Adjusted description after challenge: '{description}'")
+        else:
+            logging.info("No 'overturned:' or 'upheld:' found after 'challenged'")
+            return None
+
+    runner_play = parse_runner_play(description)
+    if runner_play is not None:
+        return runner_play
+
+    # Step 2: Normalize and split the description into sentences
+    description = description.replace('.', '. ')
+    sentences = [s.strip() for s in description.split('. ') if s.strip()]
+
+    if not sentences:
+        logging.info("No actionable sentences found in the description.")
+        return None
+
+    main_action = sentences[0]
+
+    # Special handling for intentional walks
+    intentional_walk_match = INTENTIONAL_WALK_REGEX.match(main_action)
+
+    if intentional_walk_match:
+        # For intentional walks, the first group is the pitcher and second group is the batter
+        batter_name = intentional_walk_match.group(2).strip()
+        action = "intentionally walks"
+    else:
+        action_match = ACTION_REGEX.match(main_action)
+
+        if action_match:
+            batter_name = action_match.group(1).strip()
+            action = action_match.group(2).lower()
+        else:
+            alt_match = ALT_ACTION_REGEX.match(main_action)
+            if alt_match:
+                action = alt_match.group(2).lower()
+                batter_name = alt_match.group(3).strip()
+            else:
+                logging.info("No main action found in the description.")
+                return None
+
+    return PlayRecord(batter_name, action, parse_runner_movements(sentences[1:]))
+
+
+def parse_runner_play(description):
+    """Parse a wild pitch, passed ball or balk into a PlayRecord without a batter, None for any other play"""
+    sentences = SENTENCE_END_REGEX.split(description.strip())
+    pitch_play_match = PITCH_PLAY_REGEX.match(sentences[0])
+    if pitch_play_match:
+        return PlayRecord(None, pitch_play_match.group(1).lower(), parse_runner_movements(sentences[1:]))
+
+    balk_match = BALK_REGEX.match(sentences[0])
+    if balk_match and all(BALK_SUFFIX_REGEX.search(sentence) for sentence in sentences):
+        # "With <batter> batting, <runner> advances to 2nd on a balk. <runner> scores on a balk."
+        sentences = [balk_match.group(2)] + sentences[1:]
+        return PlayRecord(None, 'balk', parse_runner_movements(
+            [BALK_SUFFIX_REGEX.sub('', sentence) for sentence in sentences]))
+    return None
+
+
+def parse_runner_movements(sentences):
+    """Turn the runner sentences of a play into (runner name, movement) pairs sorted by priority"""
+    movements = []
+
+    for movement in sentences:
+        movement = movement.strip().rstrip('.')
+        for pattern in MOVEMENT_PATTERNS:
+            match = pattern.match(movement)
+            if match:
+                runner_name = match.group(1).strip()
+                action = match.group(2).lower()
+                priority = MOVEMENT_PRIORITY.get(action, 99)
+                movements.append((priority, runner_name, action))
+                break
+        else:
+            logging.info(f"Unrecognized runner movement: '{movement}'")
+
+    # Sort movements based on priority
+    movements.sort()
+    return tuple((runner_name, action) for _, runner_name, action in movements)
@@ -1,8 +1,14 @@
 import difflib
 import logging
-import re
 import string
 from game_state import Base, Half, FieldPosition, GameState
+from base_state import BASES_TO_ADVANCE, BATTER_DESTINATIONS, ADVANCE_TABLE, HOME
+from description_parser import (get_play, OFFENSIVE_SUB_REGEX, PITCHING_CHANGE_REGEX, DEFENSIVE_SUB_OLD_PLAYER_REGEX,
+                                DEFENSIVE_SUB_POSITION_REGEX, DEFENSIVE_SUB_POSITION_PREFIX_REGEX,
+                                MIDDLE_INITIALS_REGEX)
+
+# Where the runners of wild pitches, passed balls and balks can move up to, scoring aside
+RUNNER_ADVANCE_BASES = {'2nd': Base.SECOND, '3rd': Base.THIRD}
 
 
 def process_name(name):
@@ -20,8 +26,79 @@ def process_name(name):
     return remove_middle_initials(name.lower())
 
 
+# Name suffixes, "luis garcia jr." and "luis robert jr." don't share a last name
+NAME_SUFFIXES = {'jr', 'sr', 'ii', 'iii', 'iv'}
+
+
+def last_name(processed_name):
+    parts = [part for part in processed_name.split() if part.rstrip('.') not in NAME_SUFFIXES]
+    return parts[-1] if parts else processed_name
+
+
+class PlayerIndex(dict):
+    """
+    The merged player_map of a single game (player ID -> name) along with the lookups get_closest_player_id needs,
+    built once per game instead of on every call. Resolved names are remembered for the rest of the game.
+    """
+
+    def __init__(self, player_map, registry=None):
+        super().__init__(player_map)
+        self.registry = registry
+        # Build a mapping from processed names to player IDs
+        self.reversed_player_map = {process_name(name): player_id for player_id, name in self.items()}
+        self.names_list = list(self.reversed_player_map.keys())
+        # Last name -> the processed names ending in it, looked at before fuzzy matching the whole roster
+        self.last_name_map = {}
+        for processed_name in self.names_list:
+            self.last_name_map.setdefault(last_name(processed_name), []).append(processed_name)
+        self.resolved_names = {}
+
+    def resolve(self, player_name):
+        if player_name in self.resolved_names:
+            return self.resolved_names[player_name]
+
+        logging.info("Attempting to get player ID for: %s", player_name)
+        player_name_processed = process_name(player_name)
+
+        closest_name = None
+        registered_id = None
+        if player_name_processed in self.reversed_player_map:
+            closest_name = player_name_processed
+        elif self.registry is not None:
+            # A player map spelling from elsewhere in the season for one of this game's players
+            registered_id = self.registry.lookup(player_name_processed, self)
+
+        if closest_name is None and registered_id is None:
+            candidates = self.last_name_map.get(last_name(player_name_processed), [])
+            if len(candidates) == 1:
+                # The only player with that last name, e.g. a dropped middle initial or suffix
+                closest_name = candidates[0]
+            else:
+                # Several players share the last name: the closest of them, else the closest of the whole roster
+                matches = (difflib.get_close_matches(player_name_processed, candidates, n=1, cutoff=0.6)
+                           or difflib.get_close_matches(player_name_processed, self.names_list, n=1, cutoff=0.6))
+                if matches:
+                    closest_name = matches[0]
+
+        if registered_id is not None:
+            player_id = registered_id
+            logging.info("Found registered spelling for '%s' (ID: %s)", player_name, player_id)
+        elif closest_name is not None:
+            player_id = self.reversed_player_map[closest_name]
+            logging.info("Found closest match for '%s': '%s' (ID: %s)", player_name, closest_name, player_id)
+        else:
+            player_id = None
+            logging.info("Warning: No close match found for player name '%s'", player_name)
+
+        self.resolved_names[player_name] = player_id
+        return player_id
+
+
 def get_closest_player_id(player_name, player_map):
-    logging.info(f"Attempting to get player ID for: {player_name}")
+    if isinstance(player_map, PlayerIndex):
+        return player_map.resolve(player_name)
+
+    logging.info("Attempting to get player ID for: %s", player_name)
 
     player_name_processed = process_name(player_name)
 
@@ -35,10 +112,10 @@ def get_closest_player_id(player_name, player_map):
     if matches:
         closest_name = matches[0]
         player_id = reversed_player_map[closest_name]
-        logging.info(f"Found closest match for '{player_name}': '{closest_name}' (ID: {player_id})")
+        logging.info("Found closest match for '%s': '%s' (ID: %s)", player_name, closest_name, player_id)
         return player_id
     else:
-        logging.info(f"Warning: No close match found for player name '{player_name}'")
+        logging.info("Warning: No close match found for player name '%s'", player_name)
         return None
 
 
@@ -50,17 +127,13 @@ def handle_stolen_base(description, game_state, player_map):
     player_id = get_closest_player_id(player_name, player_map)
 
     if not player_id:
-        logging.info(f"Error: Player '{player_name}' not found in player map.")
+        logging.info("Error: Player '%s' not found in player map.", player_name)
         return
 
-    current_base = None
-    for base, occupant in game_state.bases_occupied.items():
-        if occupant == player_id:
-            current_base = base
-            break
+    current_base = game_state.runner_base(player_id)
 
     if not current_base:
-        logging.info(f"Error: Player '{player_name}' (ID: {player_id}) not found on any base.")
+        logging.info("Error: Player '%s' (ID: %s) not found on any base.", player_name, player_id)
         return
 
     if "2nd base" in description:
@@ -70,390 +143,164 @@ def handle_stolen_base(description, game_state, player_map):
     elif "home" in description:
         new_base = None  # Stealing home means scoring
     else:
-        logging.info(f"Error: Unrecognized stolen base destination in description: '{description}'")
+        logging.info("Error: Unrecognized stolen base destination in description: '%s'", description)
         return
 
     if new_base:
         game_state.bases_occupied[current_base] = -1
         game_state.bases_occupied[new_base] = player_id
-        logging.info(f"Player '{player_name}' (ID: {player_id}) successfully stole {new_base.name.lower()}.")
+        logging.info("Player '%s' (ID: %s) successfully stole %s.", player_name, player_id, new_base.name.lower())
     else:
         game_state.bases_occupied[current_base] = -1
-        logging.info(f"Player '{player_name}' (ID: {player_id}) successfully stole home. Score updated.")
-
-
-def handle_wild_pitch(description, game_state, player_map):
-    abbreviations = ['Jr.', 'Sr.', 'II', 'III', 'IV', 'V']
-    for abbr in abbreviations:
-        description = description.replace(abbr, abbr.replace('.', '<dot>'))
+        logging.info("Player '%s' (ID: %s) successfully stole home. Score updated.", player_name, player_id)
 
-    sentences = description.split('. ')
-    sentences = [s.replace('<dot>', '.') for s in sentences]
 
-    pitcher_info = sentences[0]
-    base_runner_info = sentences[1:]
-
-    for runner_info in base_runner_info:
-        runner_info = runner_info.strip().rstrip('.')
-
-        if not runner_info:
+def advance_runners(movements, game_state, player_map):
+    """Move the runners of a wild pitch, passed ball or balk, movements as the parser gave them"""
+    for runner_name, movement in movements:
+        player_id = get_closest_player_id(runner_name, player_map)
+        if not player_id:
+            logging.info("Error: Player '%s' not found in player map.", runner_name)
             continue
 
-        if "scores" in runner_info:
-            runner_name = runner_info.replace(" scores", "").strip()
-
-            player_id = get_closest_player_id(runner_name, player_map)
-            if not player_id:
-                logging.info(f"Error: Player '{runner_name}' not found in player map.")
-                continue
-
-            current_base = next(
-                (base for base, occupant in game_state.bases_occupied.items() if occupant == player_id),
-                None
-            )
+        current_base = game_state.runner_base(player_id)
 
-            if not current_base:
-                logging.info(f"Error: Player '{runner_name}' (ID: {player_id}) not found on any base.")
-                continue
+        if not current_base:
+            logging.info("Error: Player '%s' (ID: %s) not found on any base.", runner_name, player_id)
+            continue
 
+        if movement in ('scores', 'home'):
             game_state.bases_occupied[current_base] = -1
-            logging.info(f"Player '{runner_name}' (ID: {player_id}) scored.")
-
-        elif " to " in runner_info:
-            runner_name, base_movement = runner_info.rsplit(" to ", 1)
-            runner_name = runner_name.strip()
-
-            player_id = get_closest_player_id(runner_name, player_map)
-            if not player_id:
-                logging.info(f"Error: Player '{runner_name}' not found in player map.")
-                continue
-
-            current_base = next(
-                (base for base, occupant in game_state.bases_occupied.items() if occupant == player_id),
-                None
-            )
-
-            if not current_base:
-                logging.info(f"Error: Player '{runner_name}' (ID: {player_id}) not found on any base.")
-                continue
-
-            if "2nd" in base_movement or "second" in base_movement:
-                new_base = Base.SECOND
-            elif "3rd" in base_movement or "third" in base_movement:
-                new_base = Base.THIRD
-            else:
-                logging.info(f"Error: Unrecognized base movement for '{runner_name}': '{base_movement}'")
-                continue
-
+            logging.info("Player '%s' (ID: %s) scored.", runner_name, player_id)
+        elif movement in RUNNER_ADVANCE_BASES:
+            new_base = RUNNER_ADVANCE_BASES[movement]
             game_state.bases_occupied[current_base] = -1
             game_state.bases_occupied[new_base] = player_id
-            logging.info(f"Player '{runner_name}' (ID: {player_id}) moved to {new_base.name.lower()}.")
+            logging.info("Player '%s' (ID: %s) moved to %s.", runner_name, player_id, new_base.name.lower())
+        else:
+            logging.info("Error: Unrecognized base movement for '%s': '%s'", runner_name, movement)
 
 
-def handle_passed_ball(description, game_state, player_map):
-    parts = description.split(". ")
-    catcher_info = parts[0]
-    base_runner_info = parts[1:]
-
-    runner_movements = []
-    for runner_info in base_runner_info:
-        runner_info = runner_info.strip()
-        if "scores" in runner_info:
-            runner_name = runner_info.replace(" scores", "").strip()
-            runner_movements.append((runner_name, "scores"))
-        elif " to " in runner_info:
-            runner_name, base_movement = runner_info.split(" to ")
-            runner_name = runner_name.strip()
-            runner_movements.append((runner_name, base_movement.strip()))
-
-    runner_movements.sort(key=lambda x: (
-        0 if x[1] == "scores" else
-        1 if "3rd" in x[1] else
-        2 if "2nd" in x[1] else 3
-    ))
-
-    for runner_name, movement in runner_movements:
-        player_id = get_closest_player_id(runner_name, player_map)
-        if not player_id:
-            logging.info(f"Error: Player '{runner_name}' not found in player map.")
-            continue
+def get_runner_play(description, play_action):
+    """The parsed wild pitch, passed ball or balk of a description, None if it doesn't parse as one"""
+    play = get_play(description)
+    if play is None or play.action != play_action:
+        logging.info("Error: Not a valid %s description: '%s'", play_action, description)
+        return None
+    return play
 
-        current_base = None
-        for base, occupant in game_state.bases_occupied.items():
-            if occupant == player_id:
-                current_base = base
-                break
 
-        if not current_base:
-            logging.info(f"Error: Player '{runner_name}' (ID: {player_id}) not found on any base.")
-            continue
+def handle_wild_pitch(description, game_state, player_map):
+    play = get_runner_play(description, 'wild pitch')
+    if play is not None:
+        advance_runners(play.movements, game_state, player_map)
 
-        if movement == "scores":
-            game_state.bases_occupied[current_base] = -1
-            logging.info(f"Player '{runner_name}' (ID: {player_id}) scored.")
-        else:
-            if "3rd" in movement:
-                new_base = Base.THIRD
-            elif "2nd" in movement:
-                new_base = Base.SECOND
-            else:
-                logging.info(f"Error: Unrecognized base movement for '{runner_name}': '{movement}'")
-                continue
 
-            game_state.bases_occupied[current_base] = -1
-            game_state.bases_occupied[new_base] = player_id
-            logging.info(f"Player '{runner_name}' (ID: {player_id}) moved to {new_base.name.lower()}.")
+def handle_passed_ball(description, game_state, player_map):
+    play = get_runner_play(description, 'passed ball')
+    if play is not None:
+        advance_runners(play.movements, game_state, player_map)
 
 
 def attempt_base_update(description, game_state, player_map):
-    logging.info(f"Processing description: '{description}'")
-
-    # Step 1: Handle challenge descriptions
-    if 'challenged' in description.lower():
-        challenge_index = description.lower().find('challenged')
-        description = description[challenge_index:]
-        match = re.search(r'(overturned|upheld):\s*(.*)', description, re.IGNORECASE)
-        if match:
-            description = match.group(2).strip()
-            logging.info(f"Adjusted description after challenge: '{description}'")
-        else:
-            logging.info("No 'overturned:' or 'upheld:' found after 'challenged'")
-            return
-
-    # Step 2: Normalize and split the description into sentences
-    description = description.replace('.', '. ')
-    sentences = [s.strip() for s in description.split('. ') if s.strip()]
+    logging.info("Processing description: '%s'", description)
 
-    if not sentences:
-        logging.info("No actionable sentences found in the description.")
+    play = get_play(description)
+    # Wild pitches, passed balls and balks have their own handlers, they have no batter to place
+    if play is None or play.batter is None:
         return
 
-    # Expanded action keywords and sorted from longest to shortest
-    action_keywords = [
-        'grounds into a fielder\'s choice',
-        'grounds into a double play',
-        'grounds into a force out',
-        'intentionally walks',
-        'hits a grand slam',
-        'hits a home run',
-        'hit by pitch',
-        'intentionally walk',
-        'grounds out',
-        'grounds into',
-        'walks',
-        'singles',
-        'doubles',
-        'triples',
-        'homers',
-        'reaches',
-        'hits'
-    ]
-    action_keywords.sort(key=len, reverse=True)
-    action_keywords_pattern = '|'.join(map(re.escape, action_keywords))
-
-    main_action = sentences[0]
-
-    # Special handling for intentional walks
-    intentional_walk_match = re.match(
-        r"^(.*?)\s+intentionally walks\s+(.*?)\.?$",
-        main_action,
-        re.IGNORECASE
-    )
-
-    if intentional_walk_match:
-        # For intentional walks, the first group is the pitcher and second group is the batter
-        batter_name = intentional_walk_match.group(2).strip()
-        action = "intentionally walks"
-    else:
-        # Regular action handling (unchanged)
-        action_regex = re.compile(
-            rf"^(.*?)\s+({action_keywords_pattern})(?:\s+\(.*?\))?(?:\s+[^,]*)?(?:,|$)",
-            re.IGNORECASE
-        )
-        action_match = action_regex.match(main_action)
-
-        if action_match:
-            batter_name = action_match.group(1).strip()
-            action = action_match.group(2).lower()
-        else:
-            alt_action_regex = re.compile(
-                rf"^(.*?)\s+({action_keywords_pattern})\s+(.*?)\.?$",
-                re.IGNORECASE
-            )
-            alt_match = alt_action_regex.match(main_action)
-            if alt_match:
-                pitcher_name = alt_match.group(1).strip()
-                action = alt_match.group(2).lower()
-                batter_name = alt_match.group(3).strip()
-            else:
-                logging.info("No main action found in the description.")
-                return
+    batter_name = play.batter
+    action = play.action
 
     batter_id = get_closest_player_id(batter_name, player_map)
     if not batter_id:
-        logging.info(f"Error: Batter '{batter_name}' not found in player map.")
+        logging.info("Error: Batter '%s' not found in player map.", batter_name)
         return
 
     # Move existing runners ahead of batter
     move_existing_runners(action, game_state)
 
     # Update bases based on the action
-    if action in ['walks', 'intentionally walks']:
-        occupy_base(Base.FIRST, batter_id, game_state)
-        logging.info(f"Batter '{batter_name}' (ID: {batter_id}) walked to first base.")
-    elif action == 'hit by pitch':
-        occupy_base(Base.FIRST, batter_id, game_state)
-        logging.info(f"Batter '{batter_name}' (ID: {batter_id}) reached first base via hit by pitch.")
-    elif action in ['singles', 'reaches']:
-        occupy_base(Base.FIRST, batter_id, game_state)
-        logging.info(f"Batter '{batter_name}' (ID: {batter_id}) reached first base.")
-    elif action == 'doubles':
-        occupy_base(Base.SECOND, batter_id, game_state)
-        logging.info(f"Batter '{batter_name}' (ID: {batter_id}) reached second base.")
-    elif action == 'triples':
-        occupy_base(Base.THIRD, batter_id, game_state)
-        logging.info(f"Batter '{batter_name}' (ID: {batter_id}) reached third base.")
-    elif action in ['homers', 'hits a grand slam', 'hits a home run']:
-        logging.info(f"Batter '{batter_name}' (ID: {batter_id}) hit a home run.")
+    destination = BATTER_DESTINATIONS.get(action)
+    if destination == HOME:
+        logging.info("Batter '%s' (ID: %s) hit a home run.", batter_name, batter_id)
         score_runner(batter_id, game_state)
-    elif action in ['grounds into a force out', 'grounds into a double play', "grounds into a fielder's choice"]:
-        # For force outs and double plays, the batter may or may not reach first base
-        # Additional logic may be needed here based on runner movements
-        occupy_base(Base.FIRST, batter_id, game_state)
-        logging.info(f"Batter '{batter_name}' (ID: {batter_id}) reached first base on {action}.")
+    elif destination:
+        occupy_base(destination, batter_id, game_state)
+        logging.info("Batter '%s' (ID: %s) reached %s base on %s.",
+                     batter_name, batter_id, destination.name.lower(), action)
     else:
-        logging.info(f"Unrecognized action '{action}' for batter '{batter_name}'.")
-
-    # Step 4: Process any additional runner movements
-    runner_movements = sentences[1:]
-
-    # Updated movement_patterns to handle "advances to" and commas
-    movement_patterns = [
-        re.compile(r"^(.*?)\s+(?:to|advances to)\s+(1st|2nd|3rd|home)(?:,.*)?$", re.IGNORECASE),
-        re.compile(r"^(.*?)\s+(scores|out at home|out at 1st|out at 2nd|out at 3rd)(?:,.*)?$", re.IGNORECASE),
-    ]
-
-    # Process runner movements with priority
-    movement_priority = {
-        'scores': 0,
-        'home': 0,
-        'out at home': 0,
-        '3rd': 1,
-        'out at 3rd': 1,
-        '2nd': 2,
-        'out at 2nd': 2,
-        '1st': 3,
-        'out at 1st': 3,
-    }
-    movements = []
-
-    for movement in runner_movements:
-        movement = movement.strip().rstrip('.')
-        for pattern in movement_patterns:
-            match = pattern.match(movement)
-            if match:
-                runner_name = match.group(1).strip()
-                action = match.group(2).lower()
-                priority = movement_priority.get(action, 99)
-                movements.append((priority, runner_name, action))
-                break
-        else:
-            logging.info(f"Unrecognized runner movement: '{movement}'")
+        logging.info("Unrecognized action '%s' for batter '%s'.", action, batter_name)
 
-    # Sort movements based on priority
-    movements.sort()
-
-    # Process movements
-    for _, runner_name, action in movements:
+    # Process any additional runner movements, the parser already put them in priority order
+    for runner_name, action in play.movements:
         runner_id = get_closest_player_id(runner_name, player_map)
         if not runner_id:
-            logging.info(f"Error: Runner '{runner_name}' not found in player map.")
+            logging.info("Error: Runner '%s' not found in player map.", runner_name)
             continue
 
         current_base = get_runner_current_base(runner_id, game_state)
         if current_base is None:
-            logging.info(f"Error: Runner '{runner_name}' (ID: {runner_id}) not found on any base.")
+            logging.info("Error: Runner '%s' (ID: %s) not found on any base.", runner_name, runner_id)
             continue
 
         if action in ['scores', 'home']:
             game_state.bases_occupied[current_base] = -1
-            logging.info(f"Runner '{runner_name}' (ID: {runner_id}) scored from {current_base.name.lower()}.")
+            logging.info("Runner '%s' (ID: %s) scored from %s.", runner_name, runner_id, current_base.name.lower())
         elif action.startswith('out at'):
             game_state.bases_occupied[current_base] = -1
-            logging.info(f"Runner '{runner_name}' (ID: {runner_id}) was out at {action.split()[-1]}.")
+            logging.info("Runner '%s' (ID: %s) was out at %s.", runner_name, runner_id, action.split()[-1])
         else:
             new_base = get_base_enum(action)
             if not new_base:
-                logging.info(f"Error: Unrecognized base '{action}' for runner '{runner_name}'.")
+                logging.info("Error: Unrecognized base '%s' for runner '%s'.", action, runner_name)
                 continue
             game_state.bases_occupied[current_base] = -1
             occupy_base(new_base, runner_id, game_state)
-            logging.info(f"Runner '{runner_name}' (ID: {runner_id}) moved to {new_base.name.lower()}.")
+            logging.info("Runner '%s' (ID: %s) moved to %s.", runner_name, runner_id, new_base.name.lower())
 
 def move_existing_runners(action, game_state):
-    # Define how many bases runners should advance based on the batter's action
-    bases_to_advance = {
-        'walks': 1,
-        'intentionally walks': 1,
-        'hit by pitch': 1,
-        'singles': 1,
-        'reaches': 1,
-        'doubles': 2,
-        'triples': 3,
-        'homers': 4,
-        'hits a grand slam': 4,
-        'hits a home run': 4,
-        'grounds into a force out': 1,
-        'grounds into a double play': 1,
-        "grounds into a fielder's choice": 1,
-    }
-    advance = bases_to_advance.get(action, 0)
+    # How many bases runners should advance based on the batter's action
+    advance = BASES_TO_ADVANCE.get(action, 0)
 
     if advance == 0:
         return
 
-    # Move runners starting from 3rd base to 1st base
-    for base in [Base.THIRD, Base.SECOND, Base.FIRST]:
-        runner_id = game_state.bases_occupied.get(base, -1)
-        if runner_id != -1:
-            new_base_index = base.value + advance
-            if new_base_index >= 4:
-                # Runner scores
-                game_state.bases_occupied[base] = -1
-                logging.info(f"Runner (ID: {runner_id}) scored from {base.name.lower()}.")
-            else:
-                new_base = Base(new_base_index)
-                if game_state.bases_occupied.get(new_base, -1) == -1:
-                    game_state.bases_occupied[base] = -1
-                    game_state.bases_occupied[new_base] = runner_id
-                    logging.info(
-                        f"Runner (ID: {runner_id}) advanced from {base.name.lower()} to {new_base.name.lower()}.")
-                else:
-                    logging.info(
-                        f"Error: Base {new_base.name.lower()} already occupied when moving runner (ID: {runner_id}).")
+    # The table already has the runners in order, starting from 3rd base
+    moves, blocked = ADVANCE_TABLE[game_state.occupied_mask()][advance]
+    bases_occupied = game_state.bases_occupied
+    for base, new_base in moves:
+        runner_id = bases_occupied[base]
+        bases_occupied[base] = -1
+        if new_base == HOME:
+            logging.info("Runner (ID: %s) scored from %s.", runner_id, base.name.lower())
+        else:
+            bases_occupied[new_base] = runner_id
+            logging.info("Runner (ID: %s) advanced from %s to %s.", runner_id, base.name.lower(), new_base.name.lower())
+    for base, new_base in blocked:
+        logging.info(
+            "Error: Base %s already occupied when moving runner (ID: %s).", new_base.name.lower(), bases_occupied[base])
 
 
 def occupy_base(base, player_id, game_state):
     if game_state.bases_occupied.get(base, -1) == -1:
         game_state.bases_occupied[base] = player_id
     else:
-        logging.info(f"Error: Base {base.name.lower()} already occupied when trying to place player (ID: {player_id}).")
+        logging.info("Error: Base %s already occupied when trying to place player (ID: %s).",
+                     base.name.lower(), player_id)
 
 
 def score_runner(player_id, game_state):
     # Remove runner from bases if present
-    for base in [Base.FIRST, Base.SECOND, Base.THIRD]:
-        if game_state.bases_occupied.get(base, -1) == player_id:
-            game_state.bases_occupied[base] = -1
-            break
-    logging.info(f"Player (ID: {player_id}) scored.")
+    base = game_state.runner_base(player_id)
+    if base is not None:
+        game_state.bases_occupied[base] = -1
+    logging.info("Player (ID: %s) scored.", player_id)
 
 
 def get_runner_current_base(runner_id, game_state):
-    for base, occupant in game_state.bases_occupied.items():
-        if occupant == runner_id:
-            return base
-    return None
+    return game_state.runner_base(runner_id)
 
 
 def get_base_enum(base_str):
@@ -468,63 +315,16 @@ def get_base_enum(base_str):
         return None
 
 def handle_balk(description, game_state, player_map):
-    if "on a balk" not in description:
-        logging.info(f"Error: Not a valid balk event description.")
-        return
+    play = get_runner_play(description, 'balk')
+    if play is not None:
+        advance_runners(play.movements, game_state, player_map)
 
-    if "batting," in description:
-        parts = description.split("batting, ")[1]
-    else:
-        logging.info(f"Error: Malformed balk description.")
-        return
-
-    base_runner_info = parts.split(" on a balk. ")
-
-    for runner_info in base_runner_info:
-        runner_info = runner_info.strip()
-
-        if "advances to" in runner_info:
-            runner_name, base_movement = runner_info.split(" advances to ")
-            runner_name = runner_name.strip()
-
-            player_id = get_closest_player_id(runner_name, player_map)
-            if not player_id:
-                logging.info(f"Error: Player '{runner_name}' not found in player map.")
-                continue
-
-            current_base = None
-            for base, occupant in game_state.bases_occupied.items():
-                if occupant == player_id:
-                    current_base = base
-                    break
-
-            if not current_base:
-                logging.info(f"Error: Player '{runner_name}' (ID: {player_id}) not found on any base.")
-                continue
-
-            if "2nd" in base_movement:
-                new_base = Base.SECOND
-            elif "3rd" in base_movement:
-                new_base = Base.THIRD
-            elif "scores" in base_movement:
-                new_base = None
-            else:
-                logging.info(f"Error: Unrecognized base movement for '{runner_name}': '{base_movement}'")
-                continue
-
-            if new_base:
-                game_state.bases_occupied[current_base] = -1
-                game_state.bases_occupied[new_base] = player_id
-                logging.info(f"Player '{runner_name}' (ID: {player_id}) moved to {new_base.name.lower()}.")
-            else:
-                game_state.bases_occupied[current_base] = -1
-                logging.info(f"Player '{runner_name}' (ID: {player_id}) scored.")
 
 
 def handle_offensive_sub(description, game_state, player_map):
-    match = re.search(r'(?:runner|hitter)\s+(.+?)\s+replaces\s+(.+?)$', description, re.IGNORECASE)
+    match = OFFENSIVE_SUB_REGEX.search(description)
     if not match:
-        logging.info(f"Error: Could not parse player names from description: {description}")
+        logging.info("Error: Could not parse player names from description: %s", description)
         return
 
     new_player_name = process_name(match.group(1).strip())
@@ -535,7 +335,8 @@ def handle_offensive_sub(description, game_state, player_map):
 
     if not new_player_id or not old_player_id:
         logging.info(
-            f"Warning: Could not find one or both players in the player map: '{new_player_name}', '{old_player_name}'")
+            "Warning: Could not find one or both players in the player map: '%s', '%s'",
+            new_player_name, old_player_name)
         return
 
     team = 'away' if game_state.half == Half.TOP else 'home'
@@ -543,11 +344,11 @@ def handle_offensive_sub(description, game_state, player_map):
     if team == 'away':
         if(game_state.away_pitcher == old_player_id):
             game_state.away_pitcher = None
-            logging.info(f"found an offensive sub where the person being subbed out is the pitcher")
+            logging.info("found an offensive sub where the person being subbed out is the pitcher")
     else:
         if game_state.home_pitcher == old_player_id:
             game_state.home_pitcher = None
-            logging.info(f"found an offensive sub where the person being subbed out is the pitcher")
+            logging.info("found an offensive sub where the person being subbed out is the pitcher")
 
     # We know the player is replaced in the batting order
     _replace_in_batting_order(game_state, team, old_player_id, new_player_id)
@@ -558,10 +359,12 @@ def handle_offensive_sub(description, game_state, player_map):
     if "Pinch-runner" in description:
         _replace_on_base(game_state, old_player_id, new_player_id)
         logging.info(
-            f"Pinch-runner: {new_player_name} (ID: {new_player_id}) replaces {old_player_name} (ID: {old_player_id}) on the base paths.")
+            "Pinch-runner: %s (ID: %s) replaces %s (ID: %s) on the base paths.",
+            new_player_name, new_player_id, old_player_name, old_player_id)
     else:
         logging.info(
-            f"Pinch-hitter: {new_player_name} (ID: {new_player_id}) replaces {old_player_name} (ID: {old_player_id}) in the batting order.")
+            "Pinch-hitter: %s (ID: %s) replaces %s (ID: %s) in the batting order.",
+            new_player_name, new_player_id, old_player_name, old_player_id)
 
 
 def handle_defensive_switch(description, game_state, player_map):
@@ -583,7 +386,7 @@ def handle_defensive_switch(description, game_state, player_map):
     player_id = get_closest_player_id(player_name, player_map)
 
     if not player_id:
-        logging.info(f"Warning: Player '{player_name}' not found in the player map.")
+        logging.info("Warning: Player '%s' not found in the player map.", player_name)
         return
 
     # Determine the team based on the game state
@@ -591,9 +394,9 @@ def handle_defensive_switch(description, game_state, player_map):
 
     # Map the to_position name to the corresponding FieldPosition enum
     to_position = _map_position_name_to_enum(to_position_name)
-    logging.info(f"to_position: to_position")
+    logging.info("to_position: to_position")
     if to_position is None:
-        logging.info(f"Warning: Could not map '{to_position_name}' to a valid field position.")
+        logging.info("Warning: Could not map '%s' to a valid field position.", to_position_name)
         return
 
     # We should move the player to the to position
@@ -618,17 +421,17 @@ def handle_defensive_sub(description, game_state, player_map):
         if target_position:
             # Update the position in the game state
             game_state.set_position_player(team, target_position, new_player_id)
-            logging.info(f"Placed {new_player_name} (ID: {new_player_id}) at {target_position} for team {team}.")
+            logging.info("Placed %s (ID: %s) at %s for team %s.", new_player_name, new_player_id, target_position, team)
         else:
-            logging.info(f"Warning: Unable to determine the target position for '{new_player_name}'.")
+            logging.info("Warning: Unable to determine the target position for '%s'.", new_player_name)
 
         # Update the batting order by replacing the old player with the new player
         if old_player_id:
             _replace_in_batting_order(game_state, team, old_player_id, new_player_id)
         else:
-            logging.info(f"Warning: Unable to find old player '{old_player_name}' in player map.")
+            logging.info("Warning: Unable to find old player '%s' in player map.", old_player_name)
     else:
-        logging.info(f"Warning: Unable to find new player '{new_player_name}' in player map.")
+        logging.info("Warning: Unable to find new player '%s' in player map.", new_player_name)
 
 
 def handle_pitching_sub(description, game_state, player_map):
@@ -645,16 +448,14 @@ def handle_pitching_sub(description, game_state, player_map):
         old_player_id = get_closest_player_id(old_player_name, player_map)
 
         if not new_player_id or not old_player_id:
-            logging.info(f"Warning: Player '{new_player_name}' or '{old_player_name}' not found in the player map.")
+            logging.info("Warning: Player '%s' or '%s' not found in the player map.", new_player_name, old_player_name)
             return
 
         team = 'home' if game_state.half == Half.TOP else 'away'
         _replace_in_batting_order(game_state, team, old_player_id, new_player_id, batting_position)
         return
 
-    match = re.match(
-        r"Pitching Change:\s*(.+?)\s+replaces\s+(.+?)(?:,\s*batting\s+(\d+)(?:th|st|nd|rd))?(?:,\s*replacing.*)?\.?$",
-        description)
+    match = PITCHING_CHANGE_REGEX.match(description)
     if not match:
         return
 
@@ -703,7 +504,7 @@ def _map_position_name_to_enum(position_name):
 
 
 def handle_pickoff_error_1b(description, game_state, player_map):
-    logging.info(f"Handling Pickoff Error at 1B")
+    logging.info("Handling Pickoff Error at 1B")
     scored_players = []
 
     if "scores" in description:
@@ -711,14 +512,13 @@ def handle_pickoff_error_1b(description, game_state, player_map):
             if process_name(player_name) in description.lower():
                 player_id = get_closest_player_id(player_name, player_map)
                 if not player_id:
-                    logging.info(f"Warning: Player '{player_name}' not found in player map.")
+                    logging.info("Warning: Player '%s' not found in player map.", player_name)
                     continue
-                for base, occupant in game_state.bases_occupied.items():
-                    if occupant == player_id:
-                        game_state.bases_occupied[base] = -1
-                        scored_players.append(player_id)
-                        logging.info(f"Player '{player_name}' (ID: {player_id}) scored.")
-                        break
+                base = game_state.runner_base(player_id)
+                if base is not None:
+                    game_state.bases_occupied[base] = -1
+                    scored_players.append(player_id)
+                    logging.info("Player '%s' (ID: %s) scored.", player_name, player_id)
 
     runner_on_first = game_state.bases_occupied.get(Base.FIRST, -1)
     runner_on_second = game_state.bases_occupied.get(Base.SECOND, -1)
@@ -726,16 +526,16 @@ def handle_pickoff_error_1b(description, game_state, player_map):
     if runner_on_first != -1 and runner_on_first not in scored_players:
         game_state.bases_occupied[Base.FIRST] = -1
         game_state.bases_occupied[Base.SECOND] = runner_on_first
-        logging.info(f"Runner on 1st (Player ID: {runner_on_first}) advanced to 2nd.")
+        logging.info("Runner on 1st (Player ID: %s) advanced to 2nd.", runner_on_first)
 
     if runner_on_second != -1 and runner_on_second not in scored_players:
         game_state.bases_occupied[Base.SECOND] = -1
         game_state.bases_occupied[Base.THIRD] = runner_on_second
-        logging.info(f"Runner on 2nd (Player ID: {runner_on_second}) advanced to 3rd.")
+        logging.info("Runner on 2nd (Player ID: %s) advanced to 3rd.", runner_on_second)
 
 
 def handle_pickoff_error_2b(description, game_state, player_map):
-    logging.info(f"Handling Pickoff Error at 2B")
+    logging.info("Handling Pickoff Error at 2B")
     scored_players = []
 
     if "scores" in description:
@@ -743,14 +543,13 @@ def handle_pickoff_error_2b(description, game_state, player_map):
             if process_name(player_name) in description.lower():
                 player_id = get_closest_player_id(player_name, player_map)
                 if not player_id:
-                    logging.info(f"Warning: Player '{player_name}' not found in player map.")
+                    logging.info("Warning: Player '%s' not found in player map.", player_name)
                     continue
-                for base, occupant in game_state.bases_occupied.items():
-                    if occupant == player_id:
-                        game_state.bases_occupied[base] = -1
-                        scored_players.append(player_id)
-                        logging.info(f"Player '{player_name}' (ID: {player_id}) scored.")
-                        break
+                base = game_state.runner_base(player_id)
+                if base is not None:
+                    game_state.bases_occupied[base] = -1
+                    scored_players.append(player_id)
+                    logging.info("Player '%s' (ID: %s) scored.", player_name, player_id)
 
     runner_on_second = game_state.bases_occupied.get(Base.SECOND, -1)
     runner_on_first = game_state.bases_occupied.get(Base.FIRST, -1)
@@ -758,16 +557,16 @@ def handle_pickoff_error_2b(description, game_state, player_map):
     if runner_on_second != -1 and runner_on_second not in scored_players:
         game_state.bases_occupied[Base.SECOND] = -1
         game_state.bases_occupied[Base.THIRD] = runner_on_second
-        logging.info(f"Runner on 2nd (Player ID: {runner_on_second}) advanced to 3rd.")
+        logging.info("Runner on 2nd (Player ID: %s) advanced to 3rd.", runner_on_second)
 
     if runner_on_first != -1 and runner_on_first not in scored_players:
         game_state.bases_occupied[Base.FIRST] = -1
         game_state.bases_occupied[Base.SECOND] = runner_on_first
-        logging.info(f"Runner on 1st (Player ID: {runner_on_first}) advanced to 2nd.")
+        logging.info("Runner on 1st (Player ID: %s) advanced to 2nd.", runner_on_first)
 
 
 def handle_pickoff_error_3b(description, game_state, player_map):
-    logging.info(f"Handling Pickoff Error at 3B")
+    logging.info("Handling Pickoff Error at 3B")
     scored_players = []
 
     if "scores" in description:
@@ -775,25 +574,24 @@ def handle_pickoff_error_3b(description, game_state, player_map):
             if process_name(player_name) in description.lower():
                 player_id = get_closest_player_id(player_name, player_map)
                 if not player_id:
-                    logging.info(f"Warning: Player '{player_name}' not found in player map.")
+                    logging.info("Warning: Player '%s' not found in player map.", player_name)
                     continue
-                for base, occupant in game_state.bases_occupied.items():
-                    if occupant == player_id:
-                        game_state.bases_occupied[base] = -1
-                        scored_players.append(player_id)
-                        logging.info(f"Player '{player_name}' (ID: {player_id}) scored.")
-                        break
+                base = game_state.runner_base(player_id)
+                if base is not None:
+                    game_state.bases_occupied[base] = -1
+                    scored_players.append(player_id)
+                    logging.info("Player '%s' (ID: %s) scored.", player_name, player_id)
 
     # No further base advancements as the pickoff error occurred at 3B
     # and any runners on bases would have been handled above
 
 
 def handle_pickoff_caught_stealing(description, game_state, player_map):
-    logging.info(f"Handling Pickoff Caught Stealing")
+    logging.info("Handling Pickoff Caught Stealing")
 
     # Check if "picked off" occurs exactly once
     if description.lower().count("picked off") != 1:
-        logging.info(f"Error: 'Picked off' appears more than once in the description.")
+        logging.info("Error: 'Picked off' appears more than once in the description.")
         return
 
     # Extract the player's name who was picked off
@@ -801,13 +599,13 @@ def handle_pickoff_caught_stealing(description, game_state, player_map):
         player_name_part = description.split("picked off")[0].split(",")[-1].strip()
         player_name = process_name(player_name_part)
     except IndexError:
-        logging.info(f"Error: Could not find player's name in the description.")
+        logging.info("Error: Could not find player's name in the description.")
         return
 
     # Resolve the player ID using the player map
     player_id = get_closest_player_id(player_name, player_map)
     if not player_id:
-        logging.info(f"Warning: Player '{player_name}' not found in the player map.")
+        logging.info("Warning: Player '%s' not found in the player map.", player_name)
         return
 
     # Determine which base the player was attempting to steal based on the description
@@ -821,23 +619,24 @@ def handle_pickoff_caught_stealing(description, game_state, player_map):
         base_to_check = Base.THIRD
         target_base = "Home"
     else:
-        logging.info(f"Error: Could not determine which base the player was attempting to steal.")
+        logging.info("Error: Could not determine which base the player was attempting to steal.")
         return
 
     # Check if the player is on the expected base and update the game state
     runner_on_base = game_state.bases_occupied.get(base_to_check, -1)
     if runner_on_base == player_id:
         game_state.bases_occupied[base_to_check] = -1
-        logging.info(f"Player '{player_name}' (ID: {player_id}) was picked off and caught stealing {target_base}.")
+        logging.info("Player '%s' (ID: %s) was picked off and caught stealing %s.", player_name, player_id, target_base)
     else:
-        logging.info(f"Warning: No player found on {base_to_check.name} to pick off (Expected Player ID: {player_id}).")
+        logging.info("Warning: No player found on %s to pick off (Expected Player ID: %s).",
+                     base_to_check.name, player_id)
 
 
 def handle_caught_stealing(description, game_state, player_map):
-    logging.info(f"Handling Caught Stealing")
+    logging.info("Handling Caught Stealing")
     # Check if "caught stealing" occurs exactly once
     if description.lower().count("caught stealing") != 1:
-        logging.info(f"Warning: 'Caught stealing' appears more than once in the description.")
+        logging.info("Warning: 'Caught stealing' appears more than once in the description.")
         return
 
     # Extract the player's name based on the format of the description
@@ -852,13 +651,13 @@ def handle_caught_stealing(description, game_state, player_map):
         # Clean and process the player's name
         player_name = process_name(player_name_part)
     except IndexError:
-        logging.info(f"Warning: Could not find player's name in the description.")
+        logging.info("Warning: Could not find player's name in the description.")
         return
 
     # Resolve the player ID using the player map
     player_id = get_closest_player_id(player_name, player_map)
     if not player_id:
-        logging.info(f"Warning: Player '{player_name}' not found in the player map.")
+        logging.info("Warning: Player '%s' not found in the player map.", player_name)
         return
 
     # Determine which base the player was attempting to steal based on the description
@@ -872,35 +671,36 @@ def handle_caught_stealing(description, game_state, player_map):
         base_to_check = Base.THIRD
         target_base = "Home"
     else:
-        logging.info(f"Warning: Could not determine which base the player was attempting to steal.")
+        logging.info("Warning: Could not determine which base the player was attempting to steal.")
         return
 
     # Check if the player is on the expected base and update the game state
     runner_on_base = game_state.bases_occupied.get(base_to_check, -1)
     if runner_on_base == player_id:
         game_state.bases_occupied[base_to_check] = -1
-        logging.info(f"Player '{player_name}' (ID: {player_id}) was caught stealing {target_base}.")
+        logging.info("Player '%s' (ID: %s) was caught stealing %s.", player_name, player_id, target_base)
     else:
-        logging.info(f"Warning: No player found on {base_to_check.name} to be caught stealing (Expected Player ID: {player_id}).")
+        logging.info("Warning: No player found on %s to be caught stealing (Expected Player ID: %s).",
+                     base_to_check.name, player_id)
         # TODO: there are rare cases when statcast is wrong so we don't have anyone on base to steal
         # we can see what the description implies, and create a decision point that we return from this function
         # and then in our process loop if an event handler returns something that means we should overwrite the previous
         # decision point with our corrected one
 
 def _replace_on_base(game_state, old_player_id, new_player_id):
-    for base, occupant in game_state.bases_occupied.items():
-        if occupant == old_player_id:
-            game_state.bases_occupied[base] = new_player_id
-            logging.info(f"Player {new_player_id} replaces {old_player_id} on {base.name}.")
-            return
-    logging.info(f"Warning: Could not find {old_player_id} on any base to replace.")
+    base = game_state.runner_base(old_player_id)
+    if base is not None:
+        game_state.bases_occupied[base] = new_player_id
+        logging.info("Player %s replaces %s on %s.", new_player_id, old_player_id, base.name)
+        return
+    logging.info("Warning: Could not find %s on any base to replace.", old_player_id)
 
 
 def _replace_position_player(game_state, team, old_player_id, new_player_id):
-    logging.info(f"entered replace position player/pitcher function: ")
-    logging.info(f" team: team")
-    logging.info(f" old_player_id: old_player_id")
-    logging.info(f" new_player_id: new_player_id")
+    logging.info("entered replace position player/pitcher function: ")
+    logging.info(" team: team")
+    logging.info(" old_player_id: old_player_id")
+    logging.info(" new_player_id: new_player_id")
 
     # Determine which team's position players and flags we are working with
     if team == 'home':
@@ -912,19 +712,19 @@ def _replace_position_player(game_state, team, old_player_id, new_player_id):
     else:
         raise ValueError("Team must be 'home' or 'away'")
 
-    logging.info(f"current_pitcher: {current_pitcher}")
+    logging.info("current_pitcher: %s", current_pitcher)
 
 
     # Replace a position player in the field
     for position, player_id in position_players.items():
         if player_id == old_player_id:
-            logging.info(f"Replacing {old_player_id} at {position} with {new_player_id} for {team}")
+            logging.info("Replacing %s at %s with %s for %s", old_player_id, position, new_player_id, team)
             game_state.set_position_player(team, position, new_player_id)
             return
 
     # If the old player is the pitcher, replace the pitcher
     if old_player_id == current_pitcher or current_pitcher is None:
-        logging.info(f"Replacing pitcher for {team}: {old_player_id} with {new_player_id}")
+        logging.info("Replacing pitcher for %s: %s with %s", team, old_player_id, new_player_id)
         if team == 'home':
             game_state.home_pitcher = new_player_id
         else:
@@ -937,16 +737,18 @@ def _replace_in_batting_order(game_state, team, old_player_id, new_player_id, ba
     if batting_position is not None:
         # If a batting position is specified, insert the new player at that position
         lineup[batting_position - 1] = new_player_id
-        logging.info(f"Inserted {new_player_id} into the {team} batting order at position {batting_position}.")
+        logging.info("Inserted %s into the %s batting order at position %s.", new_player_id, team, batting_position)
     else:
         # Find the old player in the batting lineup and replace them with the new player
         for idx, player_id in enumerate(lineup):
             if player_id == old_player_id:
                 lineup[idx] = new_player_id
-                logging.info(f"Replaced {old_player_id} with {new_player_id} in the {team} batting order at position {idx + 1}.")
+                logging.info("Replaced %s with %s in the %s batting order at position %s.",
+                             old_player_id, new_player_id, team, idx + 1)
                 return
 
-        logging.info(f"Warning: Could not find {old_player_id} in the {team} batting order to replace with {new_player_id}.")
+        logging.info("Warning: Could not find %s in the %s batting order to replace with %s.",
+                     old_player_id, team, new_player_id)
 
 
 def _extract_from_defensive_sub_desc(description):
@@ -960,21 +762,17 @@ def _extract_from_defensive_sub_desc(description):
     new_player_name = parts[0].strip().split(' replaces ')[0].strip()
 
     # Find the old player name
-    old_player_pattern = r'replaces\s+(.*?)(?:,|\s*$)'
-    old_player_match = re.search(old_player_pattern, description)
+    old_player_match = DEFENSIVE_SUB_OLD_PLAYER_REGEX.search(description)
     old_player_name = old_player_match.group(1) if old_player_match else None
 
     # Extract the position the new player is playing
-    position_pattern = r'playing\s+(.*?)(?:,|\s*$)'
-    position_match = re.search(position_pattern, description)
+    position_match = DEFENSIVE_SUB_POSITION_REGEX.search(description)
     target_position = position_match.group(1) if position_match else None
 
     # Clean up player names
     if old_player_name:
         # Remove position if it's included with the old player's name
-        old_player_name = re.sub(
-            r'\b(first baseman|second baseman|shortstop|third baseman|left fielder|right fielder|catcher|center fielder|pitcher)\s+',
-            '', old_player_name)
+        old_player_name = DEFENSIVE_SUB_POSITION_PREFIX_REGEX.sub('', old_player_name)
         old_player_name = old_player_name.strip()
 
     # Remove any middle initials from player names
@@ -986,9 +784,7 @@ def _extract_from_defensive_sub_desc(description):
 
 def remove_middle_initials(name):
     # Pattern to match names with one or more middle initials (case insensitive)
-    pattern = r'^(\w+)\s+(?:[A-Za-z]\.?\s+)+(\w+)$'
-
-    match = re.match(pattern, name)
+    match = MIDDLE_INITIALS_REGEX.match(name)
     if match:
         # If the pattern matches, return the name without middle initials
         return f"{match.group(1)} {match.group(2)}"
@@ -0,0 +1,87 @@
+import json
+import os
+from collections import Counter
+from pathlib import Path
+from event_type_index import EventTypeIndex, GAME_EVENTS_CSV
+
+EVENT_COUNTS_JSON = "events_data/event_counts.json"
+EVENT_STATS_CSV = "events_data/final_event_stats.csv"
+
+
+def write_event_stats_csv(games_occurred, total_games, output_csv=EVENT_STATS_CSV):
+    """Write how many games each event type occurred in, most common first, like final_event_stats.csv"""
+    rows = sorted(games_occurred.items(), key=lambda item: (-item[1], item[0]))
+    with open(output_csv, 'w', newline='') as f:
+        f.write("Event Type,Games Occurred,Percentage of Games\r\n")
+        for event_type, games in rows:
+            f.write(f"{event_type},{games},{games / total_games * 100:.2f}%\r\n")
+
+
+class EventStats:
+    """
+    Event type statistics collected while games are processed instead of in a separate pass over every game.
+    Holds how many times each type occurred in each game, and keeps game_events_results.csv and
+    final_event_stats.csv in line with it. Reprocessing some games only replaces their own counts, and the
+    stats of parallel workers can be combined with merge.
+    """
+
+    def __init__(self, index_csv=GAME_EVENTS_CSV, counts_json=EVENT_COUNTS_JSON, stats_csv=EVENT_STATS_CSV):
+        self.index = EventTypeIndex(index_csv)
+        self.counts_path = Path(counts_json)
+        self.stats_csv = stats_csv
+        # game_pk -> {event type: occurrences}, types in order of first appearance
+        self.game_counts = {}
+        self.dirty = False
+
+    @classmethod
+    def load(cls, index_csv=GAME_EVENTS_CSV, counts_json=EVENT_COUNTS_JSON, stats_csv=EVENT_STATS_CSV):
+        stats = cls(index_csv, counts_json, stats_csv)
+        stats.index = EventTypeIndex.load(index_csv)
+        if stats.counts_path.exists():
+            with open(stats.counts_path) as f:
+                stats.game_counts = {int(game_pk): counts for game_pk, counts in json.load(f).items()}
+        return stats
+
+    @classmethod
+    def load_dir(cls, stats_dir='events_data'):
+        """Load the stats kept in stats_dir under the usual file names"""
+        stats_dir = Path(stats_dir)
+        return cls.load(stats_dir / Path(GAME_EVENTS_CSV).name, stats_dir / Path(EVENT_COUNTS_JSON).name,
+                        stats_dir / Path(EVENT_STATS_CSV).name)
+
+    def add_game(self, game_pk, event_counts):
+        game_pk = int(game_pk)
+        event_counts = dict(event_counts)
+        if self.game_counts.get(game_pk) == event_counts:
+            return
+        self.game_counts[game_pk] = event_counts
+        self.index.update_game(game_pk, list(event_counts))
+        self.dirty = True
+
+    def merge(self, other):
+        """Take over every game another EventStats (e.g. a worker's) has counted"""
+        for game_pk, event_counts in other.game_counts.items():
+            self.add_game(game_pk, event_counts)
+
+    def event_frequency(self):
+        """How many times each event type occurred over every counted game"""
+        frequency = Counter()
+        for event_counts in self.game_counts.values():
+            frequency.update(event_counts)
+        return frequency
+
+    def games_occurred(self):
+        """How many games each event type occurred in, over every game in game_events_results.csv"""
+        return {event_type: len(game_pks) for event_type, game_pks in self.index.games_by_type.items() if game_pks}
+
+    def save(self):
+        if not self.dirty:
+            return
+        self.index.save()
+        self.counts_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.counts_path.with_name(self.counts_path.name + ".tmp")
+        with open(temp_path, 'w') as f:
+            json.dump(self.game_counts, f)
+        os.replace(temp_path, self.counts_path)
+        write_event_stats_csv(self.games_occurred(), len(self.index.game_types), self.stats_csv)
+        self.dirty = False
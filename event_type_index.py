@@ -0,0 +1,78 @@
+import logging
+import os
+from pathlib import Path
+
+GAME_EVENTS_CSV = "events_data/game_events_results.csv"
+
+
+class EventTypeIndex:
+    """
+    Which games each event type shows up in, kept in game_events_results.csv (one game_pk per line followed by
+    its event types) and inverted in memory so the games containing a set of types can be looked up directly.
+    """
+
+    def __init__(self, path=GAME_EVENTS_CSV):
+        self.path = Path(path)
+        # game_pk -> its event types, in file order
+        self.game_types = {}
+        # event type -> game_pks
+        self.games_by_type = {}
+        # The file that's checked in was written with Windows line endings, keep whatever we loaded
+        self.newline = "\n"
+        self.dirty = False
+
+    @classmethod
+    def load(cls, path=GAME_EVENTS_CSV):
+        index = cls(path)
+        if not index.path.exists():
+            return index
+        with open(index.path, newline='') as f:
+            header = next(f, "")
+            if header.endswith("\r\n"):
+                index.newline = "\r\n"
+            for line in f:
+                line = line.rstrip('\r\n')
+                if not line:
+                    continue
+                game_pk, _, event_types = line.partition(',')
+                index._add(int(game_pk), event_types.split(',') if event_types else [])
+        return index
+
+    def _add(self, game_pk, event_types):
+        self.game_types[game_pk] = event_types
+        for event_type in event_types:
+            self.games_by_type.setdefault(event_type, set()).add(game_pk)
+
+    def update_game(self, game_pk, event_types):
+        game_pk = int(game_pk)
+        old_event_types = self.game_types.get(game_pk)
+        if old_event_types is not None:
+            if set(old_event_types) == set(event_types):
+                return
+            for event_type in old_event_types:
+                self.games_by_type[event_type].discard(game_pk)
+        self._add(game_pk, list(event_types))
+        self.dirty = True
+
+    def games_with(self, event_types):
+        """Every game that has at least one of event_types, sorted"""
+        game_pks = set()
+        for event_type in event_types:
+            game_pks |= self.games_by_type.get(event_type, set())
+        return sorted(game_pks)
+
+    def event_types(self):
+        return [event_type for event_type, game_pks in self.games_by_type.items() if game_pks]
+
+    def save(self):
+        if not self.dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(temp_path, 'w', newline='') as f:
+            f.write("game_pk,event_types" + self.newline)
+            for game_pk, event_types in self.game_types.items():
+                f.write(",".join([str(game_pk)] + event_types) + self.newline)
+        os.replace(temp_path, self.path)
+        self.dirty = False
+        logging.info(f"Saved event types of {len(self.game_types)} games to {self.path}")
@@ -0,0 +1,144 @@
+"""
+Exports the written decision points as memory-mapped NumPy arrays, so training code can slice any set of games
+without reading CSVs, turning player IDs into ints or encoding the event types again.
+
+    python cli.py export --games-dir games --output-dir features
+
+Every array has one row per decision point, games one after the other in game_pk order:
+
+    players.npy       int32 (rows, 41)  the player columns of DECISION_COLUMNS, -1 where nobody is there
+    state.npy         int16 (rows, 5)   Inning, Half (0 top, 1 bottom), At_Bat, Score_Deficit, Outs
+    event_codes.npy   int16 (rows,)     Event_Type as its index in the vocabulary
+    is_decision.npy   int8  (rows,)     the label
+    game_pks.npy      int64 (games,)
+    game_offsets.npy  int64 (games + 1,) a game's rows are game_offsets[i]:game_offsets[i + 1]
+
+vocabulary.json has the event types and the column names, and is written last. Event codes of an earlier export in
+the same directory are kept, new types are added after them.
+"""
+import json
+import logging
+from pathlib import Path
+
+import numpy as np
+
+from game_state import PLAYER_COLUMNS
+
+STATE_COLUMNS = ['Inning', 'Half', 'At_Bat', 'Score_Deficit', 'Outs']
+HALVES = ['Top', 'Bot']
+VOCABULARY_FILENAME = "vocabulary.json"
+FEATURE_VERSION = 1
+
+
+def decision_files(games_dir, game_pks=None):
+    """game_pk -> decision file of every game written to games_dir, in game_pk order"""
+    files = {}
+    for path in Path(games_dir).glob("game_*_decisions.*"):
+        if path.suffix not in ('.csv', '.parquet'):
+            continue
+        game_pk = int(path.name.split('_')[1])
+        if game_pks is None or game_pk in game_pks:
+            files[game_pk] = path
+    return dict(sorted(files.items()))
+
+
+def _read_decisions(path):
+    import pandas as pd
+
+    return pd.read_parquet(path) if path.suffix == '.parquet' else pd.read_csv(path)
+
+
+def _count_rows(path):
+    if path.suffix == '.parquet':
+        return len(_read_decisions(path))
+    # Nothing in a decision CSV is quoted over more than one line
+    with open(path, 'rb') as f:
+        return sum(1 for _ in f) - 1
+
+
+def export_features(games_dir='games', output_dir='features', game_pks=None):
+    """Write the feature arrays of every decision file in games_dir (or only of game_pks) to output_dir"""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    files = decision_files(games_dir, set(game_pks) if game_pks is not None else None)
+
+    event_types = []
+    vocabulary_path = output_dir / VOCABULARY_FILENAME
+    if vocabulary_path.exists():
+        with open(vocabulary_path) as f:
+            event_types = json.load(f)['event_types']
+    event_codes = {event_type: code for code, event_type in enumerate(event_types)}
+
+    # The arrays are sized up front, so count the rows first
+    game_offsets = np.zeros(len(files) + 1, dtype=np.int64)
+    np.cumsum([_count_rows(path) for path in files.values()], out=game_offsets[1:])
+    rows = int(game_offsets[-1])
+
+    def open_array(name, dtype, shape):
+        return np.lib.format.open_memmap(output_dir / f"{name}.npy", mode='w+', dtype=dtype, shape=shape)
+
+    players = open_array('players', np.int32, (rows, len(PLAYER_COLUMNS)))
+    state = open_array('state', np.int16, (rows, len(STATE_COLUMNS)))
+    codes = open_array('event_codes', np.int16, (rows,))
+    is_decision = open_array('is_decision', np.int8, (rows,))
+
+    for index, (game_pk, path) in enumerate(files.items()):
+        start, end = game_offsets[index], game_offsets[index + 1]
+        decision_df = _read_decisions(path)
+        if len(decision_df) != end - start:
+            raise ValueError(f"{path} changed while exporting")
+        players[start:end] = decision_df[PLAYER_COLUMNS].fillna(-1).to_numpy(dtype=np.int32)
+        game_state = decision_df[STATE_COLUMNS].copy()
+        game_state['Half'] = (game_state['Half'] == HALVES[1]).astype(np.int16)
+        state[start:end] = game_state.to_numpy(dtype=np.int16)
+        for event_type in decision_df['Event_Type'].unique():
+            event_codes.setdefault(event_type, len(event_codes))
+        codes[start:end] = decision_df['Event_Type'].map(event_codes).to_numpy(dtype=np.int16)
+        is_decision[start:end] = decision_df['Is_Decision'].to_numpy(dtype=np.int8)
+
+    for array in [players, state, codes, is_decision]:
+        array.flush()
+    np.save(output_dir / 'game_pks.npy', np.fromiter(files, dtype=np.int64, count=len(files)))
+    np.save(output_dir / 'game_offsets.npy', game_offsets)
+    with open(vocabulary_path, 'w') as f:
+        json.dump({'version': FEATURE_VERSION, 'event_types': list(event_codes), 'halves': HALVES,
+                   'state_columns': STATE_COLUMNS, 'player_columns': PLAYER_COLUMNS, 'rows': rows,
+                   'games': len(files)}, f, indent=1)
+    logging.info(f"Exported {rows} decision points of {len(files)} games to {output_dir}")
+    return rows
+
+
+class DecisionFeatures:
+    """An export opened read-only, the arrays are memory-mapped so only the rows that are used get read"""
+
+    def __init__(self, features_dir='features'):
+        features_dir = Path(features_dir)
+        with open(features_dir / VOCABULARY_FILENAME) as f:
+            self.vocabulary = json.load(f)
+        self.event_types = self.vocabulary['event_types']
+        self.players = np.load(features_dir / 'players.npy', mmap_mode='r')
+        self.state = np.load(features_dir / 'state.npy', mmap_mode='r')
+        self.event_codes = np.load(features_dir / 'event_codes.npy', mmap_mode='r')
+        self.is_decision = np.load(features_dir / 'is_decision.npy', mmap_mode='r')
+        self.game_pks = np.load(features_dir / 'game_pks.npy')
+        self.game_offsets = np.load(features_dir / 'game_offsets.npy')
+
+    def __len__(self):
+        return len(self.event_codes)
+
+    def game_rows(self, game_pk):
+        """The slice of a game's rows"""
+        index = np.searchsorted(self.game_pks, game_pk)
+        if index == len(self.game_pks) or self.game_pks[index] != game_pk:
+            raise KeyError(f"Game {game_pk} isn't in the export")
+        return slice(int(self.game_offsets[index]), int(self.game_offsets[index + 1]))
+
+    def rows(self, game_pks):
+        """Indices of the rows of all game_pks, to index any of the arrays with"""
+        slices = [self.game_rows(game_pk) for game_pk in game_pks]
+        if not slices:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate([np.arange(rows.start, rows.stop) for rows in slices])
+
+    def event_code(self, event_type):
+        return self.event_types.index(event_type)
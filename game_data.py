@@ -0,0 +1,20 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class GameData:
+    """Container for scraped game data"""
+    away_lineup: list
+    away_sub_ins: list
+    away_player_map: dict
+    away_bullpen: list
+    away_position_map: dict
+    home_lineup: list
+    home_sub_ins: list
+    home_player_map: dict
+    home_bullpen: list
+    home_position_map: dict
+    game_summary: list
+    game_pk: str
+    home_abbr: str
+    away_abbr: str
@@ -1,3 +1,4 @@
+from array import array
 from enum import Enum, auto
 
 
@@ -24,12 +25,119 @@ class FieldPosition(Enum):
     RIGHT_FIELD = "RF"
 
 
+# Slot values for an empty base or lineup spot, and for a player we have no ID for (None outside the array)
+EMPTY = -1
+MISSING = -2
+
+# Every decision point has these columns, in this order
+DECISION_COLUMNS = [
+    "Event_Type", "Is_Decision", "Inning", "Half", "At_Bat", "Score_Deficit", "Outs",
+    "Third_Base", "Second_Base", "First_Base", "Home_Pitcher", "Away_Pitcher"
+]
+for _i in range(1, 10):  # Lineup positions 1 to 9
+    DECISION_COLUMNS.append(f"Home_Lineup_{_i}")
+    DECISION_COLUMNS.append(f"Away_Lineup_{_i}")
+for _pos in FieldPosition:
+    DECISION_COLUMNS.append(f"Home_{_pos.value}")
+    DECISION_COLUMNS.append(f"Away_{_pos.value}")
+
+COLUMN_INDEX = {column: index for index, column in enumerate(DECISION_COLUMNS)}
+
+# The player part of the state is stored flat, in the same order as its columns, starting at Third_Base
+PLAYER_COLUMNS_START = COLUMN_INDEX["Third_Base"]
+PLAYER_COLUMNS = DECISION_COLUMNS[PLAYER_COLUMNS_START:]
+
+
+def _slot(column):
+    return COLUMN_INDEX[column] - PLAYER_COLUMNS_START
+
+
+BASE_SLOTS = {Base.FIRST: _slot("First_Base"), Base.SECOND: _slot("Second_Base"), Base.THIRD: _slot("Third_Base")}
+# Each base is one bit of the occupancy mask
+BASE_BITS = {Base.FIRST: 1, Base.SECOND: 2, Base.THIRD: 4}
+_BASE_SLOT_BITS = [(base, BASE_SLOTS[base], BASE_BITS[base]) for base in BASE_SLOTS]
+PITCHER_SLOTS = {'home': _slot("Home_Pitcher"), 'away': _slot("Away_Pitcher")}
+LINEUP_SLOTS = {team: [_slot(f"{team.capitalize()}_Lineup_{i}") for i in range(1, 10)] for team in ['home', 'away']}
+POSITION_SLOTS = {team: {pos: _slot(f"{team.capitalize()}_{pos.value}") for pos in FieldPosition}
+                  for team in ['home', 'away']}
+
+
+class SlotMap:
+    """Dict-like view of some of the state slots, keyed by Base or FieldPosition"""
+    __slots__ = ('_slots', '_index')
+
+    def __init__(self, slots, index):
+        self._slots = slots
+        self._index = index
+
+    def __getitem__(self, key):
+        return _from_slot(self._slots[self._index[key]])
+
+    def __setitem__(self, key, value):
+        self._slots[self._index[key]] = _to_slot(value)
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+    def get(self, key, default=None):
+        if key in self._index:
+            return self[key]
+        return default
+
+    def keys(self):
+        return list(self._index)
+
+    def values(self):
+        return [self[key] for key in self._index]
+
+    def items(self):
+        return [(key, self[key]) for key in self._index]
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+
+class LineupSlots:
+    """List-like view of a team's nine batting order slots"""
+    __slots__ = ('_slots', '_positions')
+
+    def __init__(self, slots, positions):
+        self._slots = slots
+        self._positions = positions
+
+    def __getitem__(self, index):
+        return _from_slot(self._slots[self._positions[index]])
+
+    def __setitem__(self, index, player_id):
+        self._slots[self._positions[index]] = _to_slot(player_id)
+
+    def __len__(self):
+        return len(self._positions)
+
+    def __iter__(self):
+        return (_from_slot(self._slots[position]) for position in self._positions)
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+def _to_slot(player_id):
+    return MISSING if player_id is None else player_id
+
+
+def _from_slot(value):
+    return None if value == MISSING else value
+
 
 class GameState:
     __slots__ = ('home_abbr', 'away_abbr', 'inning', 'half', 'score_home', 'score_away', 'outs',
-                 'bases_occupied', 'home_lineup', 'away_lineup',
-                 'home_pitcher', 'home_sub_ins', 'away_pitcher', 'away_sub_ins',
-                 'home_position_players', 'away_position_players', 'at_bat', 'home_has_dh', 'away_has_dh', 'prev_half')
+                 '_players', 'home_sub_ins', 'away_sub_ins', 'at_bat', 'home_has_dh', 'away_has_dh', 'prev_half')
 
     def __init__(self, home_abbr=None, away_abbr=None, inning=1, half=Half.TOP, score_home=0, score_away=0, outs=0,
                  bases_occupied=None, home_lineup=None, away_lineup=None,
@@ -42,6 +150,8 @@ class GameState:
         self.score_home = score_home
         self.score_away = score_away
         self.outs = outs
+        # Bases, pitchers, lineups and positions all live in one fixed-width array laid out like the columns
+        self._players = array('q', [MISSING] * len(PLAYER_COLUMNS))
         self.bases_occupied = bases_occupied or {
             Base.FIRST: -1,
             Base.SECOND: -1,
@@ -53,74 +163,120 @@ class GameState:
         self.away_pitcher = away_pitcher
         self.home_sub_ins = home_sub_ins
         self.away_sub_ins = away_sub_ins
-        self.home_position_players = home_position_players or {pos: None for pos in FieldPosition}
-        self.away_position_players = away_position_players or {pos: None for pos in FieldPosition}
+        if home_position_players:
+            self.home_position_players = home_position_players
+        if away_position_players:
+            self.away_position_players = away_position_players
         self.at_bat = at_bat
         self.home_has_dh = home_has_dh
         self.away_has_dh = away_has_dh
 
+    @property
+    def bases_occupied(self):
+        return SlotMap(self._players, BASE_SLOTS)
+
+    @bases_occupied.setter
+    def bases_occupied(self, bases_occupied):
+        for base, player_id in bases_occupied.items():
+            self._players[BASE_SLOTS[base]] = _to_slot(player_id)
+
+    @property
+    def home_lineup(self):
+        return LineupSlots(self._players, LINEUP_SLOTS['home'])
+
+    @home_lineup.setter
+    def home_lineup(self, lineup):
+        self._set_lineup('home', lineup)
+
+    @property
+    def away_lineup(self):
+        return LineupSlots(self._players, LINEUP_SLOTS['away'])
+
+    @away_lineup.setter
+    def away_lineup(self, lineup):
+        self._set_lineup('away', lineup)
+
+    def _set_lineup(self, team, lineup):
+        # There are exactly nine lineup columns, a lineup that doesn't fill them is never cut down or padded
+        if len(lineup) != 9:
+            raise ValueError(f"The {team} lineup has {len(lineup)} players instead of 9")
+        for position, player_id in zip(LINEUP_SLOTS[team], lineup):
+            self._players[position] = _to_slot(player_id)
+
+    @property
+    def home_pitcher(self):
+        return _from_slot(self._players[PITCHER_SLOTS['home']])
+
+    @home_pitcher.setter
+    def home_pitcher(self, player_id):
+        self._players[PITCHER_SLOTS['home']] = _to_slot(player_id)
+
+    @property
+    def away_pitcher(self):
+        return _from_slot(self._players[PITCHER_SLOTS['away']])
+
+    @away_pitcher.setter
+    def away_pitcher(self, player_id):
+        self._players[PITCHER_SLOTS['away']] = _to_slot(player_id)
+
+    @property
+    def home_position_players(self):
+        return SlotMap(self._players, POSITION_SLOTS['home'])
+
+    @home_position_players.setter
+    def home_position_players(self, position_players):
+        for position, player_id in position_players.items():
+            self.set_position_player('home', position, player_id)
+
+    @property
+    def away_position_players(self):
+        return SlotMap(self._players, POSITION_SLOTS['away'])
+
+    @away_position_players.setter
+    def away_position_players(self, position_players):
+        for position, player_id in position_players.items():
+            self.set_position_player('away', position, player_id)
+
     def update(self, **kwargs):
         for key, value in kwargs.items():
             setattr(self, key, value)
 
     def set_position_player(self, team, position, player):
-        if team == 'home':
-            self.home_position_players[position] = player
-        elif team == 'away':
-            self.away_position_players[position] = player
+        if team == 'home' or team == 'away':
+            self._players[POSITION_SLOTS[team][position]] = _to_slot(player)
         else:
             raise ValueError("Team must be 'home' or 'away'")
 
     def get_position_player(self, team, position):
-        if team == 'home':
-            return self.home_position_players[position]
-        elif team == 'away':
-            return self.away_position_players[position]
+        if team == 'home' or team == 'away':
+            return _from_slot(self._players[POSITION_SLOTS[team][position]])
         else:
             raise ValueError("Team must be 'home' or 'away'")
 
-    def create_decision_point(self, event, is_decision, player_map) -> dict:
-        decision_point = {
-            "Event_Type": event['type'],
-            "Is_Decision": is_decision,
-            "Inning": self.inning,
-            "Half": self.half.value,
-            "At_Bat": self.at_bat,
-            "Score_Deficit": self.score_home - self.score_away,
-            "Outs": self.outs,
-            "Third_Base": self._get_player_representation(self.bases_occupied[Base.THIRD], player_map),
-            "Second_Base": self._get_player_representation(self.bases_occupied[Base.SECOND], player_map),
-            "First_Base": self._get_player_representation(self.bases_occupied[Base.FIRST], player_map),
-            "Home_Pitcher": self._get_player_representation(self.home_pitcher, player_map),
-            "Away_Pitcher": self._get_player_representation(self.away_pitcher, player_map),
-        }
-
-        # Add individual lineup positions with player ID and name
-        for i in range(9):
-            decision_point[f"Home_Lineup_{i + 1}"] = self._get_player_representation(self.home_lineup[i], player_map)
-            decision_point[f"Away_Lineup_{i + 1}"] = self._get_player_representation(self.away_lineup[i], player_map)
-
-        # Add position players with player ID and name
-        for pos, player_id in self.home_position_players.items():
-            decision_point[f"Home_{pos.value}"] = player_id
-        for pos, player_id in self.away_position_players.items():
-            decision_point[f"Away_{pos.value}"] = player_id
+    def create_decision_point(self, event, is_decision) -> tuple:
+        """
+        Snapshot of the pre-event state as a tuple in DECISION_COLUMNS order.
+        Players are IDs, EMPTY or MISSING, build_decision_df turns those into blank cells.
+        """
+        return (event['type'], is_decision, self.inning, self.half.value, self.at_bat,
+                self.score_home - self.score_away, self.outs, *self._players)
 
+    def occupied_mask(self):
+        """Bases with anyone on them as BASE_BITS, a runner we couldn't identify still takes up the base"""
+        mask = 0
+        for _, slot, bit in _BASE_SLOT_BITS:
+            if self._players[slot] != EMPTY:
+                mask |= bit
+        return mask
 
-        return decision_point
-
-    def _get_player_representation(self, player_id, player_map):
-        """Helper method to concatenate the player ID and name for easier debugging."""
-        if player_id is None or player_id == -1:
-            return None
-        # player_name = player_map.get(player_id, "Unknown")
-        return f"{player_id}"
+    def runner_base(self, player_id):
+        """The base player_id is on, or None. Checks first to third, the same order as bases_occupied"""
+        value = _to_slot(player_id)
+        for base, slot, _ in _BASE_SLOT_BITS:
+            if self._players[slot] == value:
+                return base
+        return None
 
     def empty_bases(self):
-        self.bases_occupied = {
-            Base.FIRST: -1,
-            Base.SECOND: -1,
-            Base.THIRD: -1
-        }
-
-
+        for position in BASE_SLOTS.values():
+            self._players[position] = EMPTY
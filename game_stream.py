@@ -0,0 +1,106 @@
+"""
+Incremental replay of a game whose events arrive one at a time, e.g. from a live feed, without a complete GameData
+or a written file at the end.
+
+    stream = GameStream.from_game_data(game_data, at_bats=at_bat_summary)
+    for record in stream.push(event, 'Top 1st'):
+        if record.update:
+            ...  # the decision point at record.index was corrected
+        else:
+            ...  # a new decision point
+
+Each pushed event gives its decision point right away. When an event starts a new at-bat, the runners of the
+previous at-bat are checked against Statcast like create_dataset does, and the rows that change come back as update
+records for decision points that were already handed out. Statcast at-bat rows can be added at any time, an at-bat
+only needs its row before its first event is pushed. Everything done per event is a dict lookup, the corrections only
+look at the previous at-bat's rows.
+"""
+from collections import Counter
+from dataclasses import dataclass
+
+from game_state import DECISION_COLUMNS
+from main import (initial_game_state, parse_inning_label, intern_event_types, process_event, build_decision_df,
+                  _row_cells)
+from statcast_at_bats import AtBatSkeleton
+
+
+@dataclass(frozen=True)
+class DecisionRecord:
+    """A new decision point, or with update set the corrected version of the one at index"""
+    index: int
+    row: tuple
+    update: bool = False
+
+    def as_dict(self):
+        """Column -> value with blank players as None, the way they are written out"""
+        return dict(zip(DECISION_COLUMNS, _row_cells(self.row)))
+
+
+class GameStream:
+    def __init__(self, home_abbr, away_abbr, home_lineup, away_lineup, home_bullpen, away_bullpen,
+                 home_position_map, away_position_map, home_player_map, away_player_map, at_bats=None,
+                 registry=None):
+        self.game_state, self.player_map = initial_game_state(
+            home_abbr, away_abbr, home_lineup, away_lineup, home_bullpen, away_bullpen,
+            home_position_map, away_position_map, home_player_map, away_player_map, registry)
+        self.skeleton = AtBatSkeleton()
+        self.decision_rows = []
+        # Row indices of every at-bat, so the previous at-bat's rows are found without a scan
+        self.at_bat_rows = {}
+        self.event_counts = Counter()
+        if at_bats is not None:
+            self.add_at_bats(at_bats)
+
+    @classmethod
+    def from_game_data(cls, game_data, at_bats=None, registry=None):
+        """Start a stream from the rosters of a scraped game, its game_summary is ignored"""
+        return cls(game_data.home_abbr, game_data.away_abbr, game_data.home_lineup, game_data.away_lineup,
+                   game_data.home_bullpen, game_data.away_bullpen, game_data.home_position_map,
+                   game_data.away_position_map, game_data.home_player_map, game_data.away_player_map,
+                   at_bats, registry)
+
+    def add_at_bats(self, rows):
+        """Statcast rows of the game, as a DataFrame or dicts. Only the first row of each at-bat is used."""
+        if hasattr(rows, 'to_dict'):
+            rows = rows.to_dict('records')
+        for row in rows:
+            self.skeleton.add_at_bat(row)
+
+    def push(self, event, inning, at_bats=None):
+        """
+        Replay one scraped event of inning, given as its label ('Top 1st') or as (inning number, Half).
+        at_bats are Statcast rows to add first. Returns the update records of any corrections to the previous
+        at-bat followed by the event's decision point.
+        """
+        if at_bats is not None:
+            self.add_at_bats(at_bats)
+        inning_number, half = parse_inning_label(inning) if isinstance(inning, str) else inning
+        event_code = intern_event_types([event])[0]
+        self.event_counts[event['type']] += 1
+
+        # Same rule process_event uses to move on to a new at-bat, which is when the previous one gets corrected
+        previous_rows = ()
+        if event['type'] and event['atbat_index'] != self.game_state.at_bat:
+            previous_rows = self.at_bat_rows.get(self.game_state.at_bat, ())
+        before = [self.decision_rows[index] for index in previous_rows]
+
+        process_event(self.decision_rows, event, event_code, self.game_state, self.player_map, self.skeleton,
+                      inning_number, half, at_bat_rows=self.at_bat_rows)
+
+        records = [DecisionRecord(index, self.decision_rows[index], update=True)
+                   for index, row in zip(previous_rows, before) if self.decision_rows[index] != row]
+        records.append(DecisionRecord(len(self.decision_rows) - 1, self.decision_rows[-1]))
+        return records
+
+    def push_many(self, events, inning, at_bats=None):
+        """push for a batch of events of the same inning"""
+        if at_bats is not None:
+            self.add_at_bats(at_bats)
+        records = []
+        for event in events:
+            records += self.push(event, inning)
+        return records
+
+    def decision_df(self):
+        """Every decision point so far with all corrections applied, as process_game would return them"""
+        return build_decision_df(self.decision_rows)
@@ -1,18 +1,29 @@
 import logging
-import re
 import traceback
-from scraper import setup_webdriver, process_box, process_summary, GameData
-from game_state import GameState, FieldPosition
+from game_data import GameData
+from game_state import GameState, FieldPosition, DECISION_COLUMNS, COLUMN_INDEX, PLAYER_COLUMNS_START, EMPTY, MISSING
 from game_state import Half as Half
 from game_state import Base as Base
-from event_handlers import event_handlers
-from statcast_at_bats import get_at_bat_summary_for_game
-from event_handlers import process_name, get_closest_player_id
+from event_handlers import event_handlers, attempt_base_update
+from statcast_at_bats import get_at_bat_summary_for_game, AtBatSkeleton, StatcastAtBats
+from event_handlers import process_name, get_closest_player_id, PlayerIndex
+from base_corrections import apply_base_corrections
+from player_registry import PlayerRegistry
+from description_parser import PINCH_RUNNER_REGEX, load_play_cache, save_play_cache, take_new_plays, add_plays
+from tracing import tracer
+from output_writer import OutputWriter
+from build_cache import BuildCache, game_fingerprint
+from event_type_index import EventTypeIndex, GAME_EVENTS_CSV
+from event_stats import EventStats
+from defensive_timeline import build_game_timelines, find_alignment_disagreements
+from player_postings import PlayerPostings, game_postings
 import json
-import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
-import pandas as pd
-from tqdm import tqdm
+import numpy as np
 
 class GameProcessor:
     def __init__(self, scraped_dir: str = "scraped_games"):
@@ -20,9 +31,12 @@ class GameProcessor:
         if not self.scraped_dir.exists():
             raise ValueError(f"Scraped games directory {scraped_dir} does not exist")
 
+    def game_path(self, game_pk: str) -> Path:
+        return self.scraped_dir / f"game_{game_pk}.json"
+
     def load_game_data(self, game_pk: str) -> GameData:
         """Load game data from storage"""
-        game_path = self.scraped_dir / f"game_{game_pk}.json"
+        game_path = self.game_path(game_pk)
         if not game_path.exists():
             raise ValueError(f"No data found for game {game_pk}")
 
@@ -31,21 +45,61 @@ class GameProcessor:
             return GameData(**data)
 
 
-def create_dataset(num_games: int, input_csv: str, game_id: int = None, scraped_data_dir: str = "scraped_games"):
+def create_dataset(num_games: int, input_csv: str, game_id: int = None, scraped_data_dir: str = "scraped_games",
+                   vectorized_corrections: bool = False, debug_game_pk: int = None, output_format: str = 'csv',
+                   rebuild: bool = False, game_ids: list = None, verify_alignment: bool = False,
+                   statcast_first: bool = False, workers: int = 1, output_dir: str = 'games',
+                   stats_dir: str = 'events_data', error_log_path: str = 'game_processing_errors.log'):
+    """
+    Replay the scraped games and write their decision points to output_dir.
+    Games whose scraped data, Statcast at-bats and processing version all match the build manifest are skipped
+    unless rebuild is set. game_ids restricts the run to those games, num_games is ignored then.
+    With verify_alignment every processed game's pitchers and fielders are checked against the timelines in the
+    urls CSV and the disagreements are written to alignment_disagreements.csv next to the error log.
+    statcast_first picks the Statcast-first engine (see process_game).
+    With more than one worker the games are replayed in worker processes, which write their own game files and
+    hand everything else back, so the manifest, event stats and error log are still only written from here.
+    """
+    import pandas as pd
+    from tqdm import tqdm
+
     game_url_df = pd.read_csv(input_csv)
-    os.makedirs('games', exist_ok=True)
+    if game_ids is not None:
+        game_ids = set(game_ids)
+    # A reprocess of a few games shouldn't pay for walking and splitting the whole season
+    if game_id:
+        game_url_df = game_url_df[game_url_df['game_pk'] == game_id]
+    elif game_ids is not None:
+        game_url_df = game_url_df[game_url_df['game_pk'].isin(game_ids)]
+    if debug_game_pk:
+        # Dump the trace of this game once it's processed
+        tracer.configure(debug_game_pk=debug_game_pk)
     error_log = []
     processor = GameProcessor(scraped_data_dir)
-
-    statcast_data = pd.read_csv('helper_files/statcast_reduced2023.csv')
-
-    all_statcast_reduced = pd.read_csv('helper_files/statcast_reduced2023.csv').sort_values(
-        ['game_pk', 'inning', 'at_bat_number', 'pitch_number']
-    ).drop_duplicates(
-        subset=['game_pk', 'inning', 'inning_topbot', 'at_bat_number'],
-        keep='first'
-    ).reset_index(drop=True)
-
+    registry = PlayerRegistry.load_or_build(scraped_data_dir, [input_csv])
+    # Descriptions parsed on earlier runs only need their state transitions replayed
+    load_play_cache(scraped_data_dir)
+    # Event type stats of every game we process, so the stats files never need a separate pass over the season
+    event_stats = EventStats.load_dir(stats_dir)
+    generic_event_counts.clear()
+
+    statcast_at_bats = StatcastAtBats(game_pks=game_url_df['game_pk'] if game_id or game_ids is not None else None)
+
+    # Games are written on a background thread while the next one is being replayed
+    writer = OutputWriter(output_dir, output_format)
+    build_cache = BuildCache(output_dir)
+    # Which decision points every player is in, kept next to the game files
+    postings = PlayerPostings.load_dir(output_dir)
+    skipped_games = 0
+    alignment_disagreements = []
+
+    pool = None
+    pending = {}
+    if workers > 1:
+        options = dict(vectorized_corrections=vectorized_corrections, statcast_first=statcast_first,
+                       verify_alignment=verify_alignment, debug_game_pk=debug_game_pk)
+        pool = ProcessPoolExecutor(workers, initializer=_init_worker,
+                                   initargs=(scraped_data_dir, input_csv, output_dir, output_format, options))
 
     for index, row in tqdm(game_url_df.iterrows()):
         game_pk = row['game_pk']
@@ -53,112 +107,47 @@ def create_dataset(num_games: int, input_csv: str, game_id: int = None, scraped_
         if game_id:
             if game_pk != game_id:
                 continue
-        if index >= num_games and not game_id:
+        if game_ids is not None:
+            if game_pk not in game_ids:
+                continue
+        elif index >= num_games and not game_id:
             break
 
         try:
-            logging.info(f"\nProcessing game {game_pk}")
+            at_bat_summary = statcast_at_bats.for_game(row["game_pk"])
+            # at_bat_summary = get_at_bat_summary_for_game(input_csv, str(game_pk))
+
+            fingerprint = None
+            game_path = processor.game_path(str(game_pk))
+            if game_path.exists():
+                fingerprint = game_fingerprint(game_path.read_bytes(), at_bat_summary, registry)
+                if not rebuild and build_cache.is_fresh(game_pk, fingerprint, writer.output_path(game_pk)):
+                    skipped_games += 1
+                    continue
+                # The old output no longer matches, only record the new fingerprint once its file is written
+                build_cache.forget(game_pk)
+
+            if pool:
+                pending[pool.submit(_process_game_job, game_pk, row, at_bat_summary)] = (game_pk, fingerprint)
+                continue
+
+            logging.info("\nProcessing game %s", game_pk)
             game_data = processor.load_game_data(str(game_pk))
-            logging.info(f"Successfully loaded game data")
+            logging.info("Successfully loaded game data")
 
-            at_bat_summary = all_statcast_reduced[all_statcast_reduced["game_pk"] == row["game_pk"]]
-            # at_bat_summary = get_at_bat_summary_for_game(input_csv, str(game_pk))
+            event_counts = Counter()
+            decision_df = process_game(game_data, at_bat_summary, vectorized_corrections, registry, event_counts,
+                                       statcast_first)
+            event_stats.add_game(game_pk, event_counts)
+            postings.add_game(game_pk, decision_df)
 
-            # Convert player IDs to integers where needed
-            home_lineup = [int(player_id) if isinstance(player_id, str) else player_id
-                         for player_id in game_data.home_lineup]
-            away_lineup = [int(player_id) if isinstance(player_id, str) else player_id
-                         for player_id in game_data.away_lineup]
-            home_bullpen = [int(player_id) if isinstance(player_id, str) else player_id
-                          for player_id in game_data.home_bullpen]
-            away_bullpen = [int(player_id) if isinstance(player_id, str) else player_id
-                          for player_id in game_data.away_bullpen]
-
-            # Initialize GameState
-            game_state = GameState(
-                home_abbr=game_data.home_abbr,
-                away_abbr=game_data.away_abbr,
-                home_lineup=home_lineup,
-                away_lineup=away_lineup,
-                home_pitcher=home_bullpen[0] if home_bullpen else None,
-                home_sub_ins=home_bullpen,
-                away_pitcher=away_bullpen[0] if away_bullpen else None,
-                away_sub_ins=away_bullpen,
-            )
-
-            # Make sure the lineups are properly set
-            game_state.home_lineup = home_lineup
-            game_state.away_lineup = away_lineup
-
-            # Convert position maps to use integer keys
-            home_position_map = {int(k): v for k, v in game_data.home_position_map.items()}
-            away_position_map = {int(k): v for k, v in game_data.away_position_map.items()}
-
-            # Initialize positions
-            for team, lineup, position_map in [
-                ('home', home_lineup, home_position_map),
-                ('away', away_lineup, away_position_map)
-            ]:
-                logging.info(f"\nSetting up {team} team positions:")
-                for player_id in lineup:
-                    position = position_map.get(player_id)
-                    logging.info(f"  Player {player_id} position: {position}")
-                    field_position = next((fp for fp in FieldPosition if fp.value == position), None)
-                    if field_position:
-                        game_state.set_position_player(team, field_position, player_id)
-                        logging.info(f"    Set {player_id} to {field_position.name}")
-
-            # Convert player maps to use integer keys
-            home_player_map = {int(k) if isinstance(k, str) else k: v
-                             for k, v in game_data.home_player_map.items()}
-            away_player_map = {int(k) if isinstance(k, str) else k: v
-                             for k, v in game_data.away_player_map.items()}
-
-            # Print initial state for verification
-            print_initial_game_state(game_state, home_player_map, away_player_map)
-
-            output_filename = f'games/game_{game_pk}_decisions.csv'
-            # initialize_csv(output_filename)
-
-            # Combine player maps
-            player_map = {**home_player_map, **away_player_map}
-
-            # Define all required columns explicitly
-            columns = [
-                "Event_Type", "Is_Decision", "Inning", "Half", "At_Bat", "Score_Deficit", "Outs",
-                "Third_Base", "Second_Base", "First_Base", "Home_Pitcher", "Away_Pitcher"
-            ]
-
-            # Add columns for each lineup position for both Home and Away teams
-            for i in range(1, 10):  # Lineup positions 1 to 9
-                columns.append(f"Home_Lineup_{i}")
-                columns.append(f"Away_Lineup_{i}")
-
-            # Add columns for each field position in HomePositionPlayers and AwayPositionPlayers            
-            field_positions = [
-                "DH", "C", "1B", "2B", "3B", "SS", "LF", "CF", "RF"
-            ]
-
-            # Append field positions for both Home and Away position players
-            for pos in field_positions:
-                columns.append(f"Home_{pos}")
-                columns.append(f"Away_{pos}")
-
-            # Initialize the DataFrame with all specified columns
-            decision_df = pd.DataFrame(columns=columns)
-
-            for inning in game_data.game_summary:
-                inning_str = inning['inning']
-                half_str, inning_number_str = inning_str.split()
-                inning_number = int(inning_number_str[:-2])
-                half = Half.TOP if half_str == 'Top' else Half.BOTTOM
-
-                for event in inning['events']:
-                    process_event(decision_df, event, game_state, player_map,
-                                at_bat_summary, inning_number, half)
+            if verify_alignment:
+                disagreements = check_alignment(game_pk, decision_df, row)
+                if disagreements is not None:
+                    alignment_disagreements.append(disagreements)
 
             # now we have a list of the decisions filled out
-            decision_df.to_csv(output_filename, index=False)
+            writer.submit(game_pk, decision_df, on_written=partial(build_cache.record, game_pk, fingerprint))
             del decision_df
 
 
@@ -167,26 +156,292 @@ def create_dataset(num_games: int, input_csv: str, game_id: int = None, scraped_
             logging.info(error_message)
             error_log.append(error_message)
 
+    if pool:
+        for future in tqdm(as_completed(pending), total=len(pending)):
+            game_pk, fingerprint = pending[future]
+            try:
+                event_counts, disagreements, generic_counts, players, plays = future.result()
+            except Exception as e:
+                error_message = f"Error processing game {game_pk}: {str(e)}\n{traceback.format_exc()}"
+                logging.info(error_message)
+                error_log.append(error_message)
+                continue
+            build_cache.record(game_pk, fingerprint)
+            event_stats.add_game(game_pk, event_counts)
+            postings.set_game(game_pk, players)
+            add_plays(plays)
+            generic_event_counts.update(generic_counts)
+            if disagreements is not None:
+                alignment_disagreements.append(disagreements)
+        pool.shutdown()
+
+    writer.close()
+    for game_pk, error in writer.errors:
+        error_log.append(f"Error writing game {game_pk}: {error}")
+    build_cache.save()
+    event_stats.save()
+    postings.save()
+    if alignment_disagreements:
+        alignment_path = Path(error_log_path).with_name('alignment_disagreements.csv')
+        alignment_df = pd.concat(alignment_disagreements, ignore_index=True)
+        alignment_df.to_csv(alignment_path, index=False)
+        logging.info("%s pitcher and fielder disagreements with the urls CSV in %s games, written to %s",
+                     len(alignment_df), len(alignment_disagreements), alignment_path)
+    if skipped_games:
+        logging.info("Skipped %s games that were already up to date", skipped_games)
+
+    if generic_event_counts:
+        logging.info("Event types without a handler, handled generically by trying to update bases: %s",
+                     dict(generic_event_counts.most_common()))
+
+    # Keep any spellings we had to fuzzy match and any newly parsed plays for the next run
+    registry.save()
+    save_play_cache(scraped_data_dir)
+
     if error_log:
-        with open('game_processing_errors.log', 'w') as f:
+        with open(error_log_path, 'w') as f:
             for error in error_log:
                 f.write(f"{error}\n\n")
+
+
+def check_alignment(game_pk, decision_df, row):
+    """The game's disagreements with the timelines of its urls CSV row, None if there are none"""
+    disagreements = find_alignment_disagreements(decision_df, build_game_timelines(row))
+    if not len(disagreements):
+        return None
+    disagreements.insert(0, 'game_pk', game_pk)
+    return disagreements
+
+
+# What a create_dataset worker process loads once and reuses for every game it's handed
+_worker = {}
+
+
+def _init_worker(scraped_data_dir, input_csv, output_dir, output_format, options):
+    _worker['processor'] = GameProcessor(scraped_data_dir)
+    _worker['registry'] = PlayerRegistry.load_or_build(scraped_data_dir, [input_csv])
+    load_play_cache(scraped_data_dir)
+    # Games are written right away in the worker, the pool already overlaps writing one with replaying others
+    _worker['writer'] = OutputWriter(output_dir, output_format, background=False)
+    _worker['options'] = options
+    # The tracer is a module global, with spawn it's only configured if it's done here
+    if options.get('debug_game_pk'):
+        tracer.configure(debug_game_pk=options['debug_game_pk'])
+
+
+def _process_game_job(game_pk, row, at_bat_summary, game_data=None):
+    """Replay and write one game in a worker, returning what create_dataset keeps track of for it"""
+    options = _worker['options']
+    if game_data is None:
+        game_data = _worker['processor'].load_game_data(str(game_pk))
+    event_counts = Counter()
+    generic_event_counts.clear()
+    decision_df = process_game(game_data, at_bat_summary, options['vectorized_corrections'], _worker['registry'],
+                               event_counts, options['statcast_first'])
+    _worker['writer'].write(game_pk, decision_df)
+    disagreements = check_alignment(game_pk, decision_df, row) if options['verify_alignment'] else None
+    # Plays parsed for the first time go back with the game, only the parent process saves them
+    return event_counts, disagreements, Counter(generic_event_counts), game_postings(decision_df), take_new_plays()
+
+
+def resolve_event_types(names, event_index):
+    """
+    Turn a mix of event types and handler function names (e.g. 'handle_balk') into the event types they cover.
+    attempt_base_update covers every indexed type that has no handler of its own.
+    """
+    event_types = set()
+    for name in names:
+        handled_types = [event_type for event_type, handler in event_handlers.items()
+                         if handler.__name__ == name and event_type != 'AttemptBaseUpdate']
+        if name == attempt_base_update.__name__:
+            handled_types += [event_type for event_type in event_index.event_types() if event_type not in event_handlers]
+        if handled_types:
+            event_types.update(handled_types)
+        else:
+            event_types.add(name)
+    return event_types
+
+
+def reprocess_event_types(names, input_csv, index_csv=GAME_EVENTS_CSV, **kwargs):
+    """
+    Rebuild only the games that contain the given event types, or the types handled by the given handlers.
+    Meant for after changing a handler, the rest of the season is left as it is.
+    """
+    event_index = EventTypeIndex.load(index_csv)
+    event_types = resolve_event_types(names, event_index)
+    game_ids = event_index.games_with(event_types)
+    logging.info("Reprocessing %s games with event types %s", len(game_ids), sorted(event_types))
+    create_dataset(len(game_ids), input_csv, game_ids=game_ids, rebuild=True, **kwargs)
+    return game_ids
+
+
+def process_game(game_data, at_bat_summary, vectorized_corrections=False, registry=None, event_counts=None,
+                 statcast_first=False):
+    """
+    Replay every scraped event of a single game and return its decision points.
+    With vectorized_corrections the previous-at-bat base corrections are applied in one pass over the
+    finished game instead of at every at-bat boundary.
+    If an event_counts Counter is passed, the occurrences of every event type in the game are added to it.
+    With statcast_first the runners at every at-bat come from the Statcast at-bat skeleton and the descriptions
+    of events are only parsed when what they do can still show up in a decision point: substitutions and
+    anything that happens in the middle of an at-bat. The decision points are the same as with the full replay.
+    """
+    game_state, player_map = initial_game_state(
+        game_data.home_abbr, game_data.away_abbr, game_data.home_lineup, game_data.away_lineup,
+        game_data.home_bullpen, game_data.away_bullpen, game_data.home_position_map, game_data.away_position_map,
+        game_data.home_player_map, game_data.away_player_map, registry)
+
+    # Decision points are collected as tuples in DECISION_COLUMNS order and turned into a DataFrame once
+    decision_rows = []
+    at_bat_rows = {}
+
+    if tracer.enabled:
+        tracer.start_game(game_data.game_pk)
+
+    skeleton = AtBatSkeleton(at_bat_summary)
+
+    try:
+        # Every event with its type code and the inning it belongs to, in game order
+        game_events = []
+        for inning in game_data.game_summary:
+            inning_number, half = parse_inning_label(inning['inning'])
+            if event_counts is not None:
+                event_counts.update(event['type'] for event in inning['events'])
+
+            for event, event_code in zip(inning['events'], intern_event_types(inning['events'])):
+                game_events.append((event, event_code, inning_number, half))
+
+        if statcast_first:
+            skipped_handlers = plan_skipped_handlers(game_events, skeleton, game_state.at_bat)
+        else:
+            skipped_handlers = [False] * len(game_events)
+
+        for (event, event_code, inning_number, half), skip_handler in zip(game_events, skipped_handlers):
+            process_event(decision_rows, event, event_code, game_state, player_map, skeleton, inning_number, half,
+                          verify_bases=not vectorized_corrections, skip_handler=skip_handler,
+                          at_bat_rows=at_bat_rows)
+    except Exception as e:
+        if tracer.recording:
+            tracer.dump(f"{type(e).__name__}: {e}")
+            tracer.recording = False
+        raise
+
+    if tracer.recording:
+        tracer.end_game()
+
+    decision_df = build_decision_df(decision_rows)
+
+    if vectorized_corrections:
+        apply_base_corrections(decision_df, caught_stealing_events)
+
+    return decision_df
+
+
+def initial_game_state(home_abbr, away_abbr, home_lineup, away_lineup, home_bullpen, away_bullpen,
+                       home_position_map, away_position_map, home_player_map, away_player_map, registry=None):
+    """The game state before the first event, and the index of both teams' players to resolve names against"""
+    # Convert player IDs to integers where needed
+    home_lineup = [int(player_id) if isinstance(player_id, str) else player_id
+                 for player_id in home_lineup]
+    away_lineup = [int(player_id) if isinstance(player_id, str) else player_id
+                 for player_id in away_lineup]
+    home_bullpen = [int(player_id) if isinstance(player_id, str) else player_id
+                  for player_id in home_bullpen]
+    away_bullpen = [int(player_id) if isinstance(player_id, str) else player_id
+                  for player_id in away_bullpen]
+    for team, lineup in [('home', home_lineup), ('away', away_lineup)]:
+        if len(lineup) != 9:
+            raise ValueError(f"The scraped {team} lineup has {len(lineup)} players instead of 9, rescrape the game")
+
+    # Initialize GameState
+    game_state = GameState(
+        home_abbr=home_abbr,
+        away_abbr=away_abbr,
+        home_lineup=home_lineup,
+        away_lineup=away_lineup,
+        home_pitcher=home_bullpen[0] if home_bullpen else None,
+        home_sub_ins=home_bullpen,
+        away_pitcher=away_bullpen[0] if away_bullpen else None,
+        away_sub_ins=away_bullpen,
+    )
+
+    # Make sure the lineups are properly set
+    game_state.home_lineup = home_lineup
+    game_state.away_lineup = away_lineup
+
+    # Convert position maps to use integer keys
+    home_position_map = {int(k): v for k, v in home_position_map.items()}
+    away_position_map = {int(k): v for k, v in away_position_map.items()}
+
+    # Initialize positions
+    for team, lineup, position_map in [
+        ('home', home_lineup, home_position_map),
+        ('away', away_lineup, away_position_map)
+    ]:
+        logging.info("\nSetting up %s team positions:", team)
+        for player_id in lineup:
+            position = position_map.get(player_id)
+            logging.info("  Player %s position: %s", player_id, position)
+            field_position = next((fp for fp in FieldPosition if fp.value == position), None)
+            if field_position:
+                game_state.set_position_player(team, field_position, player_id)
+                logging.info("    Set %s to %s", player_id, field_position.name)
+
+    # Convert player maps to use integer keys
+    home_player_map = {int(k) if isinstance(k, str) else k: v
+                     for k, v in home_player_map.items()}
+    away_player_map = {int(k) if isinstance(k, str) else k: v
+                     for k, v in away_player_map.items()}
+
+    # Print initial state for verification
+    if logging.getLogger().isEnabledFor(logging.INFO):
+        print_initial_game_state(game_state, home_player_map, away_player_map)
+
+    # Combine player maps, indexed once so every name lookup during the game is cheap
+    player_map = PlayerIndex({**home_player_map, **away_player_map}, registry)
+
+    return game_state, player_map
+
+
+def parse_inning_label(label):
+    """'Top 1st' -> (1, Half.TOP)"""
+    half_str, inning_number_str = label.split()
+    return int(inning_number_str[:-2]), Half.TOP if half_str == 'Top' else Half.BOTTOM
+
+
+def build_decision_df(decision_rows):
+    """Turn the decision point tuples of a game into its DataFrame, with empty and unknown players left blank"""
+    import pandas as pd
+
+    values = np.empty((len(decision_rows), len(DECISION_COLUMNS)), dtype=object)
+    if decision_rows:
+        values[:] = decision_rows
+    players = values[:, PLAYER_COLUMNS_START:]
+    players[_blank_players(players)] = None
+    return pd.DataFrame(values, columns=DECISION_COLUMNS)
+
+
+def _blank_players(players):
+    # Position columns only ever held None for nobody, everything else wrote -1 and None as blanks
+    return (players == MISSING) | ((players == EMPTY) & ~IS_POSITION_COLUMN)
+
+
 def print_initial_game_state(game_state, home_player_map, away_player_map):
-    logging.info(f"\nInitial Game State:")
-    logging.info(f"Inning: {game_state.inning} {game_state.half.name}")
-    logging.info(f"Score: Away {game_state.score_away} - Home {game_state.score_home}")
-    logging.info(f"Outs: {game_state.outs}")
-    logging.info(f"Bases: {game_state.bases_occupied}")
-    logging.info(f"Away Lineup: {[away_player_map.get(player_id, 'Unknown') for player_id in game_state.away_lineup]}")
-    logging.info(f"Home Lineup: {[home_player_map.get(player_id, 'Unknown') for player_id in game_state.home_lineup]}")
-    logging.info(f"Away Pitcher: {away_player_map.get(game_state.away_pitcher, 'Unknown')}")
-    logging.info(f"Away Sub Ins: {game_state.away_sub_ins}")
-    logging.info(f"Home Pitcher: {home_player_map.get(game_state.home_pitcher, 'Unknown')}")
-    logging.info(f"Home Sub Ins: {game_state.home_sub_ins}")
-
-    logging.info(f"\nInitial Positions:")
+    logging.info("\nInitial Game State:")
+    logging.info("Inning: %s %s", game_state.inning, game_state.half.name)
+    logging.info("Score: Away %s - Home %s", game_state.score_away, game_state.score_home)
+    logging.info("Outs: %s", game_state.outs)
+    logging.info("Bases: %s", game_state.bases_occupied)
+    logging.info("Away Lineup: %s", [away_player_map.get(player_id, 'Unknown') for player_id in game_state.away_lineup])
+    logging.info("Home Lineup: %s", [home_player_map.get(player_id, 'Unknown') for player_id in game_state.home_lineup])
+    logging.info("Away Pitcher: %s", away_player_map.get(game_state.away_pitcher, 'Unknown'))
+    logging.info("Away Sub Ins: %s", game_state.away_sub_ins)
+    logging.info("Home Pitcher: %s", home_player_map.get(game_state.home_pitcher, 'Unknown'))
+    logging.info("Home Sub Ins: %s", game_state.home_sub_ins)
+
+    logging.info("\nInitial Positions:")
     for team in ['home', 'away']:
-        logging.info(f"{team.capitalize()} Team:")
+        logging.info("%s Team:", team.capitalize())
         for pos in FieldPosition:
             player_id = game_state.get_position_player(team, pos)
             if player_id is not None:
@@ -194,71 +449,47 @@ def print_initial_game_state(game_state, home_player_map, away_player_map):
                     player_id, 'Unknown')
             else:
                 player_name = 'None'
-            logging.info(f"  {pos.name}: {player_name}")
+            logging.info("  %s: %s", pos.name, player_name)
 
-    logging.info(f"\nInitial Mappings:")
-    logging.info(f"Home Team:")
+    logging.info("\nInitial Mappings:")
+    logging.info("Home Team:")
     for player_id, player_name in home_player_map.items():
-        logging.info(f"  {player_name}: {player_id}")
+        logging.info("  %s: %s", player_name, player_id)
 
-    logging.info(f"\nAway Team:")
+    logging.info("\nAway Team:")
     for player_id, player_name in away_player_map.items():
-        logging.info(f"  {player_name}: {player_id}")
-
-
-def log_game_state(game_state):
-    # Log the inning and half
-    inning_half = 'Top' if game_state.half == Half.TOP else 'Bottom'
-    logging.info("=== Game State ===")
-    logging.info(f"Inning: {inning_half} {game_state.inning}")
-
-    # Log the current outs
-    logging.info(f"Outs: {game_state.outs}")
-
-    # Log the current score
-    logging.info("Score:")
-    logging.info(f"  {game_state.home_abbr} (Home): {game_state.score_home}")
-    logging.info(f"  {game_state.away_abbr} (Away): {game_state.score_away}")
-
-    # Log bases occupied
-    base_names = {Base.FIRST: 'First Base', Base.SECOND: 'Second Base', Base.THIRD: 'Third Base'}
-    logging.info("Bases Occupied:")
-    for base in [Base.THIRD, Base.SECOND, Base.FIRST]:
-        player_id = game_state.bases_occupied.get(base, -1)
-        if player_id != -1:
-            logging.info(f"  {base_names[base]}: Player ID {player_id}")
-        else:
-            logging.info(f"  {base_names[base]}: Empty")
-
-    # Log the current at-bat number
-    logging.info(f"At-Bat Number: {game_state.at_bat}")
-
-    # Log the home and away pitchers
-    logging.info(f"Home Pitcher ID: {game_state.home_pitcher}")
-    logging.info(f"Away Pitcher ID: {game_state.away_pitcher}")
-
-    # # Optionally, log the home and away position players
-    # logging.info("Home Team Position Players:")
-    # for position, player_id in game_state.home_position_players.items():
-    #     logging.info(f"  {position.name}: Player ID {player_id}")
-    #
-    # logging.info("Away Team Position Players:")
-    # for position, player_id in game_state.away_position_players.items():
-    #     logging.info(f"  {position.name}: Player ID {player_id}")
-
-    # # Log the home and away lineups
-    # logging.info("Home Team Lineup:")
-    # for idx, player_id in enumerate(game_state.home_lineup, start=1):
-    #     logging.info(f"  Spot {idx}: Player ID {player_id}")
-    #
-    # logging.info("Away Team Lineup:")
-    # for idx, player_id in enumerate(game_state.away_lineup, start=1):
-    #     logging.info(f"  Spot {idx}: Player ID {player_id}")
+        logging.info("  %s: %s", player_name, player_id)
 
-    logging.info("=================\n")
 
-
-def process_event(decision_df, event, game_state, player_map, at_bat_summary, inning_number, half):
+def plan_skipped_handlers(game_events, skeleton, at_bat):
+    """
+    Which handlers the Statcast-first engine can skip: the ones that only move runners, for the last event of an
+    at-bat, when the next event starts an at-bat Statcast has. The runners are then overwritten from Statcast
+    before the next decision point is saved. A caught stealing is the exception since it checks the runners we had.
+    at_bat is the at-bat the game state starts on.
+    """
+    skipped = []
+    for index, (event, event_code, _, _) in enumerate(game_events):
+        # Same rule process_event uses to move on to a new at-bat
+        if event['type'] and event['atbat_index'] != at_bat:
+            at_bat = event['atbat_index']
+        skip = False
+        if event_dispatch[event_code].bases_only and index + 1 < len(game_events):
+            next_event, next_code, next_inning, next_half = game_events[index + 1]
+            skip = bool(next_event['type']) and next_event['atbat_index'] != at_bat \
+                and not event_dispatch[next_code].is_caught_stealing \
+                and skeleton.bases_at(next_inning, next_half.value, next_event['atbat_index']) is not None
+        skipped.append(skip)
+    return skipped
+
+
+def process_event(decision_rows, event, event_code, game_state, player_map, skeleton, inning_number, half,
+                  verify_bases=True, skip_handler=False, at_bat_rows=None):
+    """
+    Save the decision point before event and apply the event to game_state.
+    at_bat_rows maps each at-bat to the indices of its decision rows, when it's passed it is kept up to date and the
+    previous at-bat's rows are looked up in it instead of searched for.
+    """
     # if these two are different it's a new inning, and we need to reset outs
     if game_state.inning != inning_number or game_state.half != half:
         game_state.outs = 0
@@ -267,12 +498,12 @@ def process_event(decision_df, event, game_state, player_map, at_bat_summary, in
     game_state.half = half
 
 
-    logging.info(f"GAME STATE FOR EVENT: {event['type']}: {event['description']}")
-    logging.info(f"Outs update: {event['outs_update']}")
-    logging.info(f"Score update: {event['score_update']}")
-    log_game_state(game_state)
+    if tracer.recording:
+        tracer.record('event', event, game_state)
 
 
+    dispatch = event_dispatch[event_code]
+
     # Check if we can verify our bases before saving off the event
     event_at_bat = event['atbat_index']
     if game_state.at_bat != event_at_bat and event['type']:
@@ -286,39 +517,38 @@ def process_event(decision_df, event, game_state, player_map, at_bat_summary, in
         # because they have the same at bat number as the following event which is going to overwrite their base configuration
         # and make it so it looks like the runner was already caught out before the event occurs.
         # we must have a flag we pass in
-        is_caught_stealing = event['type'] in caught_stealing_events
+        is_caught_stealing = dispatch.is_caught_stealing
 
-        synchronize_bases(game_state, at_bat_summary, is_offensive_sub, is_caught_stealing, event, player_map)
+        synchronize_bases(game_state, skeleton, is_offensive_sub, is_caught_stealing, event, player_map)
 
         # Verify and correct previous at-bat's base configurations
-        if not is_caught_stealing:
-            verify_previous_at_bat_bases(decision_df, previous_at_bat, game_state)
+        if verify_bases and not is_caught_stealing:
+            verify_previous_at_bat_bases(decision_rows, previous_at_bat, game_state, at_bat_rows)
 
 
     # We label decision events from chance events
-    is_decision = event['type'] in decision_events
+    is_decision = dispatch.is_decision
 
     # But we need to handle the exceptions where it might have really been a bunt
     # Or check whether an injury resulted in a player leaving a game
-    if event['type'] in possible_decision_events:
+    if dispatch.needs_verification:
         is_decision = verify_decision(event, game_state)
 
 
     # Save off the pre-event game state
-    decision_point = game_state.create_decision_point(event, is_decision, player_map)
-    decision_df.loc[len(decision_df)] = decision_point
-
-    # Get the handler and modify the game_state
-    event_type = event['type']
-    handler = event_handlers.get(event_type)
-    if handler:
-        result = handler(event['description'], game_state, player_map)
+    decision_rows.append(game_state.create_decision_point(event, is_decision))
+    if at_bat_rows is not None:
+        at_bat_rows.setdefault(game_state.at_bat, []).append(len(decision_rows) - 1)
+
+    # Modify the game_state with the handler picked for this event type
+    if not skip_handler:
+        if dispatch.is_generic:
+            logging.info("Handling %s generically by trying to update bases. %s",
+                         event['type'], event['description'])
+            generic_event_counts[event['type']] += 1
+        result = dispatch.handler(event['description'], game_state, player_map)
         if result:
             logging.info(result)
-    else:
-        logging.info(f"Handling {event_type} generically by trying to update bases. {event['description']}")
-        handler = event_handlers.get('AttemptBaseUpdate')
-        handler(event['description'], game_state, player_map)
 
     # Update the scores if a score change was reported
     if event['score_update']:
@@ -333,30 +563,21 @@ def process_event(decision_df, event, game_state, player_map, at_bat_summary, in
     #     game_state.outs = 0
 
 
-def synchronize_bases(game_state, at_bat_summary, is_offensive_sub, is_caught_stealing, event, player_map):
-    logging.info("Synchronizing bases...")
-    log_game_state(game_state)
+def synchronize_bases(game_state, skeleton, is_offensive_sub, is_caught_stealing, event, player_map):
+    if tracer.recording:
+        tracer.record('synchronize', event, game_state)
 
 
     current_half = 'Top' if game_state.half == Half.TOP else 'Bot'
 
-    current_at_bat = at_bat_summary[
-        (at_bat_summary['inning'].astype(str) == str(game_state.inning)) &
-        (at_bat_summary['inning_topbot'].astype(str) == current_half) &
-        (at_bat_summary['at_bat_number'].astype(str) == str(game_state.at_bat))
-    ]
+    on_bases = skeleton.bases_at(game_state.inning, current_half, game_state.at_bat)
 
-    if current_at_bat.empty:
-        logging.warning(f"Warning: Statcast does not contain an at-bat for {game_state.at_bat}")
+    if on_bases is None:
+        logging.warning("Warning: Statcast does not contain an at-bat for %s", game_state.at_bat)
         return
 
-    current_at_bat_row = current_at_bat.iloc[0]
-    new_bases_occupied = {
-        Base.FIRST: int(current_at_bat_row['on_1b']) if pd.notna(current_at_bat_row['on_1b']) else -1,
-        Base.SECOND: int(current_at_bat_row['on_2b']) if pd.notna(current_at_bat_row['on_2b']) else -1,
-        Base.THIRD: int(current_at_bat_row['on_3b']) if pd.notna(current_at_bat_row['on_3b']) else -1
-    }
-    logging.info(f"New bases occupied from Statcast: {new_bases_occupied}")
+    new_bases_occupied = {Base.FIRST: on_bases[0], Base.SECOND: on_bases[1], Base.THIRD: on_bases[2]}
+    logging.info("New bases occupied from Statcast: %s", new_bases_occupied)
 
     # Special handling for caught stealing and pickoff caught stealing events
     if is_caught_stealing:
@@ -366,48 +587,56 @@ def synchronize_bases(game_state, at_bat_summary, is_offensive_sub, is_caught_st
         player_id = get_closest_player_id(player_name, player_map)
         base_to_check, target_base = determine_base_from_description(event['description'])
 
-        logging.info(f"Extracted player name: {player_name}, player ID: {player_id}")
-        logging.info(f"Base to check: {base_to_check}, target base: {target_base}")
+        logging.info("Extracted player name: %s, player ID: %s", player_name, player_id)
+        logging.info("Base to check: %s, target base: %s", base_to_check, target_base)
 
         if player_id:
             # Check if the player is already on the expected base
             runner_on_base = game_state.bases_occupied.get(base_to_check, -1)
-            logging.info(f"Runner on {base_to_check.name}: {runner_on_base}")
+            logging.info("Runner on %s: %s", base_to_check.name, runner_on_base)
 
             if runner_on_base != player_id:
                 # Player was not found on the expected base; trust the event description
-                logging.info(f"Adjusting bases: Placing player '{player_name}' (ID: {player_id}) on {base_to_check.name}")
+                logging.info("Adjusting bases: Placing player '%s' (ID: %s) on %s",
+                             player_name, player_id, base_to_check.name)
                 new_bases_occupied[base_to_check] = player_id
 
     if is_offensive_sub and "runner" in event['description']:
         logging.info("Handling offensive substitution for a runner...")
         # Reverse the base update for pinch-runners
         old_player_name = event['description'].split("replaces")[1].strip().rstrip('.').lower()
-        new_player_name = re.search(r'runner\s+(.+?)\s+replaces', event['description'], re.IGNORECASE).group(1).lower()
+        new_player_name = PINCH_RUNNER_REGEX.search(event['description']).group(1).lower()
 
-        logging.info(f"Old player name: {old_player_name}, new player name: {new_player_name}")
+        logging.info("Old player name: %s, new player name: %s", old_player_name, new_player_name)
 
         reversed_player_map = {name.lower(): player_id for player_id, name in player_map.items()}
         old_player_id = reversed_player_map.get(old_player_name)
         new_player_id = reversed_player_map.get(new_player_name)
 
-        logging.info(f"Old player ID: {old_player_id}, new player ID: {new_player_id}")
+        logging.info("Old player ID: %s, new player ID: %s", old_player_id, new_player_id)
 
         if old_player_id and new_player_id:
             for base, player_id in new_bases_occupied.items():
                 if player_id == new_player_id:
                     new_bases_occupied[base] = old_player_id
-                    logging.info(f"Reversed pinch-runner substitution: {old_player_name} (ID: {old_player_id}) back on {base.name}")
+                    logging.info("Reversed pinch-runner substitution: %s (ID: %s) back on %s",
+                                 old_player_name, old_player_id, base.name)
 
-    logging.info(f"Updating game state bases to: {new_bases_occupied}")
+    logging.info("Updating game state bases to: %s", new_bases_occupied)
     game_state.bases_occupied = new_bases_occupied
 
-def verify_previous_at_bat_bases(df, previous_at_bat, current_game_state):
-    # Filter rows for the previous at-bat
-    previous_at_bat_rows = df[df['At_Bat'] == previous_at_bat]
-    if previous_at_bat_rows.empty:
+def verify_previous_at_bat_bases(decision_rows, previous_at_bat, current_game_state, at_bat_rows=None):
+    # Find the rows of the previous at-bat
+    if at_bat_rows is not None:
+        previous_at_bat_rows = at_bat_rows.get(previous_at_bat, [])
+    else:
+        previous_at_bat_rows = [index for index, row in enumerate(decision_rows)
+                                if row[AT_BAT_INDEX] == previous_at_bat]
+    if not previous_at_bat_rows:
         logging.info("No previous at-bat rows found.")
         return
+    # Part 2 looks at the substitution rows as they were before any corrections
+    original_rows = {index: decision_rows[index] for index in previous_at_bat_rows}
 
     corrections_needed = False
     current_bases = {
@@ -415,27 +644,31 @@ def verify_previous_at_bat_bases(df, previous_at_bat, current_game_state):
         'Second_Base': current_game_state.bases_occupied[Base.SECOND],
         'Third_Base': current_game_state.bases_occupied[Base.THIRD]
     }
-    logging.info(f"Current bases occupied: {current_bases}")
+    logging.info("Current bases occupied: %s", current_bases)
 
     # Check each row in the previous at-bat for impossible base configurations
-    for index, row in previous_at_bat_rows.iterrows():
-        logging.info(f"Checking row {index}")
+    for index in previous_at_bat_rows:
+        logging.info("Checking row %s", index)
+        row = original_rows[index]
         for base, current_runner in current_bases.items():
-            if current_runner != -1:
+            if current_runner is not None and current_runner != EMPTY:
                 # Check if this runner was on a more advanced base in the previous at-bat
                 if base == 'First_Base':
-                    if row['Second_Base'] == current_runner or row['Third_Base'] == current_runner:
+                    if row[SECOND_BASE_INDEX] == current_runner or row[THIRD_BASE_INDEX] == current_runner:
                         corrections_needed = True
-                        logging.info(f"Correcting runner {current_runner} on {base}")
-                        df.at[index, 'Second_Base'] = -1 if row['Second_Base'] == current_runner else df.at[index, 'Second_Base']
-                        df.at[index, 'Third_Base'] = -1 if row['Third_Base'] == current_runner else df.at[index, 'Third_Base']
-                        df.at[index, 'First_Base'] = current_runner
+                        logging.info("Correcting runner %s on %s", current_runner, base)
+                        corrected = {FIRST_BASE_INDEX: current_runner}
+                        if row[SECOND_BASE_INDEX] == current_runner:
+                            corrected[SECOND_BASE_INDEX] = EMPTY
+                        if row[THIRD_BASE_INDEX] == current_runner:
+                            corrected[THIRD_BASE_INDEX] = EMPTY
+                        _replace_row_values(decision_rows, index, corrected)
                 elif base == 'Second_Base':
-                    if row['Third_Base'] == current_runner:
+                    if row[THIRD_BASE_INDEX] == current_runner:
                         corrections_needed = True
-                        logging.info(f"Correcting runner {current_runner} on {base}")
-                        df.at[index, 'Third_Base'] = -1
-                        df.at[index, 'Second_Base'] = current_runner
+                        logging.info("Correcting runner %s on %s", current_runner, base)
+                        _replace_row_values(decision_rows, index, {THIRD_BASE_INDEX: EMPTY,
+                                                                   SECOND_BASE_INDEX: current_runner})
 
     if corrections_needed:
         logging.info("Corrections were made to the previous at-bat base configurations.")
@@ -444,44 +677,68 @@ def verify_previous_at_bat_bases(df, previous_at_bat, current_game_state):
 
     # Part 2: Handle offensive substitutions
     logging.info("Handling offensive substitutions if any...")
-    offensive_sub_rows = previous_at_bat_rows[previous_at_bat_rows['Event_Type'] == 'Offensive Substitution']
+    offensive_sub_rows = [index for index in previous_at_bat_rows
+                          if original_rows[index][EVENT_TYPE_INDEX] == 'Offensive Substitution']
 
-    for index, sub_row in offensive_sub_rows.iterrows():
-        logging.info(f"Processing offensive substitution at index {index}: {sub_row}")
+    for index in offensive_sub_rows:
+        sub_row = _row_cells(original_rows[index])
+        logging.info("Processing offensive substitution at index %s: %s", index, sub_row)
 
-        if index + 1 < len(df):
-            next_row = df.iloc[index + 1]
+        if index + 1 < len(decision_rows):
+            next_row = _row_cells(decision_rows[index + 1])
 
             # Find the columns that changed (excluding 'Event_Type')
-            changed_columns = [col for col in df.columns if col != 'Event_Type' and sub_row[col] != next_row[col]]
-            logging.info(f"Changed columns: {changed_columns}")
+            changed_columns = [col for col in range(1, len(DECISION_COLUMNS)) if sub_row[col] != next_row[col]]
+            if logging.getLogger().isEnabledFor(logging.INFO):
+                logging.info("Changed columns: %s", [DECISION_COLUMNS[col] for col in changed_columns])
 
             if len(changed_columns) == 2:
                 old_player_id = sub_row[changed_columns[0]]
                 new_player_id = next_row[changed_columns[0]]
                 changed_column = changed_columns[0]
-                logging.info(f"Old player ID: {old_player_id}, new player ID: {new_player_id}, changed column: {changed_column}")
+                logging.info("Old player ID: %s, new player ID: %s, changed column: %s",
+                             old_player_id, new_player_id, DECISION_COLUMNS[changed_column])
 
                 # Check if the new player is already on base in the substitution row
-                bases = ['First_Base', 'Second_Base', 'Third_Base']
+                bases = [FIRST_BASE_INDEX, SECOND_BASE_INDEX, THIRD_BASE_INDEX]
                 if any(sub_row[base] == new_player_id for base in bases):
-                    logging.info(f"New player {new_player_id} found on base in substitution row.")
+                    logging.info("New player %s found on base in substitution row.", new_player_id)
                     # Correct the rows before this substitution
                     for prev_index in range(index, -1, -1):
-                        prev_row = df.iloc[prev_index]
-                        logging.info(f"Checking previous row {prev_index} for corrections.")
+                        prev_row = _row_cells(decision_rows[prev_index])
+                        logging.info("Checking previous row %s for corrections.", prev_index)
 
-                        if prev_row['At_Bat'] != previous_at_bat:
+                        if prev_row[AT_BAT_INDEX] != previous_at_bat:
                             break
 
                         # Use the lineup column that contained the old player before the sub as the source of truth
                         if prev_row[changed_column] == old_player_id:
+                            corrected = {}
                             for base in bases:
                                 if prev_row[base] == new_player_id:
-                                    logging.info(f"Correcting base {base} at index {prev_index} from {new_player_id} to {old_player_id}")
-                                    df.at[prev_index, base] = old_player_id
+                                    logging.info("Correcting base %s at index %s from %s to %s",
+                                                 DECISION_COLUMNS[base], prev_index, new_player_id, old_player_id)
+                                    corrected[base] = EMPTY if old_player_id is None else old_player_id
+                            if corrected:
+                                _replace_row_values(decision_rows, prev_index, corrected)
+
+    logging.info("Completed verification of previous at-bat bases for at-bat %s.", previous_at_bat)
+
+
+def _row_cells(row):
+    """A decision point tuple the way it ends up in the DataFrame, None for every blank player"""
+    cells = list(row)
+    for offset, blank in enumerate(_blank_players(np.array(row[PLAYER_COLUMNS_START:], dtype=object))):
+        if blank:
+            cells[PLAYER_COLUMNS_START + offset] = None
+    return cells
 
-    logging.info(f"Completed verification of previous at-bat bases for at-bat {previous_at_bat}.")
+
+def _replace_row_values(decision_rows, index, values):
+    row = list(decision_rows[index])
+    for column, value in values.items():
+        row[column] = value
+    decision_rows[index] = tuple(row)
 
 
 
@@ -490,7 +747,7 @@ def verify_decision(event, game_state):
 
     # Check if the event is an injury and the player left the game
     if event['type'] == 'Injury' and 'left the game' in description:
-        logging.info(f"Found an injury where someone left the game")
+        logging.info("Found an injury where someone left the game")
         return True
 
     # Check if the description contains the word 'bunt', bases are not empty, and there are less than two outs
@@ -499,7 +756,7 @@ def verify_decision(event, game_state):
             any(player_id != -1 for player_id in game_state.bases_occupied.values()) and
             game_state.outs < 2
     ):
-        logging.info(f"Found a bunt with runners on base and less than two outs")
+        logging.info("Found a bunt with runners on base and less than two outs")
         return True
 
     return False
@@ -516,7 +773,7 @@ def extract_player_name(description):
             # Extract the name before "picked off"
             player_name_part = description.split("picked off")[0].strip().split(",")[-1].strip()
         except IndexError:
-            logging.info(f"Warning: Could not extract the player's name for pickoff caught stealing.")
+            logging.info("Warning: Could not extract the player's name for pickoff caught stealing.")
             return None
     elif "caught stealing" in description.lower():
         # Handle the caught stealing format
@@ -528,10 +785,10 @@ def extract_player_name(description):
                 # Format: "Player caught stealing ..."
                 player_name_part = description.split("caught stealing")[0].strip()
         except IndexError:
-            logging.info(f"Warning: Could not extract the player's name for caught stealing.")
+            logging.info("Warning: Could not extract the player's name for caught stealing.")
             return None
     else:
-        logging.info(f"Warning: Description does not match expected formats for caught stealing or pickoff caught stealing.")
+        logging.info("Warning: Description does not match expected formats for caught stealing or pickoff caught stealing.")
         return None
 
     # Process and clean the extracted name
@@ -546,10 +803,18 @@ def determine_base_from_description(description):
     elif "home" in description.lower():
         return Base.THIRD, "Home"
     else:
-        logging.info(f"Error: Could not determine which base the player was attempting to steal.")
+        logging.info("Error: Could not determine which base the player was attempting to steal.")
         return None, None
 
 
+EVENT_TYPE_INDEX = COLUMN_INDEX['Event_Type']
+AT_BAT_INDEX = COLUMN_INDEX['At_Bat']
+FIRST_BASE_INDEX = COLUMN_INDEX['First_Base']
+SECOND_BASE_INDEX = COLUMN_INDEX['Second_Base']
+THIRD_BASE_INDEX = COLUMN_INDEX['Third_Base']
+IS_POSITION_COLUMN = np.array([column in {f"{team}_{pos.value}" for team in ['Home', 'Away'] for pos in FieldPosition}
+                               for column in DECISION_COLUMNS[PLAYER_COLUMNS_START:]])
+
 decision_events = [
     'Pitching Substitution',
     'Offensive Substitution',
@@ -579,6 +844,14 @@ possible_decision_events = [
     'Injury'
 ]
 
+# Events whose handlers change the lineups, positions or pitchers
+substitution_events = [
+    'Pitching Substitution',
+    'Offensive Substitution',
+    'Defensive Switch',
+    'Defensive Sub',
+]
+
 caught_stealing_events = [
     "Pickoff Caught Stealing 2B",
     "Pickoff Caught Stealing 3B",
@@ -589,21 +862,62 @@ caught_stealing_events = [
 ]
 
 
+
+@dataclass(frozen=True)
+class EventDispatch:
+    """Everything process_event needs to know about an event type, worked out once per type"""
+    handler: object
+    is_decision: bool
+    needs_verification: bool
+    is_caught_stealing: bool
+    # No handler of its own, attempt_base_update reads what it can from the description
+    is_generic: bool
+    # The handler only moves runners, it doesn't touch the lineups, positions or pitchers
+    bases_only: bool
+
+
+# Event types are interned to small codes as games are loaded, event_dispatch is indexed by code
+event_type_codes = {}
+event_dispatch = []
+
+# How often each event type without a handler came up during a create_dataset run
+generic_event_counts = Counter()
+
+
+def intern_event_types(events):
+    """Return the code of every event's type, adding a dispatch entry the first time a type shows up"""
+    codes = []
+    for event in events:
+        event_type = event['type']
+        code = event_type_codes.get(event_type)
+        if code is None:
+            code = len(event_dispatch)
+            event_type_codes[event_type] = code
+            event_dispatch.append(_build_event_dispatch(event_type))
+        codes.append(code)
+    return codes
+
+
+def _build_event_dispatch(event_type):
+    handler = event_handlers.get(event_type)
+    return EventDispatch(
+        handler=handler or event_handlers['AttemptBaseUpdate'],
+        is_decision=event_type in decision_events,
+        needs_verification=event_type in possible_decision_events,
+        is_caught_stealing=event_type in caught_stealing_events,
+        is_generic=handler is None,
+        bases_only=event_type not in substitution_events,
+    )
+
 # Now that we have the entire 2023 season scraped, the url you input here only determines which game ids we process
 
 
 if __name__ == "__main__":
-    user_input = input("logging?").strip().lower()
-    if user_input == 'y' or user_input == 'yes':
-        logging.basicConfig(level=logging.INFO)
-    else:
-        logging.disable(logging.CRITICAL)    
-    
-    num_games = 10000
-    game_id = None
-    url_file_name = "urls/gameday_urls2023.csv"
+    # Same as `python cli.py process ...`
+    import sys
+    import cli
 
-    create_dataset(num_games, url_file_name, game_id)
+    sys.exit(cli.main(['process'] + sys.argv[1:]))
 
 
 # TODO: Occasionally in mid at bat events like caught stolen base, that event will report the outs of the next event before those outs
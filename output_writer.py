@@ -0,0 +1,82 @@
+import importlib.util
+import logging
+import os
+import queue
+import threading
+from pathlib import Path
+
+# The format is also the file extension
+OUTPUT_FORMATS = ['csv', 'parquet']
+
+
+class OutputWriter:
+    """
+    Writes finished games on a background thread so the next game can be replayed while the last one is written.
+    The queue is bounded, when the disk falls behind submit blocks until there is room again.
+    Each file is written to a temp file next to it and renamed into place, so a game file is never half written.
+    Without background, submit writes on the calling thread and no writer thread is started.
+    """
+
+    def __init__(self, output_dir='games', output_format='csv', max_pending=8, background=True):
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format '{output_format}', expected one of {OUTPUT_FORMATS}")
+        if output_format == 'parquet' and not (importlib.util.find_spec('pyarrow')
+                                               or importlib.util.find_spec('fastparquet')):
+            raise ImportError("Writing parquet needs pyarrow or fastparquet installed")
+
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.output_format = output_format
+        self.queue = queue.Queue(maxsize=max_pending)
+        # (game_pk, error message) for every game that couldn't be written
+        self.errors = []
+        self.thread = None
+        if background:
+            self.thread = threading.Thread(target=self._run, name="output-writer", daemon=True)
+            self.thread.start()
+
+    def output_path(self, game_pk):
+        return self.output_dir / f"game_{game_pk}_decisions.{self.output_format}"
+
+    def submit(self, game_pk, decision_df, on_written=None):
+        """Queue a game for writing, on_written is called from the writer thread once its file is in place"""
+        if self.thread is None:
+            self._write_submitted(game_pk, decision_df, on_written)
+        else:
+            self.queue.put((game_pk, decision_df, on_written))
+
+    def close(self):
+        """Wait for every submitted game to be written"""
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join()
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            self._write_submitted(*item)
+
+    def _write_submitted(self, game_pk, decision_df, on_written):
+        try:
+            self.write(game_pk, decision_df)
+            if on_written:
+                on_written()
+        except Exception as e:
+            logging.info(f"Error writing game {game_pk}: {e}")
+            self.errors.append((game_pk, str(e)))
+
+    def write(self, game_pk, decision_df):
+        """Write a game right away on the calling thread"""
+        output_path = self.output_path(game_pk)
+        temp_path = output_path.with_name(output_path.name + ".tmp")
+        try:
+            if self.output_format == 'parquet':
+                decision_df.to_parquet(temp_path, index=False)
+            else:
+                decision_df.to_csv(temp_path, index=False)
+            os.replace(temp_path, output_path)
+        finally:
+            if temp_path.exists():
+                temp_path.unlink()
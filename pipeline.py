@@ -0,0 +1,201 @@
+"""
+Scrape and process in one run: every game the scraper finishes is saved as usual and also handed to processing
+through a bounded in-memory queue, so games are replayed while the next ones are still being scraped instead of
+after the whole scrape, and never read back from scraped_games/.
+
+    python cli.py pipeline --start-date 2023-04-01 --end-date 2023-04-30 --workers 4
+
+When processing falls behind, the queue fills up and the scraper waits for room, so memory stays bounded.
+Games that were already scraped go through the queue too and are loaded from disk, the build manifest skips the
+ones whose outputs are up to date.
+"""
+import json
+import logging
+import queue
+import threading
+import traceback
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+
+
+class ProcessingPipeline:
+    """
+    The consumer end of a pipelined run. submit() is called from the scrape loop, consumer threads take the games
+    off the queue and replay them, in this process with one worker or in a process pool with more.
+    """
+
+    def __init__(self, input_csv, scraped_data_dir="scraped_games", registry=None,
+                 vectorized_corrections=False, output_format='csv', rebuild=False, verify_alignment=False,
+                 statcast_first=False, workers=1, output_dir='games', stats_dir='events_data',
+                 error_log_path='game_processing_errors.log', queue_size=16, game_pks=None):
+        import main
+        from build_cache import BuildCache
+        from description_parser import load_play_cache
+        from event_stats import EventStats
+        from output_writer import OutputWriter
+        from player_postings import PlayerPostings
+        from player_registry import PlayerRegistry
+        from statcast_at_bats import StatcastAtBats
+
+        self.scraped_data_dir = scraped_data_dir
+        self.vectorized_corrections = vectorized_corrections
+        self.rebuild = rebuild
+        self.verify_alignment = verify_alignment
+        self.statcast_first = statcast_first
+        self.error_log_path = error_log_path
+
+        self.processor = main.GameProcessor(scraped_data_dir)
+        # Share the scraper's registry so player map names it adds are there for the games it hands over
+        self.registry = registry or PlayerRegistry.load_or_build(scraped_data_dir, [input_csv])
+        load_play_cache(scraped_data_dir)
+        self.statcast_at_bats = StatcastAtBats(game_pks=game_pks)
+        self.event_stats = EventStats.load_dir(stats_dir)
+        self.writer = OutputWriter(output_dir, output_format)
+        self.build_cache = BuildCache(output_dir)
+        self.postings = PlayerPostings.load_dir(output_dir)
+        main.generic_event_counts.clear()
+
+        self.error_log = []
+        self.alignment_disagreements = []
+        self.processed_games = 0
+        self.skipped_games = 0
+        # Guards everything above that the consumer threads and the writer thread update
+        self.lock = threading.Lock()
+
+        self.pool = None
+        if workers > 1:
+            options = dict(vectorized_corrections=vectorized_corrections, statcast_first=statcast_first,
+                           verify_alignment=verify_alignment)
+            self.pool = ProcessPoolExecutor(workers, initializer=main._init_worker,
+                                            initargs=(scraped_data_dir, input_csv, output_dir, output_format,
+                                                      options))
+        self.queue = queue.Queue(maxsize=queue_size)
+        # Each pool worker gets a thread feeding it, in this process the replay's module globals allow only one
+        self.consumers = [threading.Thread(target=self._consume, name=f"pipeline-consumer-{i}", daemon=True)
+                          for i in range(workers)]
+        for consumer in self.consumers:
+            consumer.start()
+
+    def submit(self, row, game_json=None):
+        """
+        Queue a game, blocking while the queue is full. game_json is the game's JSON as the scraper saved it,
+        without it the game is read from its scraped JSON.
+        """
+        self.queue.put((row, game_json))
+
+    def close(self):
+        """Wait for every queued game to be processed and written, then save what the run built up"""
+        from description_parser import save_play_cache
+        import main
+        import pandas as pd
+
+        for _ in self.consumers:
+            self.queue.put(None)
+        for consumer in self.consumers:
+            consumer.join()
+        if self.pool:
+            self.pool.shutdown()
+        self.writer.close()
+        for game_pk, error in self.writer.errors:
+            self.error_log.append(f"Error writing game {game_pk}: {error}")
+
+        self.build_cache.save()
+        self.event_stats.save()
+        self.postings.save()
+        self.registry.save()
+        save_play_cache(self.scraped_data_dir)
+        if self.alignment_disagreements:
+            alignment_path = Path(self.error_log_path).with_name('alignment_disagreements.csv')
+            pd.concat(self.alignment_disagreements, ignore_index=True).to_csv(alignment_path, index=False)
+            logging.info(f"Pitcher and fielder disagreements in {len(self.alignment_disagreements)} games "
+                         f"written to {alignment_path}")
+        if main.generic_event_counts:
+            logging.info(f"Event types without a handler, handled generically by trying to update bases: "
+                         f"{dict(main.generic_event_counts.most_common())}")
+        if self.error_log:
+            with open(self.error_log_path, 'w') as f:
+                for error in self.error_log:
+                    f.write(f"{error}\n\n")
+        logging.info(f"Pipeline processed {self.processed_games} games, skipped {self.skipped_games} up to date "
+                     f"and failed on {len(self.error_log)}")
+
+    def _consume(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            row, game_json = item
+            game_pk = int(row['game_pk'])
+            try:
+                self._process(game_pk, row, game_json)
+            except Exception as e:
+                error_message = f"Error processing game {game_pk}: {str(e)}\n{traceback.format_exc()}"
+                logging.info(error_message)
+                with self.lock:
+                    self.error_log.append(error_message)
+
+    def _process(self, game_pk, row, game_json):
+        import main
+        from build_cache import game_fingerprint
+        from description_parser import add_plays
+        from game_data import GameData
+
+        if game_json is None:
+            game_json = self.processor.game_path(str(game_pk)).read_bytes()
+        # Parsed as it would be read back, JSON turns the player map keys into strings
+        game_data = GameData(**json.loads(game_json))
+        at_bat_summary = self.statcast_at_bats.for_game(game_pk)
+        fingerprint = game_fingerprint(game_json, at_bat_summary, self.registry, game_data)
+        with self.lock:
+            if not self.rebuild and self.build_cache.is_fresh(game_pk, fingerprint,
+                                                              self.writer.output_path(game_pk)):
+                self.skipped_games += 1
+                return
+            self.build_cache.forget(game_pk)
+
+        if self.pool:
+            # The worker writes the game itself, the scraped data travels with the job
+            event_counts, disagreements, generic_counts, players, plays = self.pool.submit(
+                main._process_game_job, game_pk, row, at_bat_summary, game_data).result()
+            with self.lock:
+                self.build_cache.record(game_pk, fingerprint)
+                main.generic_event_counts.update(generic_counts)
+                self.postings.set_game(game_pk, players)
+                add_plays(plays)
+        else:
+            event_counts = Counter()
+            decision_df = main.process_game(game_data, at_bat_summary, self.vectorized_corrections, self.registry,
+                                            event_counts, self.statcast_first)
+            disagreements = main.check_alignment(game_pk, decision_df, row) if self.verify_alignment else None
+            with self.lock:
+                self.postings.add_game(game_pk, decision_df)
+            self.writer.submit(game_pk, decision_df, on_written=partial(self._record, game_pk, fingerprint))
+
+        with self.lock:
+            self.event_stats.add_game(game_pk, event_counts)
+            if disagreements is not None:
+                self.alignment_disagreements.append(disagreements)
+            self.processed_games += 1
+
+    def _record(self, game_pk, fingerprint):
+        with self.lock:
+            self.build_cache.record(game_pk, fingerprint)
+
+
+def run_pipeline(games_csv, scraped_data_dir="scraped_games", games_df=None, start_index=0, end_index=None,
+                 trust_seeded_rosters=False, **options):
+    """Scrape the games of games_csv (or of games_df, a selection of its rows) and process them as they arrive"""
+    from scraper import GameScraper
+
+    scraper = GameScraper(games_csv, scraped_data_dir, trust_seeded_rosters=trust_seeded_rosters)
+    if games_df is not None:
+        scraper.games_df = games_df
+    selected = scraper.games_df.iloc[start_index:end_index] if end_index else scraper.games_df.iloc[start_index:]
+    pipeline = ProcessingPipeline(games_csv, scraped_data_dir, registry=scraper.registry,
+                                  game_pks=selected['game_pk'], **options)
+    try:
+        scraper.scrape_games(start_index, end_index, on_game=pipeline.submit)
+    finally:
+        pipeline.close()
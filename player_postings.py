@@ -0,0 +1,160 @@
+"""
+Inverted index from player ID to every decision point the player appears in, with the column they appear in as
+their role: on a base, pitching, in a lineup slot or at a fielding position. create_dataset keeps it up to date in
+player_postings.npz next to the game files, so finding a player's decision points doesn't mean reading every CSV.
+
+    postings = PlayerPostings.load('games/player_postings.npz')
+    postings.find(543037, roles=PITCHER_ROLES)
+    postings.find_together(543037, 660271, PITCHER_ROLES, ['First_Base'])   # pitching with him on first
+
+Several seasons are queried together by loading all of their files, PlayerPostings.load('2022/...', '2023/...').
+The postings are stored sorted by player, then game and row, so a player's postings are one slice.
+"""
+import logging
+import os
+from pathlib import Path
+
+import numpy as np
+
+from game_state import PLAYER_COLUMNS
+
+POSTINGS_FILENAME = "player_postings.npz"
+# A posting's role is the index of its column in PLAYER_COLUMNS
+ROLES = PLAYER_COLUMNS
+ROLE_CODES = {role: code for code, role in enumerate(ROLES)}
+BASE_ROLES = ['First_Base', 'Second_Base', 'Third_Base']
+PITCHER_ROLES = ['Home_Pitcher', 'Away_Pitcher']
+
+
+def game_postings(decision_df):
+    """(player IDs, rows, roles) of everyone in a game's decision points"""
+    players = decision_df[PLAYER_COLUMNS].to_numpy(dtype=np.float64, na_value=np.nan)
+    # Blanks are NaN, the -1 a position column can hold is nobody too
+    rows, roles = np.nonzero(players > 0)
+    return players[rows, roles].astype(np.int32), rows.astype(np.int32), roles.astype(np.int8)
+
+
+def _role_codes(roles):
+    return None if roles is None else np.array([ROLE_CODES[role] for role in roles], dtype=np.int8)
+
+
+class PlayerPostings:
+    def __init__(self, path=None):
+        self.path = Path(path) if path else None
+        # game_pk -> (player IDs, rows, roles), the form games are added and replaced in
+        self.games = {}
+        self.dirty = False
+        self._index = None
+
+    @classmethod
+    def load(cls, *paths):
+        """Load one postings file, or several (e.g. one per season) to query them as one"""
+        postings = cls(paths[0] if len(paths) == 1 else None)
+        for path in paths:
+            with np.load(path) as data:
+                game_pks, offsets = data['game_pks'], data['offsets']
+                player_ids = np.repeat(data['player_ids'], np.diff(offsets))
+                games, rows, roles = data['games'], data['rows'], data['roles']
+            order = np.argsort(games, kind='stable')
+            bounds = np.searchsorted(games[order], np.arange(len(game_pks) + 1))
+            for index, game_pk in enumerate(game_pks):
+                game = order[bounds[index]:bounds[index + 1]]
+                postings.games[int(game_pk)] = (player_ids[game], rows[game], roles[game])
+        return postings
+
+    @classmethod
+    def load_dir(cls, games_dir='games'):
+        """The postings kept in a games directory, empty if there are none yet"""
+        path = Path(games_dir) / POSTINGS_FILENAME
+        return cls.load(path) if path.exists() else cls(path)
+
+    @classmethod
+    def build(cls, games_dir='games'):
+        """Index every decision file already written to games_dir"""
+        from feature_export import decision_files, _read_decisions
+
+        postings = cls(Path(games_dir) / POSTINGS_FILENAME)
+        for game_pk, path in decision_files(games_dir).items():
+            postings.add_game(game_pk, _read_decisions(path))
+        return postings
+
+    def add_game(self, game_pk, decision_df):
+        """Index a game's decision points, replacing what was there for it"""
+        self.set_game(game_pk, game_postings(decision_df))
+
+    def set_game(self, game_pk, postings):
+        self.games[int(game_pk)] = postings
+        self.dirty = True
+        self._index = None
+
+    def merge(self, other):
+        """Take over the games of another index, e.g. a shard's whose outputs are moved in here"""
+        for game_pk, postings in other.games.items():
+            self.set_game(game_pk, postings)
+
+    def _sorted(self):
+        """The postings of every game, sorted by player, game, row and role"""
+        if self._index is None:
+            game_pks = np.array(sorted(self.games), dtype=np.int64)
+            parts = [self.games[game_pk] for game_pk in game_pks.tolist()]
+            player_ids = np.concatenate([part[0] for part in parts] or [np.empty(0, np.int32)])
+            games = np.repeat(np.arange(len(parts), dtype=np.int32), [len(part[0]) for part in parts])
+            rows = np.concatenate([part[1] for part in parts] or [np.empty(0, np.int32)])
+            roles = np.concatenate([part[2] for part in parts] or [np.empty(0, np.int8)])
+            order = np.lexsort((roles, rows, games, player_ids))
+            player_ids, games, rows, roles = player_ids[order], games[order], rows[order], roles[order]
+            unique_ids, starts = np.unique(player_ids, return_index=True)
+            offsets = np.append(starts, len(player_ids)).astype(np.int64)
+            self._index = dict(game_pks=game_pks, player_ids=unique_ids, offsets=offsets, games=games,
+                               rows=rows, roles=roles)
+        return self._index
+
+    def save(self, path=None):
+        path = Path(path) if path else self.path
+        if not self.dirty and path == self.path:
+            return
+        # np.savez adds .npz to names that don't have it, so the temp file keeps the extension
+        temp_path = path.with_name(path.stem + ".tmp.npz")
+        np.savez_compressed(temp_path, **self._sorted())
+        os.replace(temp_path, path)
+        if path == self.path:
+            self.dirty = False
+        logging.info(f"Saved player postings of {len(self.games)} games to {path}")
+
+    def _player_slice(self, player_id):
+        index = self._sorted()
+        position = np.searchsorted(index['player_ids'], player_id)
+        if position == len(index['player_ids']) or index['player_ids'][position] != player_id:
+            return slice(0, 0)
+        return slice(int(index['offsets'][position]), int(index['offsets'][position + 1]))
+
+    def find(self, player_id, roles=None):
+        """
+        Every decision point player_id is in, in any of roles (column names, default all of them), as
+        (game_pks, rows, roles) arrays sorted by game and row. A player with several roles in a row is there once
+        per role.
+        """
+        index = self._sorted()
+        player = self._player_slice(player_id)
+        games, rows, player_roles = index['games'][player], index['rows'][player], index['roles'][player]
+        if roles is not None:
+            keep = np.isin(player_roles, _role_codes(roles))
+            games, rows, player_roles = games[keep], rows[keep], player_roles[keep]
+        return index['game_pks'][games], rows, player_roles
+
+    def find_together(self, player_id, other_id, roles=None, other_roles=None):
+        """The decision points (game_pks, rows) with player_id in one of roles and other_id in one of other_roles"""
+        index = self._sorted()
+        keys = []
+        for player, player_roles in [(player_id, roles), (other_id, other_roles)]:
+            player = self._player_slice(player)
+            games, rows = index['games'][player], index['rows'][player]
+            if player_roles is not None:
+                keep = np.isin(index['roles'][player], _role_codes(player_roles))
+                games, rows = games[keep], rows[keep]
+            keys.append(games.astype(np.int64) << 32 | rows)
+        both = np.intersect1d(keys[0], keys[1])
+        return index['game_pks'][both >> 32], (both & 0xFFFFFFFF).astype(np.int32)
+
+    def role_names(self, roles):
+        return [ROLES[role] for role in roles]
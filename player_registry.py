@@ -0,0 +1,125 @@
+import json
+import logging
+import os
+import re
+from pathlib import Path
+from event_handlers import process_name
+
+REGISTRY_FILENAME = "player_registry.json"
+# Bump when the file layout changes, older files are rebuilt
+REGISTRY_VERSION = 3
+
+# Columns of the urls CSVs that list player IDs, e.g. 664285(Top1)/650556(Top6)
+URL_PLAYER_COLUMNS = ['home_pitchers', 'away_pitchers', 'home_batters', 'away_batters',
+                      'home_position_players', 'away_position_players']
+URL_PLAYER_ID_PATTERN = re.compile(r'(\d+)\(')
+
+
+class PlayerRegistry:
+    """
+    Season-wide map from every normalized spelling of a player's name to the MLB IDs it has been seen with.
+    A spelling can belong to more than one player (there are two Will Smiths), so lookups are always
+    narrowed down to the IDs of the game being processed.
+    Only names from player maps are spellings. Fuzzy matches aren't written back, so how a game's names resolve
+    doesn't depend on which games were processed before it.
+    """
+
+    def __init__(self, path, spellings=None, players=None):
+        self.path = Path(path)
+        self.spellings = spellings or {}
+        self.players = players or {}
+        # Player ID -> their spellings, kept up to date as spellings are added
+        self.player_spellings = {}
+        for processed_name, player_ids in self.spellings.items():
+            for player_id in player_ids:
+                self.player_spellings.setdefault(player_id, []).append(processed_name)
+        self.dirty = False
+
+    @classmethod
+    def build(cls, scraped_dir="scraped_games", url_csvs=(), path=None):
+        """Build the registry from every scraped player map and every player ID in the urls CSVs"""
+        import pandas as pd
+
+        scraped_dir = Path(scraped_dir)
+        registry = cls(path or scraped_dir / REGISTRY_FILENAME)
+
+        for game_path in sorted(scraped_dir.glob("game_*.json")):
+            with open(game_path) as f:
+                game_data = json.load(f)
+            for key in ['away_player_map', 'home_player_map']:
+                for player_id, name in game_data.get(key, {}).items():
+                    registry.add_player(int(player_id), name)
+
+        for url_csv in url_csvs:
+            game_url_df = pd.read_csv(url_csv, usecols=lambda col: col in URL_PLAYER_COLUMNS)
+            for column in game_url_df.columns:
+                for encoded in game_url_df[column].dropna():
+                    for player_id in URL_PLAYER_ID_PATTERN.findall(encoded):
+                        # Players we only know the ID of get a name once a player map with them shows up
+                        registry.players.setdefault(str(int(player_id)), None)
+
+        logging.info("Built player registry with %s players and %s spellings",
+                     len(registry.players), len(registry.spellings))
+        registry.dirty = True
+        return registry
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            data = json.load(f)
+        if data.get('version') != REGISTRY_VERSION:
+            raise ValueError(f"{path} is registry version {data.get('version')}, expected {REGISTRY_VERSION}")
+        return cls(path, spellings=data['spellings'], players=data['players'])
+
+    @classmethod
+    def load_or_build(cls, scraped_dir="scraped_games", url_csvs=()):
+        path = Path(scraped_dir) / REGISTRY_FILENAME
+        if path.exists():
+            try:
+                return cls.load(path)
+            except (ValueError, KeyError) as e:
+                logging.warning("Rebuilding the player registry, couldn't use %s: %s", path, e)
+        registry = cls.build(scraped_dir, url_csvs, path)
+        registry.save()
+        return registry
+
+    def save(self):
+        if not self.dirty:
+            return
+        # Written next to the registry and renamed into place, so an interrupted save leaves the old file
+        temp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(temp_path, 'w') as f:
+            json.dump({'version': REGISTRY_VERSION, 'spellings': self.spellings, 'players': self.players}, f)
+        os.replace(temp_path, self.path)
+        self.dirty = False
+
+    def add_player(self, player_id, name):
+        if self.players.get(str(player_id)) is None:
+            self.players[str(player_id)] = name
+            self.dirty = True
+        self.add_spelling(process_name(name), player_id)
+
+    def add_spelling(self, processed_name, player_id):
+        player_ids = self.spellings.setdefault(processed_name, [])
+        if player_id not in player_ids:
+            player_ids.append(player_id)
+            self.player_spellings.setdefault(player_id, []).append(processed_name)
+            self.dirty = True
+
+    def roster_spellings(self, roster):
+        """
+        (spelling, IDs) of every spelling of a player in roster, with the IDs narrowed down to the roster.
+        This is everything lookup() can answer from for a game with that roster.
+        """
+        processed_names = sorted({processed_name for player_id in roster
+                                  for processed_name in self.player_spellings.get(player_id, ())})
+        return [(processed_name, sorted(player_id for player_id in self.spellings[processed_name]
+                                        if player_id in roster))
+                for processed_name in processed_names]
+
+    def lookup(self, processed_name, roster):
+        """Return the only player in roster whose player map name has this spelling, or None"""
+        candidates = [player_id for player_id in self.spellings.get(processed_name, ()) if player_id in roster]
+        if len(candidates) == 1:
+            return candidates[0]
+        return None
@@ -0,0 +1,189 @@
+"""
+A resident processing service for iterating on single games. It keeps the Statcast at-bats, the player registry
+and the parsed play cache in memory and replays games on request over a local socket, so a game comes back in
+milliseconds instead of paying for the imports and the Statcast read every time.
+
+    python cli.py serve
+    python cli.py send process 718768          # writes daemon_games/game_718768_decisions.csv
+    python cli.py send process 718768 --rows   # decision rows back as JSON
+    python cli.py send reload                  # pick up edited handlers
+    python cli.py send shutdown
+
+The protocol is one JSON object per line each way. Requests have a 'command' (process, reload, ping, shutdown),
+responses have 'ok' and either the result or an 'error'.
+"""
+import ast
+import importlib
+import json
+import logging
+import socket
+import socketserver
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from graphlib import TopologicalSorter
+from pathlib import Path
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+REPO_DIR = Path(__file__).resolve().parent
+# The daemon itself and the command line running it are never reloaded
+NOT_RELOADED = {'__main__', 'cli', 'processing_daemon'}
+
+
+def reloaded_modules():
+    """
+    Every loaded module of the repo, ordered so each one comes after the modules it imports at the top level and
+    picks up their fresh versions. Imports inside functions look the module up when they run, so they need no order.
+    """
+    paths = {}
+    for name, module in list(sys.modules.items()):
+        path = getattr(module, '__file__', None)
+        if name not in NOT_RELOADED and path and path.endswith('.py') and Path(path).resolve().parent == REPO_DIR:
+            paths[name] = Path(path)
+
+    imports = {}
+    for name in sorted(paths):
+        imported = set()
+        for node in ast.parse(paths[name].read_text()).body:
+            if isinstance(node, ast.Import):
+                imported.update(alias.name.split('.')[0] for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                imported.add(node.module.split('.')[0])
+        imports[name] = sorted(imported & paths.keys())
+    return list(TopologicalSorter(imports).static_order())
+
+
+class ProcessingService:
+    """What the daemon keeps warm between requests, and the requests themselves"""
+
+    def __init__(self, input_csv="urls/gameday_urls2023.csv", scraped_data_dir="scraped_games",
+                 output_dir="daemon_games", output_format='csv'):
+        self.input_csv = input_csv
+        self.scraped_data_dir = scraped_data_dir
+        self.output_dir = output_dir
+        self.output_format = output_format
+        self.load_data()
+
+    def load_data(self, play_cache=True):
+        import description_parser
+        import main
+        from output_writer import OutputWriter
+        from player_registry import PlayerRegistry
+        from statcast_at_bats import StatcastAtBats
+
+        start = time.perf_counter()
+        self.processor = main.GameProcessor(self.scraped_data_dir)
+        self.statcast_at_bats = StatcastAtBats()
+        self.registry = PlayerRegistry.load_or_build(self.scraped_data_dir, [self.input_csv])
+        if play_cache:
+            description_parser.load_play_cache(self.scraped_data_dir)
+        # Requests are answered once their game is written, so there's nothing to hand to a writer thread
+        self.writer = OutputWriter(self.output_dir, self.output_format, background=False)
+        logging.info(f"Loaded Statcast, registry and play cache in {time.perf_counter() - start:.2f}s")
+
+    def process(self, game_pk, rows=False, vectorized_corrections=False, statcast_first=False):
+        """Replay one game, returning its decision rows or writing it and returning the path"""
+        import main
+
+        game_pk = int(game_pk)
+        game_data = self.processor.load_game_data(str(game_pk))
+        event_counts = Counter()
+        decision_df = main.process_game(game_data, self.statcast_at_bats.for_game(game_pk), vectorized_corrections,
+                                        self.registry, event_counts, statcast_first)
+        if rows:
+            return {'columns': list(decision_df.columns), 'rows': decision_df.to_numpy().tolist()}
+        self.writer.write(game_pk, decision_df)
+        return {'path': str(self.writer.output_path(game_pk)), 'decision_points': len(decision_df)}
+
+    def reload(self, data=False):
+        """
+        Re-import the processing code after it changed, and with data also re-read Statcast and the registry.
+        The parsed play cache is emptied rather than read back, so plays parsed before a parser edit are parsed again.
+        """
+        import description_parser
+
+        self.registry.save()
+        reloaded = reloaded_modules()
+        for name in reloaded:
+            importlib.reload(sys.modules[name])
+        description_parser.clear_play_cache()
+        if data:
+            self.load_data(play_cache=False)
+        return {'reloaded': reloaded}
+
+    def save(self):
+        """Keep new spellings and newly parsed plays for the next start"""
+        import description_parser
+
+        self.registry.save()
+        description_parser.save_play_cache(self.scraped_data_dir)
+
+    def handle(self, request):
+        command = request.get('command')
+        if command == 'process':
+            return self.process(request['game_pk'], request.get('rows', False),
+                                request.get('vectorized_corrections', False), request.get('statcast_first', False))
+        if command == 'reload':
+            return self.reload(request.get('data', False))
+        if command == 'ping':
+            return {}
+        raise ValueError(f"Unknown command '{command}'")
+
+
+def _json_default(value):
+    # Numpy scalars left in a decision DataFrame, e.g. by the vectorized corrections
+    if hasattr(value, 'item'):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            start = time.perf_counter()
+            try:
+                request = json.loads(line)
+                if request.get('command') == 'shutdown':
+                    response = {'ok': True}
+                    # shutdown() waits for serve_forever to return, so it can't run on the serving thread
+                    threading.Thread(target=self.server.shutdown).start()
+                else:
+                    response = {'ok': True, **self.server.service.handle(request)}
+            except Exception as e:
+                logging.warning(f"Request failed: {e}\n{traceback.format_exc()}")
+                response = {'ok': False, 'error': f"{type(e).__name__}: {e}"}
+            response['elapsed_ms'] = round((time.perf_counter() - start) * 1000, 1)
+            self.wfile.write(json.dumps(response, default=_json_default).encode() + b"\n")
+            self.wfile.flush()
+
+
+class ProcessingServer(socketserver.TCPServer):
+    """Handles one connection at a time, the processing code keeps per-run state in module globals"""
+    allow_reuse_address = True
+
+    def __init__(self, service, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        super().__init__((host, port), _RequestHandler)
+        self.service = service
+
+
+def serve(service, host=DEFAULT_HOST, port=DEFAULT_PORT):
+    with ProcessingServer(service, host, port) as server:
+        logging.warning(f"Processing service listening on {host}:{port}")
+        try:
+            server.serve_forever()
+        finally:
+            service.save()
+
+
+def send_request(request, host=DEFAULT_HOST, port=DEFAULT_PORT, timeout=600):
+    """Send one request to a running service and return its response"""
+    with socket.create_connection((host, port), timeout=timeout) as connection:
+        connection.sendall(json.dumps(request).encode() + b"\n")
+        with connection.makefile('rb') as response:
+            return json.loads(response.readline())
@@ -0,0 +1,98 @@
+import atexit
+import logging
+import queue
+from collections import Counter
+from logging.handlers import QueueHandler, QueueListener
+
+LOG_FORMAT = '%(asctime)s - %(message)s'
+
+# Routine per-row messages tagged with extra={'sample': <key>} only get through once every SAMPLE_EVERY times per key,
+# errors and anything unexpected are never tagged
+SAMPLE_EVERY = 50
+
+
+class SamplingFilter(logging.Filter):
+    """Lets every untagged record through, but only one in sample_every of each tagged kind of record"""
+
+    def __init__(self, sample_every=SAMPLE_EVERY):
+        super().__init__()
+        self.sample_every = sample_every
+        self.seen = Counter()
+
+    def filter(self, record):
+        key = getattr(record, 'sample', None)
+        if key is None:
+            return True
+        self.seen[key] += 1
+        return self.seen[key] % self.sample_every == 1 or self.sample_every == 1
+
+
+# Arguments of these types can't change between the call and the listener formatting the message
+PLAIN_TYPES = (str, int, float, bool, type(None))
+# Attributes every LogRecord has, anything else on a record was passed in extra=
+RECORD_ATTRIBUTES = set(logging.makeLogRecord({}).__dict__) | {'message', 'asctime'}
+
+
+class CompactQueueHandler(QueueHandler):
+    """
+    Puts a small copy of the caller's LogRecord on the queue: the message with its arguments, the fields the format
+    uses and whatever was passed in extra=. The message is formatted on the listener thread, unless one of its
+    arguments is an object that could change before then, or the record has an exception to render.
+    """
+
+    def prepare(self, record):
+        msg, args = record.msg, record.args
+        if not isinstance(msg, str) or not isinstance(args, tuple) or not all(isinstance(arg, PLAIN_TYPES)
+                                                                            for arg in args):
+            msg, args = record.getMessage(), ()
+        fields = {key: value for key, value in record.__dict__.items() if key not in RECORD_ATTRIBUTES}
+        fields.update({
+            'name': record.name,
+            'levelno': record.levelno,
+            'levelname': record.levelname,
+            'msg': msg,
+            'args': args,
+            'created': record.created,
+            'msecs': record.msecs,
+            # The formatter appends exc_text, so the traceback itself doesn't have to go on the queue
+            'exc_text': logging.Formatter().formatException(record.exc_info) if record.exc_info else None,
+        })
+        return logging.makeLogRecord(fields)
+
+
+def setup_queued_logging(log_file, level=logging.INFO, sample_every=SAMPLE_EVERY):
+    """
+    Route the root logger through a queue to a listener thread that does the console and file writes,
+    so the scrape loop never waits on I/O. Returns the listener, stop_queued_logging runs at exit to flush it.
+    """
+    root = logging.getLogger()
+    for handler in root.handlers:
+        if isinstance(handler, CompactQueueHandler):
+            return handler.listener
+
+    log_queue = queue.SimpleQueue()
+    formatter = logging.Formatter(LOG_FORMAT)
+    file_handler = logging.FileHandler(log_file)
+    file_handler.setFormatter(formatter)
+    stream_handler = logging.StreamHandler()  # Also print to console
+    stream_handler.setFormatter(formatter)
+
+    listener = QueueListener(log_queue, file_handler, stream_handler)
+    queue_handler = CompactQueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter(sample_every))
+    queue_handler.listener = listener
+
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+    listener.start()
+    atexit.register(stop_queued_logging)
+    return listener
+
+
+def stop_queued_logging():
+    """Flush whatever is still queued and go back to logging without the listener"""
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if isinstance(handler, CompactQueueHandler):
+            root.removeHandler(handler)
+            handler.listener.stop()
@@ -1,5 +1,5 @@
 from selenium import webdriver
-from selenium.common import TimeoutException
+from selenium.common import NoSuchElementException, TimeoutException
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
@@ -8,13 +8,19 @@ from selenium.webdriver.support import expected_conditions as EC
 import unidecode
 import re
 from event_handlers import remove_middle_initials
+from game_state import FieldPosition
+from scrape_logging import setup_queued_logging
+from season_event_index import SeasonEventIndex
+from player_registry import PlayerRegistry
+from url_encodings import parse_game_encodings
 import json
 import time
 import datetime
 from pathlib import Path
-import pandas as pd
 from typing import Optional
-from dataclasses import dataclass, asdict
+from dataclasses import asdict
+# GameData lives in game_data so processing can use it without importing Selenium
+from game_data import GameData
 import logging
 from tqdm import tqdm
 
@@ -149,7 +155,7 @@ def get_bullpen_and_mapping(driver, team_class):
 
 @timeit
 def process_box(driver, box_url):
-    logging.info("processing box for: ", box_url)
+    logging.info("processing box for: %s", box_url)
     ts_total = time.time()
 
     ts = time.time()
@@ -288,7 +294,7 @@ def process_summary(driver, summary_url, home_abbr, away_abbr):
                                 try:
                                     atbat_index = int(atbat_index) + 1  # 0 index -> 1 index
                                 except ValueError:
-                                    logging.info(f"      Invalid atbat-index value: {atbat_index}")
+                                    logging.info("      Invalid atbat-index value: %s", atbat_index)
                                     atbat_index = None
                             else:
                                 logging.info("      No atbat-index found for this event.")
@@ -302,7 +308,7 @@ def process_summary(driver, summary_url, home_abbr, away_abbr):
                                         home_abbr: int(score_updates[1].text.split()[-1])
                                     }
                                 except (IndexError, ValueError) as e:
-                                    logging.info(f"      Error parsing score updates: {e}")
+                                    logging.info("      Error parsing score updates: %s", e)
 
                             # Process outs updates
                             outs_update = None
@@ -315,22 +321,27 @@ def process_summary(driver, summary_url, home_abbr, away_abbr):
                                     try:
                                         outs_update = int(outs_element.text.strip().split()[0])
                                     except ValueError:
-                                        logging.info(
-                                            f"      Error parsing outs updates for event: {event_type_text} - {event_description_text}")
+                                        logging.info("      Error parsing outs updates for event: %s - %s",
+                                                     event_type_text, event_description_text)
+                            except NoSuchElementException:
+                                # Most events don't change the outs
+                                logging.info("      No outs element found", extra={'sample': 'outs'})
                             except Exception as e:
-                                logging.info(f"      No outs element found or error: {e}")
+                                logging.info("      Error finding the outs element: %s", e)
 
                             # Handle offensive substitutions specifically
                             if "Offensive Substitution:" in event_description_text:
                                 # Use regex to extract all 'Offensive Substitution: <desc>' parts
                                 substitution_pattern = r'Offensive Substitution:\s*(.*?)\.?(?=\s*Offensive Substitution:|$)'
                                 substitutions = re.findall(substitution_pattern, event_description_text, re.IGNORECASE | re.DOTALL)
-                                logging.info(f"      Found {len(substitutions)} offensive substitution(s)")
+                                logging.info("      Found %d offensive substitution(s)", len(substitutions),
+                                             extra={'sample': 'substitution'})
 
                                 for idx, sub_desc in enumerate(substitutions):
                                     sub_desc = sub_desc.strip()
                                     detailed_description = f"Offensive Substitution: {sub_desc}"
-                                    logging.info(f"        Processing substitution {idx+1}: {detailed_description}")
+                                    logging.info("        Processing substitution %d: %s", idx + 1, detailed_description,
+                                                 extra={'sample': 'substitution'})
 
                                     event_entry = {
                                         "type": "Offensive Substitution",
@@ -344,18 +355,20 @@ def process_summary(driver, summary_url, home_abbr, away_abbr):
                                     if current_inning and game_summary:
                                         game_summary[-1]["events"].append(event_entry)
                                     else:
-                                        logging.info(
-                                            f"      Skipped event due to no current inning: Offensive Substitution - {sub_desc}")
+                                        logging.info("      Skipped event due to no current inning: Offensive Substitution - %s",
+                                                     sub_desc)
                             elif "Defensive Substitution:" in event_description_text:
                                 # Use regex to extract all 'Defensive Substitution: <desc>' parts
                                 substitution_pattern = r'Defensive Substitution:\s*(.*?)\.?(?=\s*Defensive Substitution:|$)'
                                 substitutions = re.findall(substitution_pattern, event_description_text, re.IGNORECASE | re.DOTALL)
-                                logging.info(f"      Found {len(substitutions)} defensive substitution(s)")
+                                logging.info("      Found %d defensive substitution(s)", len(substitutions),
+                                             extra={'sample': 'substitution'})
 
                                 for idx, sub_desc in enumerate(substitutions):
                                     sub_desc = sub_desc.strip()
                                     detailed_description = f"Defensive Substitution: {sub_desc}"
-                                    logging.info(f"        Processing substitution {idx+1}: {detailed_description}")
+                                    logging.info("        Processing substitution %d: %s", idx + 1, detailed_description,
+                                                 extra={'sample': 'substitution'})
 
                                     event_entry = {
                                         "type": "Defensive Sub",
@@ -369,8 +382,8 @@ def process_summary(driver, summary_url, home_abbr, away_abbr):
                                     if current_inning and game_summary:
                                         game_summary[-1]["events"].append(event_entry)
                                     else:
-                                        logging.info(
-                                            f"      Skipped event due to no current inning: Defensive Substitution - {sub_desc}")
+                                        logging.info("      Skipped event due to no current inning: Defensive Substitution - %s",
+                                                     sub_desc)
 
                             else:
                                 event_entry = {
@@ -385,11 +398,11 @@ def process_summary(driver, summary_url, home_abbr, away_abbr):
                                 if current_inning and game_summary:
                                     game_summary[-1]["events"].append(event_entry)
                                 else:
-                                    logging.info(
-                                        f"      Skipped event due to no current inning: {event_type_text} - {event_description_text}")
+                                    logging.info("      Skipped event due to no current inning: %s - %s",
+                                                 event_type_text, event_description_text)
 
                 except Exception as e:
-                    logging.info(f"    Error processing sub_event: {e}")
+                    logging.info("    Error processing sub_event: %s", e)
         te = time.time()
         logging.info(f'  Processing all events took {te - ts:.2f} seconds')
     except Exception as e:
@@ -401,27 +414,24 @@ def process_summary(driver, summary_url, home_abbr, away_abbr):
     return game_summary
 
 
-@dataclass
-class GameData:
-    """Container for scraped game data"""
-    away_lineup: list
-    away_sub_ins: list
-    away_player_map: dict
-    away_bullpen: list
-    away_position_map: dict
-    home_lineup: list
-    home_sub_ins: list
-    home_player_map: dict
-    home_bullpen: list
-    home_position_map: dict
-    game_summary: list
-    game_pk: str
-    home_abbr: str
-    away_abbr: str
+# The parts of a team's roster the urls CSV has as well as the box page
+ROSTER_FIELDS = ['lineup', 'sub_ins', 'bullpen', 'position_map']
+FIELD_POSITIONS = {position.value for position in FieldPosition}
+
+
+def starter_positions(lineup, position_map):
+    """The field position of every starter, None for what isn't one (P, PH, Unknown), all the game state uses"""
+    positions = {}
+    for player_id in lineup:
+        position = position_map.get(player_id)
+        positions[player_id] = position if position in FIELD_POSITIONS else None
+    return positions
 
 
 class GameScraper:
-    def __init__(self, games_csv: str, output_dir: str = "scraped_games"):
+    def __init__(self, games_csv: str, output_dir: str = "scraped_games", trust_seeded_rosters: bool = False):
+        import pandas as pd
+
         self.games_df = pd.read_csv(games_csv)
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
@@ -431,17 +441,18 @@ class GameScraper:
         log_dir.mkdir(exist_ok=True)
         timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
 
-        # File handler
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(message)s',
-            handlers=[
-                logging.FileHandler(f"logs/scraping_{timestamp}.log"),
-                logging.StreamHandler()  # Also print to console
-            ]
-        )
+        # File and console output happen on a listener thread, the scrape loop only puts records on a queue
+        self.log_listener = setup_queued_logging(f"logs/scraping_{timestamp}.log")
         self.logger = logging
 
+        # Every game we save is indexed right away so season-wide event queries stay current
+        self.event_index = SeasonEventIndex.load_or_build(self.output_dir)
+        # Names of players we've seen before, to fill in player maps without the box page
+        self.registry = PlayerRegistry.load_or_build(self.output_dir, [games_csv])
+        # Skip the box page of a game whose players are all in the registry and take its rosters from the urls CSV.
+        # Off by default, the box page is what the rosters are checked against.
+        self.trust_seeded_rosters = trust_seeded_rosters
+
     def _is_game_data_complete(self, game_path: Path) -> bool:
         """Check if existing game data is complete (has non-empty lineups)."""
         try:
@@ -451,8 +462,12 @@ class GameScraper:
         except (json.JSONDecodeError, FileNotFoundError):
             return False
 
-    def scrape_games(self, start_index: int = 0, end_index: Optional[int] = None) -> None:
-        """Scrape games and save data, checking for existing files and data completeness."""
+    def scrape_games(self, start_index: int = 0, end_index: Optional[int] = None, on_game=None) -> None:
+        """
+        Scrape games and save data, checking for existing files and data completeness.
+        on_game(row, game_json) is called for every saved game with the JSON it was saved as, None for games
+        already scraped.
+        """
         driver = setup_webdriver()
         try:
             games_to_process = self.games_df.iloc[start_index:end_index] if end_index else self.games_df.iloc[
@@ -469,6 +484,8 @@ class GameScraper:
                 if output_path.exists():
                     if self._is_game_data_complete(output_path):
                         self.logger.info(f"Game {game_pk} already scraped with complete data, skipping.")
+                        if on_game:
+                            on_game(row, None)
                         continue
                     else:
                         self.logger.info(f"Game {game_pk} exists but has incomplete data, re-scraping.")
@@ -476,10 +493,12 @@ class GameScraper:
                 try:
                     start_time = time.time()
                     game_data = self._scrape_single_game(driver, row)
-                    self._save_game_data(game_data)
+                    saved = self._save_game_data(game_data)
 
                     elapsed = time.time() - start_time
                     self.logger.info(f"Game {game_pk} scraped successfully in {elapsed:.2f} seconds")
+                    if on_game:
+                        on_game(row, saved)
 
                 except Exception as e:
                     self.logger.error(f"Failed to scrape game {game_pk}: {str(e)}")
@@ -495,43 +514,112 @@ class GameScraper:
 
         finally:
             driver.quit()
+            self.event_index.save()
+            # With on_game the registry is shared with whoever processes the games, and they save it once done
+            if on_game is None:
+                self.registry.save()
 
     def _scrape_single_game(self, driver, row) -> GameData:
         """Scrape data for a single game"""
-        # Process box score
-        box_data = process_box(driver, row['box_url'])
-        away_lineup, away_sub_ins, away_player_map, away_bullpen, away_position_map, \
-            home_lineup, home_sub_ins, home_player_map, home_bullpen, home_position_map = box_data
+        # The urls CSV has the lineups, bullpens and positions too, they're checked against the box page's
+        seeded_rosters = self._seed_rosters(row)
+        if (self.trust_seeded_rosters and seeded_rosters is not None
+                and self._fill_player_maps_from_registry(seeded_rosters)):
+            self.logger.info(f"All players of game {row['game_pk']} are known, skipping the box page")
+            rosters = seeded_rosters
+        else:
+            box_data = process_box(driver, row['box_url'])
+            away_lineup, away_sub_ins, away_player_map, away_bullpen, away_position_map, \
+                home_lineup, home_sub_ins, home_player_map, home_bullpen, home_position_map = box_data
+            rosters = {
+                'away_lineup': away_lineup, 'away_sub_ins': away_sub_ins, 'away_bullpen': away_bullpen,
+                'away_position_map': away_position_map, 'away_player_map': away_player_map,
+                'home_lineup': home_lineup, 'home_sub_ins': home_sub_ins, 'home_bullpen': home_bullpen,
+                'home_position_map': home_position_map, 'home_player_map': home_player_map,
+            }
+            for player_map in [away_player_map, home_player_map]:
+                for player_id, name in player_map.items():
+                    self.registry.add_player(player_id, name)
+            if seeded_rosters is not None:
+                self._check_seeded_rosters(row['game_pk'], rosters, seeded_rosters)
 
         # Process game summary
         game_summary = process_summary(driver, row['summary_url'], row['home_abbr'], row['away_abbr'])
 
         return GameData(
-            away_lineup=away_lineup,
-            away_sub_ins=away_sub_ins,
-            away_player_map=away_player_map,
-            away_bullpen=away_bullpen,
-            away_position_map=away_position_map,
-            home_lineup=home_lineup,
-            home_sub_ins=home_sub_ins,
-            home_player_map=home_player_map,
-            home_bullpen=home_bullpen,
-            home_position_map=home_position_map,
+            **rosters,
             game_summary=game_summary,
             game_pk=str(row['game_pk']),
             home_abbr=row['home_abbr'],
             away_abbr=row['away_abbr']
         )
 
-    def _save_game_data(self, game_data: GameData) -> None:
-        """Save game data to JSON file"""
+    def _seed_rosters(self, row) -> Optional[dict]:
+        """Lineups, substitutes, bullpens and position maps from the urls CSV, None if the row doesn't have them"""
+        try:
+            rosters = parse_game_encodings(row)
+        except (KeyError, ValueError) as e:
+            self.logger.info(f"Couldn't read the player encodings of game {row['game_pk']}: {e}")
+            return None
+        if len(rosters['away_lineup']) < 9 or len(rosters['home_lineup']) < 9:
+            return None
+        return rosters
+
+    def _check_seeded_rosters(self, game_pk, rosters: dict, seeded_rosters: dict) -> None:
+        """
+        Log where the urls CSV disagrees with the box page's rosters, which are kept. A part the box page didn't
+        give us at all is taken from the urls CSV, with the names the registry has for its players.
+        """
+        for team in ['away', 'home']:
+            # A team without a lineup had its batters table fail to load, no subs on it doesn't mean there were none
+            batters_missing = not rosters[f'{team}_lineup']
+            for field in ROSTER_FIELDS:
+                key = f'{team}_{field}'
+                box_value, seeded_value = rosters[key], seeded_rosters[key]
+                if batters_missing and field != 'bullpen' or field == 'bullpen' and not box_value:
+                    self.logger.warning(f"Game {game_pk} has no {key} on the box page, using the urls CSV's")
+                    rosters[key] = seeded_value
+                    continue
+                if field == 'sub_ins':
+                    box_value, seeded_value = set(box_value), set(seeded_value)
+                elif field == 'position_map':
+                    lineup = rosters[f'{team}_lineup']
+                    box_value = starter_positions(lineup, box_value)
+                    seeded_value = starter_positions(lineup, seeded_value)
+                if box_value != seeded_value:
+                    self.logger.warning(f"Game {game_pk}: the urls CSV disagrees with the box page on {key}, "
+                                        f"keeping the box page's. Box page {box_value}, urls CSV {seeded_value}")
+
+            player_map = rosters[f'{team}_player_map']
+            for player_id in rosters[f'{team}_lineup'] + rosters[f'{team}_sub_ins'] + rosters[f'{team}_bullpen']:
+                if player_id not in player_map and self.registry.players.get(str(player_id)) is not None:
+                    player_map[player_id] = self.registry.players[str(player_id)]
+
+    def _fill_player_maps_from_registry(self, rosters: dict) -> bool:
+        """Add both player maps to rosters from the registry, False if any player's name is still unknown"""
+        player_maps = {}
+        for team in ['away', 'home']:
+            player_ids = rosters[f'{team}_lineup'] + rosters[f'{team}_sub_ins'] + rosters[f'{team}_bullpen']
+            player_map = {player_id: self.registry.players.get(str(player_id)) for player_id in player_ids}
+            if None in player_map.values():
+                return False
+            player_maps[f'{team}_player_map'] = player_map
+        rosters.update(player_maps)
+        return True
+
+    def _save_game_data(self, game_data: GameData) -> str:
+        """Save game data to JSON file, returning the JSON written"""
         output_path = self.output_dir / f"game_{game_data.game_pk}.json"
+        saved = json.dumps(asdict(game_data))
         with open(output_path, 'w') as f:
-            json.dump(asdict(game_data), f)
+            f.write(saved)
+        self.event_index.update_game(game_data.game_pk, game_data.game_summary)
+        return saved
 
 
 if __name__ == "__main__":
-    # Example usage:
-    # First, scrape all games
-    scraper = GameScraper("urls/gameday_urls2023.csv")
-    scraper.scrape_games(start_index=0)
\ No newline at end of file
+    # Same as `python cli.py scrape ...`
+    import sys
+    import cli
+
+    sys.exit(cli.main(['scrape'] + sys.argv[1:]))
@@ -0,0 +1,164 @@
+import json
+import logging
+import os
+import re
+from pathlib import Path
+from event_stats import write_event_stats_csv
+
+SEASON_INDEX_FILENAME = "season_event_index.json"
+SEASON_INDEX_VERSION = 1
+# Counted over every scraped game, so kept apart from final_event_stats.csv, which counts the processed games
+SCRAPED_EVENT_STATS_CSV = "events_data/scraped_event_stats.csv"
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9']+")
+
+
+def tokenize(description):
+    return set(TOKEN_PATTERN.findall(description.lower()))
+
+
+class SeasonEventIndex:
+    """
+    Every scraped event of the season, indexed by event type so cross-game questions don't have to open every
+    scraped JSON. A posting is (game_pk, half_inning_index, ordinal, atbat_index), where half_inning_index and
+    ordinal are the positions of the event in the game's game_summary
+    (game_summary[half_inning_index]['events'][ordinal]). half_inning_index counts half-innings from 0 for the top
+    of the 1st, it isn't the inning number; game_summary[half_inning_index]['inning'] has the label, e.g. "Bottom 1st".
+    With tokens, the words of every description are indexed too and can be searched with search().
+    The index is stored per game next to the scraped games, so a re-scraped game just replaces its own entry.
+    """
+
+    def __init__(self, path, tokens=False):
+        self.path = Path(path)
+        self.tokens = tokens
+        # game_pk -> {'events': [[event_type, half_inning_index, ordinal, atbat_index], ...],
+        #             'tokens': {token: [event number]}}
+        self.games = {}
+        self.dirty = False
+        self._postings = None
+        self._token_postings = None
+
+    @classmethod
+    def build(cls, scraped_dir="scraped_games", tokens=False, path=None):
+        scraped_dir = Path(scraped_dir)
+        index = cls(path or scraped_dir / SEASON_INDEX_FILENAME, tokens)
+        for game_path in sorted(scraped_dir.glob("game_*.json")):
+            with open(game_path) as f:
+                game_data = json.load(f)
+            index.update_game(game_data['game_pk'], game_data['game_summary'])
+        logging.info(f"Built season event index over {len(index.games)} games")
+        return index
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            data = json.load(f)
+        if data.get('version') != SEASON_INDEX_VERSION:
+            raise ValueError(f"Season event index {path} is version {data.get('version')}, "
+                             f"expected {SEASON_INDEX_VERSION}")
+        index = cls(path, data['tokens'])
+        index.games = {int(game_pk): entry for game_pk, entry in data['games'].items()}
+        return index
+
+    @classmethod
+    def load_or_build(cls, scraped_dir="scraped_games", tokens=False):
+        path = Path(scraped_dir) / SEASON_INDEX_FILENAME
+        if path.exists():
+            try:
+                index = cls.load(path)
+                if index.tokens or not tokens:
+                    return index
+            except ValueError as e:
+                logging.info(f"Rebuilding season event index: {e}")
+        index = cls.build(scraped_dir, tokens, path)
+        index.save()
+        return index
+
+    def update_game(self, game_pk, game_summary):
+        """Replace everything indexed for a game with the events of its (re)scraped game_summary"""
+        events = []
+        token_events = {}
+        for half_inning_index, inning_data in enumerate(game_summary):
+            for ordinal, event in enumerate(inning_data['events']):
+                if self.tokens:
+                    for token in tokenize(event['description']):
+                        token_events.setdefault(token, []).append(len(events))
+                events.append([event['type'], half_inning_index, ordinal, event['atbat_index']])
+        entry = {'events': events}
+        if self.tokens:
+            entry['tokens'] = token_events
+        self.games[int(game_pk)] = entry
+        self.dirty = True
+        self._postings = None
+        self._token_postings = None
+
+    def save(self):
+        if not self.dirty:
+            return
+        temp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(temp_path, 'w') as f:
+            json.dump({'version': SEASON_INDEX_VERSION, 'tokens': self.tokens, 'games': self.games}, f)
+        os.replace(temp_path, self.path)
+        self.dirty = False
+
+    def _build_postings(self):
+        postings = {}
+        for game_pk in sorted(self.games):
+            for event_type, half_inning_index, ordinal, atbat_index in self.games[game_pk]['events']:
+                postings.setdefault(event_type, []).append((game_pk, half_inning_index, ordinal, atbat_index))
+        self._postings = postings
+
+    def _build_token_postings(self):
+        token_postings = {}
+        for game_pk in sorted(self.games):
+            events = self.games[game_pk]['events']
+            for token, event_numbers in self.games[game_pk].get('tokens', {}).items():
+                postings = token_postings.setdefault(token, [])
+                for event_number in event_numbers:
+                    _, half_inning_index, ordinal, atbat_index = events[event_number]
+                    postings.append((game_pk, half_inning_index, ordinal, atbat_index))
+        self._token_postings = token_postings
+
+    def events(self, event_type):
+        """Every event of this type in the season, in game_pk order"""
+        if self._postings is None:
+            self._build_postings()
+        return self._postings.get(event_type, [])
+
+    def games_with(self, event_type):
+        return sorted({posting[0] for posting in self.events(event_type)})
+
+    def event_types(self):
+        if self._postings is None:
+            self._build_postings()
+        return list(self._postings)
+
+    def search(self, *words, event_type=None):
+        """Events whose description contains every one of words, optionally only of one event type"""
+        if not self.tokens:
+            raise ValueError("This season event index was built without the description token index")
+        if self._token_postings is None:
+            self._build_token_postings()
+        tokens = set()
+        for word in words:
+            tokens |= tokenize(word)
+        if not tokens:
+            return []
+        matches = None
+        for token in tokens:
+            token_matches = set(self._token_postings.get(token, []))
+            matches = token_matches if matches is None else matches & token_matches
+        if event_type is not None:
+            matches &= set(self.events(event_type))
+        return sorted(matches)
+
+    def write_event_stats(self, output_csv=SCRAPED_EVENT_STATS_CSV):
+        """Write how many scraped games each event type occurred in, in the layout of final_event_stats.csv"""
+        games_occurred = {event_type: len(self.games_with(event_type)) for event_type in self.event_types()}
+        write_event_stats_csv(games_occurred, len(self.games), output_csv)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    season_index = SeasonEventIndex.load_or_build("scraped_games")
+    season_index.write_event_stats(SCRAPED_EVENT_STATS_CSV)
@@ -1,9 +1,13 @@
 import csv
 from io import StringIO
-import pandas as pd
+import numpy as np
+
+STATCAST_CSV = 'helper_files/statcast_reduced2023.csv'
 
 
 def get_at_bat_summary_for_game(input_csv, game_id):
+    import pandas as pd
+
     # Create a CSV reader from the input string
     f = StringIO(input_csv)
     reader = csv.DictReader(f)
@@ -42,3 +46,57 @@ def get_at_bat_summary_for_game(input_csv, game_id):
     # Convert the modified CSV string to a pandas DataFrame
     return pd.read_csv(StringIO(modified_csv))
 
+
+class StatcastAtBats:
+    """The first pitch row of every Statcast at-bat, split by game once so each game is a dict lookup"""
+
+    def __init__(self, statcast_csv=STATCAST_CSV, game_pks=None):
+        import pandas as pd
+
+        at_bats = pd.read_csv(statcast_csv)
+        if game_pks is not None:
+            at_bats = at_bats[at_bats['game_pk'].isin(game_pks)]
+        at_bats = at_bats.sort_values(
+            ['game_pk', 'inning', 'at_bat_number', 'pitch_number']
+        ).drop_duplicates(
+            subset=['game_pk', 'inning', 'inning_topbot', 'at_bat_number'],
+            keep='first'
+        ).reset_index(drop=True)
+        self.by_game = dict(tuple(at_bats.groupby('game_pk', sort=False)))
+        self.no_at_bats = at_bats.iloc[0:0]
+
+    def for_game(self, game_pk):
+        return self.by_game.get(game_pk, self.no_at_bats)
+
+
+class AtBatSkeleton:
+    """
+    The runners on base at the start of every at-bat of a game, from its Statcast at-bat rows.
+    Built with one pass over the columns and keyed by (inning, half, at_bat_number), so each at-bat the replay
+    reaches is a dict lookup instead of a filter over the game's DataFrame. Like that filter, the first row of
+    an at-bat wins.
+    """
+
+    def __init__(self, at_bat_summary=None):
+        self.bases = {}
+        if at_bat_summary is None:
+            return
+        keys = zip(at_bat_summary['inning'].astype(str), at_bat_summary['inning_topbot'].astype(str),
+                   at_bat_summary['at_bat_number'].astype(str))
+        runners = at_bat_summary[['on_1b', 'on_2b', 'on_3b']].fillna(-1).to_numpy(dtype=np.int64).tolist()
+        for key, on_bases in zip(keys, runners):
+            self.bases.setdefault(key, tuple(on_bases))
+
+    def add_at_bat(self, row):
+        """Add one Statcast row given as a dict, e.g. as a live game comes in. Returns False if the at-bat was known."""
+        key = (str(int(row['inning'])), str(row['inning_topbot']), str(int(row['at_bat_number'])))
+        if key in self.bases:
+            return False
+        # Empty bases are NaN in the CSV and None or missing in a dict
+        self.bases[key] = tuple(-1 if row.get(base) is None or row.get(base) != row.get(base) else int(row[base])
+                                for base in ['on_1b', 'on_2b', 'on_3b'])
+        return True
+
+    def bases_at(self, inning, half, at_bat):
+        """(first, second, third) runner IDs with -1 for an empty base, None if Statcast doesn't have the at-bat"""
+        return self.bases.get((str(inning), str(half), str(at_bat)))
@@ -0,0 +1,88 @@
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+# The modules live at the top of the repo, one directory up
+REPO_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_DIR))
+
+URLS_CSV = REPO_DIR / "urls" / "gameday_urls2023.csv"
+SCRAPED_DIR = REPO_DIR / "scraped_games"
+# A few scraped games of the first days of the season
+GAME_PKS = [718767, 718768, 718769, 718770, 718772, 718774]
+STATCAST_COLUMNS = ['game_pk', 'inning', 'inning_topbot', 'at_bat_number', 'pitch_number', 'on_1b', 'on_2b', 'on_3b']
+# Every this many at-bats with runners, Statcast disagrees with the replay so the corrections have work to do
+ROTATE_EVERY = 7
+
+
+def derived_at_bats(game_data):
+    """
+    Statcast-like at-bat rows for a game, made from its own replay without Statcast since the real Statcast CSV
+    isn't in the repo. The runners of some at-bats are rotated a base on, which the replay has to be corrected for.
+    """
+    import pandas as pd
+    import main
+
+    decision_df = main.process_game(game_data, pd.DataFrame(columns=STATCAST_COLUMNS))
+    first_rows = decision_df[decision_df['At_Bat'].notna()].groupby('At_Bat', sort=False).head(1)
+    rows = []
+    with_runners = 0
+    for row in first_rows.itertuples():
+        on_bases = [row.First_Base, row.Second_Base, row.Third_Base]
+        if any(pd.notna(runner) for runner in on_bases):
+            with_runners += 1
+            if with_runners % ROTATE_EVERY == 0:
+                on_bases = on_bases[1:] + on_bases[:1]
+        rows.append([int(game_data.game_pk), int(row.Inning), row.Half, int(row.At_Bat), 1, *on_bases])
+    return pd.DataFrame(rows, columns=STATCAST_COLUMNS)
+
+
+@pytest.fixture(scope='session')
+def games():
+    """game_pk -> (GameData, derived Statcast at-bats) of GAME_PKS"""
+    import main
+
+    processor = main.GameProcessor(str(SCRAPED_DIR))
+    loaded = {}
+    for game_pk in GAME_PKS:
+        game_data = processor.load_game_data(str(game_pk))
+        loaded[game_pk] = (game_data, derived_at_bats(game_data))
+    return loaded
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch, games):
+    """
+    A directory to run create_dataset in: the scraped games of GAME_PKS copied into it, so the registry and the
+    play cache are built there, and their Statcast at-bats where create_dataset reads them from.
+    """
+    import pandas as pd
+    from statcast_at_bats import STATCAST_CSV
+
+    scraped_dir = tmp_path / "scraped_games"
+    scraped_dir.mkdir()
+    for game_pk in GAME_PKS:
+        shutil.copy(SCRAPED_DIR / f"game_{game_pk}.json", scraped_dir)
+    statcast_csv = tmp_path / STATCAST_CSV
+    statcast_csv.parent.mkdir(parents=True)
+    pd.concat([at_bats for _, at_bats in games.values()]).to_csv(statcast_csv, index=False)
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def run_dataset(workspace, name, **options):
+    """create_dataset over GAME_PKS into workspace/name, returns the games directory"""
+    import main
+
+    output_dir = workspace / name
+    main.create_dataset(len(GAME_PKS), str(URLS_CSV), game_ids=GAME_PKS, scraped_data_dir="scraped_games",
+                        output_dir=str(output_dir), stats_dir=str(output_dir / "events_data"),
+                        error_log_path=str(output_dir / "errors.log"), **options)
+    return output_dir
+
+
+def decision_files(games_dir):
+    """File name -> contents of every decision file in games_dir"""
+    return {path.name: path.read_bytes() for path in sorted(Path(games_dir).glob("game_*_decisions.csv"))}
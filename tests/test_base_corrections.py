@@ -0,0 +1,18 @@
+import pandas as pd
+
+import main
+from conftest import GAME_PKS, STATCAST_COLUMNS
+
+
+def test_vectorized_matches_inline(games):
+    corrected_games = 0
+    for game_pk in GAME_PKS:
+        game_data, at_bats = games[game_pk]
+        inline_df = main.process_game(game_data, at_bats, vectorized_corrections=False)
+        vectorized_df = main.process_game(game_data, at_bats, vectorized_corrections=True)
+        # Compared as written, the in-memory dtypes of empty cells can differ
+        assert inline_df.to_csv(index=False) == vectorized_df.to_csv(index=False), game_pk
+        uncorrected_df = main.process_game(game_data, pd.DataFrame(columns=STATCAST_COLUMNS))
+        corrected_games += inline_df.to_csv(index=False) != uncorrected_df.to_csv(index=False)
+    # The derived Statcast has runners on other bases, so the corrections must have changed some games
+    assert corrected_games > 0
@@ -0,0 +1,45 @@
+from itertools import product
+
+from base_state import ADVANCE_TABLE, BASES_TO_ADVANCE
+from event_handlers import move_existing_runners
+from game_state import BASE_BITS, Base, GameState
+
+RUNNERS = {Base.FIRST: 1, Base.SECOND: 2, Base.THIRD: None}
+
+
+def per_base_move_existing_runners(action, game_state):
+    """move_existing_runners as it was before ADVANCE_TABLE, one base at a time from 3rd"""
+    advance = BASES_TO_ADVANCE.get(action, 0)
+    if advance == 0:
+        return
+    for base in [Base.THIRD, Base.SECOND, Base.FIRST]:
+        runner_id = game_state.bases_occupied.get(base, -1)
+        if runner_id != -1:
+            new_base_index = base.value + advance
+            if new_base_index >= 4:
+                game_state.bases_occupied[base] = -1
+            else:
+                new_base = Base(new_base_index)
+                if game_state.bases_occupied.get(new_base, -1) == -1:
+                    game_state.bases_occupied[base] = -1
+                    game_state.bases_occupied[new_base] = runner_id
+
+
+def test_advance_table_matches_per_base_advancement():
+    for occupied, action in product(product([False, True], repeat=3), list(BASES_TO_ADVANCE) + ['strikes out']):
+        bases = {base: RUNNERS[base] if on else -1 for base, on in zip(Base, occupied)}
+        expected = GameState(bases_occupied=bases)
+        per_base_move_existing_runners(action, expected)
+        actual = GameState(bases_occupied=bases)
+        move_existing_runners(action, actual)
+        assert actual.bases_occupied.items() == expected.bases_occupied.items(), (bases, action)
+
+
+def test_advance_table_shape():
+    assert len(ADVANCE_TABLE) == 8
+    for mask, by_advance in enumerate(ADVANCE_TABLE):
+        assert by_advance[0] == ((), ())
+        for moves, blocked in by_advance[1:]:
+            # Every runner either moves or is blocked, exactly once
+            runners = sorted(base.value for base, _ in moves + blocked)
+            assert runners == sorted(base.value for base in Base if mask & BASE_BITS[base])
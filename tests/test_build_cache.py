@@ -0,0 +1,71 @@
+import json
+
+import build_cache
+from build_cache import MANIFEST_FILENAME, BuildCache, game_fingerprint
+from conftest import GAME_PKS, SCRAPED_DIR, run_dataset
+from player_registry import PlayerRegistry
+
+
+def test_fingerprint_changes_with_every_input(games, tmp_path, monkeypatch):
+    game_json = (SCRAPED_DIR / f"game_{GAME_PKS[0]}.json").read_bytes()
+    at_bats = games[GAME_PKS[0]][1]
+    registry = PlayerRegistry(tmp_path / "player_registry.json")
+    player_id = int(next(iter(json.loads(game_json)['home_player_map'])))
+    fingerprint = game_fingerprint(game_json, at_bats, registry)
+
+    # The same whether the JSON comes as bytes or text, with or without the parsed game
+    assert game_fingerprint(game_json.decode(), at_bats, registry, games[GAME_PKS[0]][0]) == fingerprint
+    changed = [
+        game_fingerprint(game_json.replace(b'"Top 1st"', b'"Top 1st "'), at_bats, registry),
+        game_fingerprint(game_json, at_bats.assign(on_1b=at_bats['on_1b'].shift(1)), registry),
+    ]
+    # A spelling of one of the game's players changes it, one of a player in other games doesn't
+    registry.add_spelling("somebody else", 1)
+    assert game_fingerprint(game_json, at_bats, registry) == fingerprint
+    registry.add_spelling("a new spelling", player_id)
+    changed.append(game_fingerprint(game_json, at_bats, registry))
+    monkeypatch.setattr(build_cache, 'PROCESSING_VERSION', build_cache.PROCESSING_VERSION + 1)
+    changed.append(game_fingerprint(game_json, at_bats, registry))
+    assert len({fingerprint, *changed}) == len(changed) + 1
+
+
+def test_freshness(tmp_path):
+    output_path = tmp_path / "game_1_decisions.csv"
+    cache = BuildCache(tmp_path)
+    cache.record(1, "abc")
+    assert not cache.is_fresh(1, "abc", output_path)
+    output_path.write_text("Event_Type\n")
+    assert cache.is_fresh(1, "abc", output_path)
+    assert not cache.is_fresh(1, "abd", output_path)
+    assert not cache.is_fresh(2, "abc", output_path)
+    cache.save()
+
+    cache = BuildCache(tmp_path)
+    assert cache.is_fresh(1, "abc", output_path)
+    cache.forget(1)
+    assert not cache.is_fresh(1, "abc", output_path)
+
+
+def written_times(games_dir):
+    return {path.name: path.stat().st_mtime_ns for path in games_dir.glob("game_*_decisions.csv")}
+
+
+def test_rerun_only_rebuilds_changed_games(workspace):
+    games_dir = run_dataset(workspace, "games")
+    first_run = written_times(games_dir)
+    assert len(first_run) == len(GAME_PKS)
+    manifest = json.loads((games_dir / MANIFEST_FILENAME).read_text())
+    assert sorted(manifest) == sorted(str(game_pk) for game_pk in GAME_PKS)
+
+    run_dataset(workspace, "games")
+    assert written_times(games_dir) == first_run
+
+    # A re-scraped game and a deleted output are the only ones processed again
+    changed_path = workspace / "scraped_games" / f"game_{GAME_PKS[1]}.json"
+    changed_path.write_text(json.dumps(json.loads(changed_path.read_text()), indent=1))
+    (games_dir / f"game_{GAME_PKS[2]}_decisions.csv").unlink()
+    run_dataset(workspace, "games")
+    third_run = written_times(games_dir)
+    rebuilt = {name for name in third_run if third_run[name] != first_run.get(name)}
+    assert rebuilt == {f"game_{GAME_PKS[1]}_decisions.csv", f"game_{GAME_PKS[2]}_decisions.csv"}
+    assert json.loads((games_dir / MANIFEST_FILENAME).read_text())[str(GAME_PKS[1])] != manifest[str(GAME_PKS[1])]
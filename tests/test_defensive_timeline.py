@@ -0,0 +1,63 @@
+import random
+
+import pandas as pd
+
+from conftest import GAME_PKS, URLS_CSV
+from defensive_timeline import (TeamTimeline, Timeline, build_game_timelines, find_alignment_disagreements,
+                                half_inning_ordinal)
+
+
+def test_timeline_matches_a_scan():
+    generator = random.Random(0)
+    entries = [(generator.randrange(18), player_id) for player_id in range(30)]
+    timeline = Timeline()
+    for ordinal, player_id in entries:
+        timeline.add(ordinal, player_id)
+
+    # In game order, an entry listed later in the same half-inning takes over from the earlier ones
+    in_order = sorted(entries, key=lambda entry: entry[0])
+    for ordinal in range(-1, 20):
+        held = [player_id for start, player_id in in_order if start <= ordinal]
+        assert timeline.at(ordinal) == (held[-1] if held else None)
+        came_in = {player_id for start, player_id in in_order if start == ordinal}
+        before = [player_id for start, player_id in in_order if start < ordinal]
+        assert timeline.candidates(ordinal) == came_in | set(before[-1:])
+
+
+def test_team_timeline():
+    team = TeamTimeline("10(Bot1)/11(Top7)",
+                        "2(Bot1)(c)-3(Bot1)(1b)-20(Top7)(lf)-7(Bot1)(lf)-21(Bot8)(dh)")
+
+    assert half_inning_ordinal(1, 'Top') == 0 and half_inning_ordinal(7, 'Bot') == 13
+    # Starters hold their roles from the first pitch, also for the team taking the field in the bottom half
+    assert team.pitcher_at(1, 'Top') == 10
+    assert team.pitcher_at(6, 'Bot') == 10
+    assert team.pitcher_at(7, 'Top') == 11
+    assert team.fielder_at('LF', 6, 'Bot') == 7
+    assert team.fielder_at('LF', 7, 'Top') == 20
+    assert team.fielder_at('SS', 9, 'Bot') is None
+    assert team.alignment_at(2, 'Top') == {'C': 2, '1B': 3, '2B': None, '3B': None, 'SS': None, 'LF': 7, 'CF': None,
+                                           'RF': None}
+    # Only fielding positions get a timeline
+    assert all(21 not in timeline.players for timeline in team.fielders.values())
+
+
+def test_alignment_disagreements(games):
+    import main
+
+    rows = pd.read_csv(URLS_CSV).set_index('game_pk', drop=False)
+    game_data, at_bats = games[GAME_PKS[0]]
+    decision_df = main.process_game(game_data, at_bats)
+    timelines = build_game_timelines(rows.loc[GAME_PKS[0]])
+    found = find_alignment_disagreements(decision_df, timelines)
+    assert list(found.columns) == ['Row', 'Column', 'Recorded', 'Expected']
+
+    # A fielder nobody listed for that half-inning is reported with who the timeline expected
+    row = len(decision_df) // 2
+    inning, half = decision_df['Inning'].iloc[row], decision_df['Half'].iloc[row]
+    changed = decision_df.copy()
+    changed.loc[changed.index[row], 'Home_SS'] = -1
+    with_change = find_alignment_disagreements(changed, timelines)
+    added = pd.concat([with_change, found]).drop_duplicates(keep=False)
+    assert added.to_dict('records') == [{'Row': int(decision_df.index[row]), 'Column': 'Home_SS', 'Recorded': -1,
+                                         'Expected': timelines['home'].fielder_at('SS', inning, half)}]
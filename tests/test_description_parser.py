@@ -0,0 +1,57 @@
+import pandas as pd
+
+import description_parser
+import main
+from conftest import GAME_PKS, STATCAST_COLUMNS
+from description_parser import PlayRecord, parse_play
+
+
+def test_runner_plays():
+    assert parse_play("Wild pitch by pitcher Kodai Senga. Paul Goldschmidt to 3rd. Willson Contreras to 2nd.") == \
+        PlayRecord(None, 'wild pitch', (('Paul Goldschmidt', '3rd'), ('Willson Contreras', '2nd')))
+    assert parse_play("Passed ball by catcher Keibert Ruiz. Ronald Acuna Jr. to 2nd.") == \
+        PlayRecord(None, 'passed ball', (('Ronald Acuna Jr.', '2nd'),))
+    assert parse_play("With Marcus Semien batting, Ezequiel Duran scores on a balk. "
+                      "Josh H. Smith advances to 2nd on a balk.") == \
+        PlayRecord(None, 'balk', (('Ezequiel Duran', 'scores'), ('Josh H. Smith', '2nd')))
+    # Challenged plays are parsed from what the call ended up as, a throwing error isn't a runner movement
+    assert parse_play("Marlins challenged (tag play), call on the field was overturned: Passed ball by catcher "
+                      "Tyler Stephenson. Joey Wendle scores. Throwing error by catcher Tyler Stephenson.") == \
+        PlayRecord(None, 'passed ball', (('Joey Wendle', 'scores'),))
+
+
+def test_batter_plays_are_not_runner_plays():
+    play = parse_play("Matt Olson doubles (3) on a line drive to left fielder Steven Kwan. Ronald Acuna Jr. scores.")
+    assert play.batter == "Matt Olson"
+    assert play.action == "doubles"
+
+
+def test_play_cache_covers_runner_plays(games, tmp_path, monkeypatch):
+    monkeypatch.setattr(description_parser, '_play_cache', {})
+    monkeypatch.setattr(description_parser, '_new_plays', {})
+    monkeypatch.setattr(description_parser, '_play_cache_dirty', False)
+    parsed = []
+    parse = description_parser.parse_play
+
+    def counting_parse(description):
+        parsed.append(description)
+        return parse(description)
+
+    monkeypatch.setattr(description_parser, 'parse_play', counting_parse)
+    for game_pk in GAME_PKS:
+        main.process_game(games[game_pk][0], pd.DataFrame(columns=STATCAST_COLUMNS))
+    assert len(parsed) == len(set(parsed))
+    runner_plays = {description: play for description, play in description_parser._play_cache.items()
+                    if play is not None and play.batter is None}
+    assert {play.action for play in runner_plays.values()} >= {'wild pitch'}
+
+    # Saved and loaded back, nothing has to be parsed again
+    description_parser.save_play_cache(tmp_path)
+    saved = dict(description_parser._play_cache)
+    description_parser.clear_play_cache()
+    description_parser.load_play_cache(tmp_path)
+    assert description_parser._play_cache == saved
+    parsed.clear()
+    for game_pk in GAME_PKS:
+        main.process_game(games[game_pk][0], pd.DataFrame(columns=STATCAST_COLUMNS))
+    assert parsed == []
@@ -0,0 +1,31 @@
+import main
+from conftest import GAME_PKS
+
+
+def test_interned_codes_dispatch_like_the_event_lists(games):
+    for game_pk in GAME_PKS:
+        for inning in games[game_pk][0].game_summary:
+            events = inning['events']
+            for event, code in zip(events, main.intern_event_types(events)):
+                event_type = event['type']
+                assert main.event_type_codes[event_type] == code
+                dispatch = main.event_dispatch[code]
+                handler = main.event_handlers.get(event_type)
+                assert dispatch.handler is (handler or main.event_handlers['AttemptBaseUpdate'])
+                assert dispatch.is_generic == (handler is None)
+                assert dispatch.is_decision == (event_type in main.decision_events)
+                assert dispatch.needs_verification == (event_type in main.possible_decision_events)
+                assert dispatch.is_caught_stealing == (event_type in main.caught_stealing_events)
+                assert dispatch.bases_only == (event_type not in main.substitution_events)
+
+    # A type is only interned once, however many games it shows up in
+    assert len(main.event_dispatch) == len(main.event_type_codes)
+    assert sorted(main.event_type_codes.values()) == list(range(len(main.event_dispatch)))
+
+
+def test_new_types_get_the_generic_handler(monkeypatch):
+    monkeypatch.setattr(main, 'event_type_codes', {})
+    monkeypatch.setattr(main, 'event_dispatch', [])
+    code, = main.intern_event_types([{'type': 'Some Future Event'}])
+    assert main.event_dispatch[code].is_generic
+    assert main.intern_event_types([{'type': 'Some Future Event'}] * 2) == [code, code]
@@ -0,0 +1,50 @@
+import json
+from collections import Counter
+
+from conftest import GAME_PKS, SCRAPED_DIR, run_dataset
+from event_stats import EventStats
+
+
+def scraped_counts(game_pk):
+    with open(SCRAPED_DIR / f"game_{game_pk}.json") as f:
+        game_summary = json.load(f)['game_summary']
+    return Counter(event['type'] for inning in game_summary for event in inning['events'])
+
+
+def test_stats_collected_while_processing_match_the_scraped_games(workspace):
+    games_dir = run_dataset(workspace, "games")
+    stats = EventStats.load_dir(games_dir / "events_data")
+
+    assert stats.game_counts == {game_pk: dict(scraped_counts(game_pk)) for game_pk in GAME_PKS}
+    assert stats.event_frequency() == sum((scraped_counts(game_pk) for game_pk in GAME_PKS), Counter())
+    games_occurred = Counter(event_type for game_pk in GAME_PKS for event_type in scraped_counts(game_pk))
+    assert stats.games_occurred() == dict(games_occurred)
+
+    # Most common first, ties by name
+    expected_lines = ["Event Type,Games Occurred,Percentage of Games"] + [
+        f"{event_type},{games},{games / len(GAME_PKS) * 100:.2f}%"
+        for event_type, games in sorted(games_occurred.items(), key=lambda item: (-item[1], item[0]))] + [""]
+    assert (games_dir / "events_data" / "final_event_stats.csv").read_bytes().decode().split("\r\n") == expected_lines
+
+
+def test_merge_and_replace(tmp_path):
+    def stats_in(name):
+        return EventStats(tmp_path / name / "game_events_results.csv", tmp_path / name / "event_counts.json",
+                          tmp_path / name / "final_event_stats.csv")
+
+    whole, first_half, second_half = stats_in("whole"), stats_in("first"), stats_in("second")
+    for index, game_pk in enumerate(GAME_PKS):
+        whole.add_game(game_pk, scraped_counts(game_pk))
+        (first_half if index < 3 else second_half).add_game(game_pk, scraped_counts(game_pk))
+    first_half.merge(second_half)
+    assert first_half.game_counts == whole.game_counts
+    assert first_half.games_occurred() == whole.games_occurred()
+
+    # Reprocessing a game replaces its counts, saving and loading keeps them
+    whole.add_game(GAME_PKS[0], {'Balk': 2})
+    whole.save()
+    loaded = EventStats.load(tmp_path / "whole" / "game_events_results.csv", tmp_path / "whole" / "event_counts.json",
+                             tmp_path / "whole" / "final_event_stats.csv")
+    assert loaded.game_counts[GAME_PKS[0]] == {'Balk': 2}
+    assert loaded.games_occurred()['Balk'] == 1
+    assert loaded.event_frequency() == whole.event_frequency()
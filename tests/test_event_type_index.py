@@ -0,0 +1,63 @@
+import json
+import shutil
+
+import main
+from conftest import GAME_PKS, REPO_DIR, SCRAPED_DIR, URLS_CSV, run_dataset
+from event_type_index import GAME_EVENTS_CSV, EventTypeIndex
+
+
+def game_event_types(game_pk):
+    with open(SCRAPED_DIR / f"game_{game_pk}.json") as f:
+        game_summary = json.load(f)['game_summary']
+    return list(dict.fromkeys(event['type'] for inning in game_summary for event in inning['events']))
+
+
+def test_games_with_matches_brute_force(tmp_path):
+    index = EventTypeIndex(tmp_path / "game_events_results.csv")
+    types_by_game = {game_pk: game_event_types(game_pk) for game_pk in GAME_PKS}
+    for game_pk, event_types in types_by_game.items():
+        index.update_game(game_pk, event_types)
+    # A re-processed game replaces its own types
+    types_by_game[GAME_PKS[0]] = ['Balk', 'Single']
+    index.update_game(GAME_PKS[0], ['Balk', 'Single'])
+
+    all_types = {event_type for event_types in types_by_game.values() for event_type in event_types}
+    for event_type in all_types:
+        assert index.games_with([event_type]) == sorted(game_pk for game_pk, event_types in types_by_game.items()
+                                                        if event_type in event_types), event_type
+    assert index.games_with(['Balk', 'Intent Walk']) == sorted(
+        game_pk for game_pk, event_types in types_by_game.items() if {'Balk', 'Intent Walk'} & set(event_types))
+    assert sorted(index.event_types()) == sorted(all_types)
+
+
+def test_save_keeps_the_file_layout(tmp_path):
+    path = tmp_path / "game_events_results.csv"
+    shutil.copy(REPO_DIR / GAME_EVENTS_CSV, path)
+    original = path.read_bytes().split(b"\r\n")
+    index = EventTypeIndex.load(path)
+    index.update_game(GAME_PKS[0], ['Balk', 'Single'])
+    index.save()
+
+    saved = path.read_bytes().split(b"\r\n")
+    changed = [line for line, original_line in zip(saved, original) if line != original_line]
+    assert len(saved) == len(original)
+    assert changed == [f"{GAME_PKS[0]},Balk,Single".encode()]
+    assert EventTypeIndex.load(path).game_types == index.game_types
+
+
+def test_reprocess_only_games_with_the_types(workspace):
+    games_dir = run_dataset(workspace, "games")
+    written = {path.name: path.stat().st_mtime_ns for path in games_dir.glob("game_*_decisions.csv")}
+    index_csv = games_dir / "events_data" / "game_events_results.csv"
+
+    assert main.resolve_event_types(['handle_wild_pitch', 'Intent Walk'], EventTypeIndex.load(index_csv)) == \
+        {'Wild Pitch', 'Intent Walk'}
+    game_ids = main.reprocess_event_types(['handle_wild_pitch', 'Intent Walk'], str(URLS_CSV), index_csv=index_csv,
+                                          scraped_data_dir="scraped_games", output_dir=str(games_dir),
+                                          stats_dir=str(games_dir / "events_data"),
+                                          error_log_path=str(games_dir / "errors.log"))
+    expected = [game_pk for game_pk in GAME_PKS if {'Wild Pitch', 'Intent Walk'} & set(game_event_types(game_pk))]
+    assert game_ids == expected and len(expected) < len(GAME_PKS)
+    rewritten = sorted(int(path.name.split('_')[1]) for path in games_dir.glob("game_*_decisions.csv")
+                       if path.stat().st_mtime_ns != written[path.name])
+    assert rewritten == expected
@@ -0,0 +1,56 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import GAME_PKS, run_dataset
+from feature_export import VOCABULARY_FILENAME, DecisionFeatures, export_features
+from game_state import PLAYER_COLUMNS
+
+
+def test_export_round_trip(workspace):
+    games_dir = run_dataset(workspace, "games")
+    features_dir = workspace / "features"
+    rows = export_features(games_dir, features_dir)
+    features = DecisionFeatures(features_dir)
+
+    assert len(features) == rows
+    assert features.game_pks.tolist() == sorted(GAME_PKS)
+    assert isinstance(features.players, np.memmap)
+    for game_pk in GAME_PKS:
+        decision_df = pd.read_csv(games_dir / f"game_{game_pk}_decisions.csv")
+        game_rows = features.game_rows(game_pk)
+        assert game_rows.stop - game_rows.start == len(decision_df)
+        assert (features.players[game_rows] == decision_df[PLAYER_COLUMNS].fillna(-1).to_numpy()).all()
+        assert features.state[game_rows][:, 0].tolist() == decision_df['Inning'].tolist()
+        assert features.state[game_rows][:, 1].tolist() == (decision_df['Half'] == 'Bot').astype(int).tolist()
+        assert features.state[game_rows][:, 4].tolist() == decision_df['Outs'].tolist()
+        assert [features.event_types[code] for code in features.event_codes[game_rows]] == \
+            decision_df['Event_Type'].tolist()
+        assert features.is_decision[game_rows].tolist() == decision_df['Is_Decision'].astype(int).tolist()
+
+    assert features.rows(GAME_PKS[:2]).tolist() == list(range(features.game_rows(GAME_PKS[0]).start,
+                                                                 features.game_rows(GAME_PKS[1]).stop))
+    assert features.rows([]).size == 0
+    with pytest.raises(KeyError):
+        features.game_rows(1)
+
+
+def test_export_keeps_the_vocabulary(workspace):
+    games_dir = run_dataset(workspace, "games")
+    features_dir = workspace / "features"
+    features_dir.mkdir()
+    (features_dir / VOCABULARY_FILENAME).write_text(json.dumps({'event_types': ['Earlier Type', 'Strikeout']}))
+
+    export_features(games_dir, features_dir, game_pks=GAME_PKS[:1])
+    event_types = DecisionFeatures(features_dir).event_types
+    # Codes of the earlier export stay, new types come after them
+    assert event_types[:2] == ['Earlier Type', 'Strikeout']
+    assert len(event_types) == len(set(event_types))
+
+    export_features(games_dir, features_dir)
+    features = DecisionFeatures(features_dir)
+    assert features.event_types[:len(event_types)] == event_types
+    assert features.game_pks.tolist() == sorted(GAME_PKS)
+    assert features.event_code('Earlier Type') == 0
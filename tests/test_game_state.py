@@ -0,0 +1,64 @@
+import pytest
+
+from game_state import DECISION_COLUMNS, EMPTY, MISSING, Base, FieldPosition, GameState, Half
+
+
+def game_state():
+    return GameState('ATL', 'WSH', home_lineup=list(range(101, 110)), away_lineup=list(range(201, 210)),
+                     home_pitcher=100, away_pitcher=200,
+                     home_position_players={FieldPosition.CATCHER: 102, FieldPosition.SHORTSTOP: 105},
+                     away_position_players={FieldPosition.CATCHER: None})
+
+
+def test_decision_point_is_laid_out_like_the_columns():
+    state = game_state()
+    state.update(inning=3, half=Half.BOTTOM, score_home=2, score_away=5, outs=1, at_bat=17)
+    state.bases_occupied[Base.SECOND] = 204
+    state.bases_occupied[Base.THIRD] = None
+    row = dict(zip(DECISION_COLUMNS, state.create_decision_point({'type': 'Single'}, False)))
+
+    assert len(row) == len(DECISION_COLUMNS)
+    assert (row['Event_Type'], row['Is_Decision'], row['Inning'], row['Half'], row['At_Bat']) == \
+        ('Single', False, 3, 'Bot', 17)
+    assert (row['Score_Deficit'], row['Outs']) == (-3, 1)
+    assert (row['First_Base'], row['Second_Base'], row['Third_Base']) == (EMPTY, 204, MISSING)
+    assert (row['Home_Pitcher'], row['Away_Pitcher']) == (100, 200)
+    assert [row[f"Home_Lineup_{i}"] for i in range(1, 10)] == list(range(101, 110))
+    assert [row[f"Away_Lineup_{i}"] for i in range(1, 10)] == list(range(201, 210))
+    assert (row['Home_C'], row['Home_SS'], row['Away_C'], row['Home_1B']) == (102, 105, MISSING, MISSING)
+
+
+def test_views_write_through_and_snapshots_do_not():
+    state = game_state()
+    before = state.create_decision_point({'type': 'Single'}, False)
+    state.home_lineup[0] = 150
+    state.away_position_players[FieldPosition.CATCHER] = 250
+    state.bases_occupied[Base.FIRST] = 203
+
+    assert state.home_lineup[0] == 150 and list(state.home_lineup)[1:] == list(range(102, 110))
+    assert state.get_position_player('away', FieldPosition.CATCHER) == 250
+    assert state.away_position_players[FieldPosition.FIRST_BASE] is None
+    assert state.create_decision_point({'type': 'Single'}, False) != before
+    assert before == game_state().create_decision_point({'type': 'Single'}, False)
+
+
+def test_bases():
+    state = game_state()
+    assert state.occupied_mask() == 0
+    state.bases_occupied[Base.FIRST] = 201
+    # A runner we have no ID for still takes up the base
+    state.bases_occupied[Base.THIRD] = None
+    assert state.occupied_mask() == 0b101
+    assert state.runner_base(201) == Base.FIRST
+    assert state.runner_base(None) == Base.THIRD
+    assert state.runner_base(202) is None
+    state.empty_bases()
+    assert state.occupied_mask() == 0 and state.bases_occupied.values() == [EMPTY] * 3
+
+
+def test_lineups_have_nine_players():
+    with pytest.raises(ValueError, match="8 players"):
+        GameState(home_lineup=list(range(8)))
+    state = game_state()
+    with pytest.raises(ValueError):
+        state.away_lineup = list(range(10))
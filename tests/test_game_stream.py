@@ -0,0 +1,47 @@
+import main
+from conftest import GAME_PKS
+from game_stream import GameStream
+
+
+def stream_game(game_data, at_bats):
+    """Push every event of a game with each at-bat's Statcast rows arriving with its first event"""
+    rows_by_at_bat = {}
+    for row in at_bats.to_dict('records'):
+        rows_by_at_bat.setdefault(row['at_bat_number'], []).append(row)
+
+    stream = GameStream.from_game_data(game_data)
+    emitted = []
+    updates = 0
+    for inning in game_data.game_summary:
+        for event in inning['events']:
+            rows = rows_by_at_bat.pop(event['atbat_index'], None)
+            for record in stream.push(event, inning['inning'], at_bats=rows):
+                if record.update:
+                    emitted[record.index] = record.row
+                    updates += 1
+                else:
+                    assert record.index == len(emitted)
+                    emitted.append(record.row)
+    return stream, emitted, updates
+
+
+def test_stream_matches_batch(games):
+    total_updates = 0
+    for game_pk in GAME_PKS:
+        game_data, at_bats = games[game_pk]
+        batch_df = main.process_game(game_data, at_bats)
+        stream, emitted, updates = stream_game(game_data, at_bats)
+        assert stream.decision_df().equals(batch_df), game_pk
+        # What a consumer applying the update records ends up with
+        assert main.build_decision_df(emitted).equals(batch_df), game_pk
+        total_updates += updates
+    # The derived Statcast disagrees with some at-bats, so corrections have to have come through as updates
+    assert total_updates > 0
+
+
+def test_stream_with_all_at_bats_up_front(games):
+    game_data, at_bats = games[GAME_PKS[0]]
+    stream = GameStream.from_game_data(game_data, at_bats=at_bats)
+    for inning in game_data.game_summary:
+        stream.push_many(inning['events'], inning['inning'])
+    assert stream.decision_df().equals(main.process_game(game_data, at_bats))
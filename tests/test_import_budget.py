@@ -0,0 +1,18 @@
+import pytest
+
+from check_import_budget import IMPORT_BUDGETS, REPO_DIR, check_first_game, check_import
+from statcast_at_bats import STATCAST_CSV
+
+FIRST_GAME = 718768
+
+
+@pytest.mark.parametrize('module', IMPORT_BUDGETS)
+def test_import_loads_nothing_forbidden(module):
+    # Only what gets imported, the time budgets are checked by running check_import_budget.py
+    _, forbidden = IMPORT_BUDGETS[module]
+    assert check_import(module, None, forbidden) == []
+
+
+@pytest.mark.skipif(not (REPO_DIR / STATCAST_CSV).exists(), reason="needs the Statcast CSV")
+def test_first_game_is_written():
+    assert check_first_game(FIRST_GAME, budget=None) == []
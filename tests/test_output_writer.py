@@ -0,0 +1,52 @@
+import pandas as pd
+import pytest
+
+from output_writer import OutputWriter
+
+
+class BrokenFrame:
+    """Writes part of a file and then fails, like a full disk"""
+
+    def to_csv(self, path, index=False):
+        with open(path, 'w') as f:
+            f.write("Event_Type,Is_Decision\nSingle,")
+        raise OSError("No space left on device")
+
+
+def decision_df(event_type):
+    return pd.DataFrame({'Event_Type': [event_type, 'Walk'], 'Is_Decision': [False, True]})
+
+
+@pytest.mark.parametrize('background', [True, False])
+def test_submitted_games_are_written(tmp_path, background):
+    writer = OutputWriter(tmp_path, background=background)
+    written = []
+    for game_pk in [1, 2, 3]:
+        writer.submit(game_pk, decision_df('Single'), on_written=lambda game_pk=game_pk: written.append(
+            (game_pk, writer.output_path(game_pk).exists())))
+    writer.close()
+    assert written == [(1, True), (2, True), (3, True)]
+    assert writer.errors == []
+    assert writer.output_path(2).read_text() == decision_df('Single').to_csv(index=False)
+    assert sorted(path.name for path in tmp_path.iterdir()) == [f"game_{game_pk}_decisions.csv"
+                                                                 for game_pk in [1, 2, 3]]
+
+
+@pytest.mark.parametrize('background', [True, False])
+def test_failed_write_keeps_the_previous_file(tmp_path, background):
+    writer = OutputWriter(tmp_path, background=background)
+    writer.write(1, decision_df('Single'))
+    written = []
+    writer.submit(1, BrokenFrame(), on_written=lambda: written.append(1))
+    writer.close()
+
+    assert written == []
+    assert writer.errors == [(1, "No space left on device")]
+    # The old file is still there whole, and no temp file is left behind
+    assert writer.output_path(1).read_text() == decision_df('Single').to_csv(index=False)
+    assert [path.name for path in tmp_path.iterdir()] == ["game_1_decisions.csv"]
+
+
+def test_unknown_format(tmp_path):
+    with pytest.raises(ValueError, match="Unknown output format"):
+        OutputWriter(tmp_path, 'xlsx')
@@ -0,0 +1,33 @@
+import json
+
+import description_parser
+from conftest import GAME_PKS, decision_files, run_dataset
+
+
+def test_workers_match_sequential(workspace):
+    sequential_dir = run_dataset(workspace, "sequential")
+    parallel_dir = run_dataset(workspace, "parallel", workers=2)
+
+    sequential_files = decision_files(sequential_dir)
+    assert len(sequential_files) == len(GAME_PKS)
+    assert decision_files(parallel_dir) == sequential_files
+    with open(parallel_dir / "build_manifest.json") as f, open(sequential_dir / "build_manifest.json") as g:
+        assert json.load(f) == json.load(g)
+    # Workers finish in any order, so the stats only have to have the same contents
+    parallel_stats, sequential_stats = parallel_dir / "events_data", sequential_dir / "events_data"
+    with open(parallel_stats / "event_counts.json") as f, open(sequential_stats / "event_counts.json") as g:
+        assert json.load(f) == json.load(g)
+    for name in ["game_events_results.csv", "final_event_stats.csv"]:
+        assert (sorted((parallel_stats / name).read_text().splitlines())
+                == sorted((sequential_stats / name).read_text().splitlines()))
+    assert not (parallel_dir / "errors.log").exists()
+
+
+def test_workers_hand_back_parsed_plays(workspace, monkeypatch):
+    # Start from nothing parsed, the workers inherit that and the parent only has what they hand back
+    monkeypatch.setattr(description_parser, '_play_cache', {})
+    monkeypatch.setattr(description_parser, '_play_cache_dirty', False)
+    run_dataset(workspace, "parallel", workers=2)
+    with open(workspace / "scraped_games" / "parsed_plays.json") as f:
+        plays = json.load(f)['plays']
+    assert len(plays) > 100
@@ -0,0 +1,31 @@
+import json
+
+import pandas as pd
+import pytest
+
+from build_cache import MANIFEST_FILENAME
+from conftest import GAME_PKS, URLS_CSV, decision_files, run_dataset
+from pipeline import ProcessingPipeline
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_pipeline_matches_sequential(workspace, workers):
+    sequential_dir = run_dataset(workspace, "sequential")
+
+    pipeline_dir = workspace / "pipeline"
+    rows = pd.read_csv(URLS_CSV).set_index('game_pk', drop=False).loc[GAME_PKS]
+    pipeline = ProcessingPipeline(str(URLS_CSV), "scraped_games", workers=workers, output_dir=str(pipeline_dir),
+                                  stats_dir=str(pipeline_dir / "events_data"),
+                                  error_log_path=str(pipeline_dir / "errors.log"), queue_size=2, game_pks=GAME_PKS)
+    for index, (_, row) in enumerate(rows.iterrows()):
+        # Freshly scraped games come with the JSON they were saved as, games scraped before are read from disk
+        game_json = (workspace / "scraped_games" / f"game_{row['game_pk']}.json").read_text() if index % 2 else None
+        pipeline.submit(row, game_json)
+    pipeline.close()
+
+    assert pipeline.processed_games == len(GAME_PKS)
+    assert not pipeline.error_log
+    assert decision_files(pipeline_dir) == decision_files(sequential_dir)
+    # Games handed over in memory are fingerprinted the same as when read from disk
+    manifest = json.loads((pipeline_dir / MANIFEST_FILENAME).read_text())
+    assert manifest == json.loads((sequential_dir / MANIFEST_FILENAME).read_text())
@@ -0,0 +1,40 @@
+import difflib
+
+import pandas as pd
+
+import main
+from conftest import GAME_PKS, STATCAST_COLUMNS
+from event_handlers import PlayerIndex, process_name
+
+
+def test_last_name_and_fuzzy_resolution():
+    index = PlayerIndex({1: "Luis Garcia", 2: "Luis Robert Jr.", 3: "Will Smith", 4: "Dominic Smith",
+                         5: "Ha-Seong Kim"})
+    assert index.resolve("Luis Robert") == 2
+    assert index.resolve("Luis Garcia Jr.") == 1
+    assert index.resolve("Ha-seong Kim") == 5
+    assert index.resolve("Will D. Smith") == 3
+    assert index.resolve("Nobody Atall") is None
+
+
+def test_resolution_matches_full_fuzzy_scan(games, monkeypatch):
+    """Every name the replay of the test games resolves gets the player difflib picks from the whole roster"""
+    resolved = []
+    resolve = PlayerIndex.resolve
+
+    def recording_resolve(index, player_name):
+        player_id = resolve(index, player_name)
+        resolved.append((index, player_name, player_id))
+        return player_id
+
+    monkeypatch.setattr(PlayerIndex, 'resolve', recording_resolve)
+    for game_pk in GAME_PKS:
+        main.process_game(games[game_pk][0], pd.DataFrame(columns=STATCAST_COLUMNS))
+
+    fuzzy_matched = 0
+    for index, player_name, player_id in resolved:
+        processed_name = process_name(player_name)
+        matches = difflib.get_close_matches(processed_name, index.names_list, n=1, cutoff=0.6)
+        assert player_id == (index.reversed_player_map[matches[0]] if matches else None), player_name
+        fuzzy_matched += processed_name not in index.reversed_player_map
+    assert fuzzy_matched > 0
@@ -0,0 +1,58 @@
+from collections import defaultdict
+
+import pandas as pd
+
+from conftest import run_dataset
+from game_state import PLAYER_COLUMNS
+from player_postings import BASE_ROLES, PITCHER_ROLES, ROLE_CODES, PlayerPostings
+
+
+def brute_force_postings(games_dir):
+    """player ID -> every (game_pk, row, role) they appear in, read straight from the decision files"""
+    postings = defaultdict(set)
+    for path in games_dir.glob("game_*_decisions.csv"):
+        game_pk = int(path.name.split('_')[1])
+        decision_df = pd.read_csv(path)
+        for role in PLAYER_COLUMNS:
+            for row, player_id in decision_df[role].items():
+                if pd.notna(player_id) and player_id > 0:
+                    postings[int(player_id)].add((game_pk, row, ROLE_CODES[role]))
+    return postings
+
+
+def found(postings, player_id, roles=None):
+    game_pks, rows, player_roles = postings.find(player_id, roles)
+    return set(zip(game_pks.tolist(), rows.tolist(), player_roles.tolist()))
+
+
+def test_postings_match_brute_force(workspace):
+    games_dir = run_dataset(workspace, "games")
+    expected = brute_force_postings(games_dir)
+    # The index create_dataset kept up to date, and one built from the written files
+    for postings in [PlayerPostings.load_dir(games_dir), PlayerPostings.build(games_dir)]:
+        for player_id, player_postings in expected.items():
+            assert found(postings, player_id) == player_postings, player_id
+        assert found(postings, 1) == set()
+
+
+def test_find_together_matches_brute_force(workspace):
+    games_dir = run_dataset(workspace, "games")
+    expected = brute_force_postings(games_dir)
+    postings = PlayerPostings.load_dir(games_dir)
+    pitcher_codes = {ROLE_CODES[role] for role in PITCHER_ROLES}
+    base_codes = {ROLE_CODES[role] for role in BASE_ROLES}
+    pitchers = {player_id for player_id, player_postings in expected.items()
+                if any(role in pitcher_codes for _, _, role in player_postings)}
+    runners = {player_id for player_id, player_postings in expected.items()
+               if any(role in base_codes for _, _, role in player_postings)}
+
+    pairs_with_postings = 0
+    for pitcher in sorted(pitchers)[:5]:
+        pitching = {(game_pk, row) for game_pk, row, role in expected[pitcher] if role in pitcher_codes}
+        for runner in sorted(runners):
+            on_base = {(game_pk, row) for game_pk, row, role in expected[runner] if role in base_codes}
+            game_pks, rows = postings.find_together(pitcher, runner, PITCHER_ROLES, BASE_ROLES)
+            together = set(zip(game_pks.tolist(), rows.tolist()))
+            assert together == pitching & on_base, (pitcher, runner)
+            pairs_with_postings += bool(together)
+    assert pairs_with_postings > 0
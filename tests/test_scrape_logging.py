@@ -0,0 +1,60 @@
+import logging
+import queue
+import sys
+
+from scrape_logging import CompactQueueHandler, SamplingFilter, setup_queued_logging, stop_queued_logging
+
+
+def log_record(msg, *args, **fields):
+    return logging.makeLogRecord({'name': 'scraper', 'levelno': logging.INFO, 'levelname': 'INFO', 'msg': msg,
+                                  'args': args, **fields})
+
+
+def test_sampling_filter():
+    sampling = SamplingFilter(sample_every=3)
+    untagged = [sampling.filter(log_record("error")) for _ in range(5)]
+    tagged = [sampling.filter(log_record("routine", sample='sub')) for _ in range(7)]
+    other = [sampling.filter(log_record("routine", sample='outs')) for _ in range(2)]
+    assert untagged == [True] * 5
+    assert tagged == [True, False, False, True, False, False, True]
+    assert other == [True, False]
+
+
+def test_prepare_keeps_plain_arguments_and_formats_the_rest():
+    handler = CompactQueueHandler(queue.SimpleQueue())
+
+    plain = handler.prepare(log_record("Game %s scraped in %.2f seconds", 718768, 1.5, sample='scraped'))
+    assert (plain.msg, plain.args) == ("Game %s scraped in %.2f seconds", (718768, 1.5))
+    assert plain.sample == 'scraped'
+    assert plain.getMessage() == "Game 718768 scraped in 1.50 seconds"
+
+    # A list could change before the listener gets to it, so the message is formatted right away
+    lineup = [1, 2]
+    mutable = handler.prepare(log_record("Lineup %s", lineup))
+    lineup.append(3)
+    assert (mutable.msg, mutable.args) == ("Lineup [1, 2]", ())
+
+    try:
+        raise ValueError("no outs element")
+    except ValueError:
+        failed = handler.prepare(log_record("Failed", exc_info=sys.exc_info()))
+    assert failed.exc_info is None
+    assert "ValueError: no outs element" in failed.exc_text
+
+
+def test_listener_writes_the_log_file(tmp_path):
+    log_file = tmp_path / "scraper.log"
+    root = logging.getLogger()
+    level = root.level
+    try:
+        listener = setup_queued_logging(log_file, sample_every=2)
+        assert setup_queued_logging(log_file) is listener
+        for index in range(3):
+            logging.info("Substitution %s", index, extra={'sample': 'sub'})
+        logging.warning("Failed to scrape game %s", 718768)
+    finally:
+        stop_queued_logging()
+        root.setLevel(level)
+    assert not any(isinstance(handler, CompactQueueHandler) for handler in root.handlers)
+    lines = [line.split(' - ', 1)[1] for line in log_file.read_text().splitlines()]
+    assert lines == ["Substitution 0", "Substitution 2", "Failed to scrape game 718768"]
@@ -0,0 +1,23 @@
+import json
+
+from conftest import GAME_PKS, SCRAPED_DIR
+from season_event_index import SeasonEventIndex
+
+
+def test_postings_point_at_their_events(tmp_path):
+    index = SeasonEventIndex(tmp_path / "season_event_index.json", tokens=True)
+    game_summaries = {}
+    for game_pk in GAME_PKS:
+        with open(SCRAPED_DIR / f"game_{game_pk}.json") as f:
+            game_summaries[game_pk] = json.load(f)['game_summary']
+        index.update_game(game_pk, game_summaries[game_pk])
+
+    for event_type in index.event_types():
+        for game_pk, half_inning_index, ordinal, atbat_index in index.events(event_type):
+            event = game_summaries[game_pk][half_inning_index]['events'][ordinal]
+            assert (event['type'], event['atbat_index']) == (event_type, atbat_index)
+
+    wild_pitches = index.search("wild", "pitch")
+    assert wild_pitches
+    for game_pk, half_inning_index, ordinal, _ in wild_pitches:
+        assert "wild pitch" in game_summaries[game_pk][half_inning_index]['events'][ordinal]['description'].lower()
@@ -0,0 +1,56 @@
+import pandas as pd
+import pytest
+
+from conftest import GAME_PKS, STATCAST_COLUMNS
+from statcast_at_bats import AtBatSkeleton, StatcastAtBats
+
+
+@pytest.mark.parametrize('game_pk', GAME_PKS)
+def test_statcast_first_matches_the_full_replay(games, game_pk):
+    import main
+
+    game_data, at_bats = games[game_pk]
+    full = main.process_game(game_data, at_bats)
+    statcast_first = main.process_game(game_data, at_bats, statcast_first=True)
+    assert statcast_first.to_csv() == full.to_csv()
+
+
+def test_statcast_at_bats_for_game(tmp_path):
+    rows = [
+        [1, 1, 'Top', 2, 2, None, None, None],
+        [1, 1, 'Top', 1, 1, None, None, None],
+        [1, 1, 'Top', 2, 1, 100.0, None, None],
+        [2, 1, 'Top', 1, 1, None, None, None],
+        [3, 1, 'Top', 1, 1, None, None, None],
+    ]
+    statcast_csv = tmp_path / "statcast.csv"
+    pd.DataFrame(rows, columns=STATCAST_COLUMNS).to_csv(statcast_csv, index=False)
+    at_bats = StatcastAtBats(statcast_csv, game_pks=[1, 2])
+
+    # The first pitch of each at-bat, in at-bat order
+    game = at_bats.for_game(1)
+    assert game['at_bat_number'].tolist() == [1, 2]
+    assert game['pitch_number'].tolist() == [1, 1]
+    assert game['on_1b'].iloc[1] == 100
+    assert len(at_bats.for_game(2)) == 1
+    # Games that weren't asked for or aren't in Statcast have no at-bats, with the columns still there
+    assert at_bats.for_game(3).empty and at_bats.for_game(4).empty
+    assert list(at_bats.for_game(4).columns) == STATCAST_COLUMNS
+
+
+def test_at_bat_skeleton():
+    summary = pd.DataFrame([[1, 1, 'Top', 1, 1, None, None, None], [1, 1, 'Top', 2, 1, 100.0, None, 200.0],
+                            [1, 1, 'Top', 2, 2, None, None, None]], columns=STATCAST_COLUMNS)
+    skeleton = AtBatSkeleton(summary)
+
+    assert skeleton.bases_at(1, 'Top', 1) == (-1, -1, -1)
+    # The first row of an at-bat wins
+    assert skeleton.bases_at('1', 'Top', '2') == (100, -1, 200)
+    assert skeleton.bases_at(1, 'Bot', 3) is None
+
+    assert skeleton.add_at_bat({'inning': 1, 'inning_topbot': 'Bot', 'at_bat_number': 3, 'on_2b': 300,
+                                'on_3b': float('nan')})
+    assert skeleton.bases_at(1, 'Bot', 3) == (-1, 300, -1)
+    assert not skeleton.add_at_bat({'inning': 1, 'inning_topbot': 'Top', 'at_bat_number': 1, 'on_1b': 400})
+    assert skeleton.bases_at(1, 'Top', 1) == (-1, -1, -1)
+    assert AtBatSkeleton().bases_at(1, 'Top', 1) is None
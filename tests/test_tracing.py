@@ -0,0 +1,21 @@
+import pandas as pd
+
+import main
+from conftest import GAME_PKS, STATCAST_COLUMNS
+from tracing import Tracer
+
+
+def test_only_the_debug_game_is_recorded(games, monkeypatch, capsys):
+    debug_game_pk = GAME_PKS[1]
+    tracer = Tracer()
+    tracer.configure(debug_game_pk=debug_game_pk)
+    monkeypatch.setattr(main, 'tracer', tracer)
+    recorded = []
+    record = tracer.record
+    monkeypatch.setattr(tracer, 'record', lambda *args: recorded.append(tracer.game_pk) or record(*args))
+
+    for game_pk in GAME_PKS[:3]:
+        main.process_game(games[game_pk][0], pd.DataFrame(columns=STATCAST_COLUMNS))
+    assert {str(game_pk) for game_pk in recorded} == {str(debug_game_pk)}
+    dumps = [line for line in capsys.readouterr().err.splitlines() if line.startswith("=== Trace")]
+    assert len(dumps) == 1 and f"game {debug_game_pk}" in dumps[0]
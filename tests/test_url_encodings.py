@@ -0,0 +1,39 @@
+import json
+
+import pandas as pd
+
+from conftest import GAME_PKS, SCRAPED_DIR, URLS_CSV
+from url_encodings import parse_appearances, parse_game_encodings, parse_team_encodings
+
+
+def test_parse_team_encodings():
+    pitchers = "10(Top1)/11(Top7)"
+    batters = "/".join(f"{player_id}(Bot1)" for player_id in range(1, 10)) + "/20(Bot6)/21(Bot8)"
+    position_players = ("2(Top1)(c)-3(Top1)(1b)-4(Top1)(2b)-5(Top1)(3b)-6(Top1)(ss)-7(Top1)(lf)-8(Top1)(cf)-"
+                        "9(Top1)(rf)-20(Top7)(lf)-22(Top8)(c)")
+    team = parse_team_encodings(pitchers, batters, position_players)
+
+    assert team['lineup'] == list(range(1, 10))
+    assert team['bullpen'] == [10, 11]
+    # 20 batted before taking the field, 22 only came in on defense
+    assert team['sub_ins'] == [20, 21, 22]
+    assert team['position_map'] == {1: 'DH', 2: 'C', 3: '1B', 4: '2B', 5: '3B', 6: 'SS', 7: 'LF', 8: 'CF', 9: 'RF',
+                                    20: 'PH', 21: 'PH', 22: 'C'}
+    assert parse_appearances(float('nan')) == []
+
+
+def test_encodings_match_the_box_pages():
+    rows = pd.read_csv(URLS_CSV).set_index('game_pk', drop=False)
+    for game_pk in GAME_PKS:
+        with open(SCRAPED_DIR / f"game_{game_pk}.json") as f:
+            game_data = json.load(f)
+        seeded = parse_game_encodings(rows.loc[game_pk])
+        for team in ['away', 'home']:
+            for key in ['lineup', 'sub_ins', 'bullpen']:
+                assert seeded[f'{team}_{key}'] == [int(player_id) for player_id in game_data[f'{team}_{key}']], \
+                    (game_pk, team, key)
+            position_map = {int(player_id): position
+                            for player_id, position in game_data[f'{team}_position_map'].items()}
+            for player_id, position in seeded[f'{team}_position_map'].items():
+                # The encodings can't tell a pinch runner from a pinch hitter
+                assert position == position_map[player_id] or (position, position_map[player_id]) == ('PH', 'PR')
@@ -0,0 +1,64 @@
+import sys
+from collections import deque
+from game_state import Base
+
+
+class Tracer:
+    """
+    Keeps the state before each of the last few events of a game in a ring buffer, so a game that fails or that is
+    being debugged can be dumped without logging every event of every game.
+    Disabled by default, and then callers skip it entirely by checking enabled first.
+    With debug_game_pk only that game is recorded, the other games don't pay for building the trace and a failure
+    in one of them isn't traced. Without it every game is recorded and a failing game is dumped.
+    Callers check recording before recording an event.
+    """
+
+    def __init__(self, enabled=False, capacity=200, debug_game_pk=None):
+        self.enabled = enabled
+        self.debug_game_pk = debug_game_pk
+        self.buffer = deque(maxlen=capacity)
+        self.game_pk = None
+        # Whether the current game is one to record
+        self.recording = False
+
+    def configure(self, enabled=True, capacity=200, debug_game_pk=None):
+        self.enabled = enabled
+        self.debug_game_pk = debug_game_pk
+        self.buffer = deque(maxlen=capacity)
+        self.recording = False
+
+    def start_game(self, game_pk):
+        self.game_pk = game_pk
+        self.buffer.clear()
+        self.recording = self.enabled and (self.debug_game_pk is None or str(game_pk) == str(self.debug_game_pk))
+
+    def record(self, stage, event, game_state):
+        bases = game_state.bases_occupied
+        self.buffer.append((
+            stage, event['type'], event['description'], event['atbat_index'], event['outs_update'],
+            event['score_update'], game_state.inning, game_state.half.value, game_state.outs, game_state.at_bat,
+            game_state.score_home, game_state.score_away, bases[Base.FIRST], bases[Base.SECOND], bases[Base.THIRD],
+            game_state.home_pitcher, game_state.away_pitcher
+        ))
+
+    def end_game(self):
+        if self.recording and self.debug_game_pk is not None:
+            self.dump(f"debug game {self.game_pk}")
+        self.recording = False
+
+    def dump(self, reason, out=None):
+        """Write the buffered events to out, stderr by default, so the trace is there even with logging disabled"""
+        out = out or sys.stderr
+        out.write(f"=== Trace of the last {len(self.buffer)} events of game {self.game_pk} ({reason}) ===\n")
+        for (stage, event_type, description, atbat_index, outs_update, score_update, inning, half, outs, at_bat,
+             score_home, score_away, first, second, third, home_pitcher, away_pitcher) in self.buffer:
+            out.write(f"[{stage}] {event_type}: {description}\n")
+            out.write(f"  reported at bat {atbat_index}, outs {outs_update}, score {score_update}\n")
+            out.write(f"  state: {half} {inning}, at bat {at_bat}, {outs} outs, "
+                      f"home {score_home} - away {score_away}, bases 1B {first} 2B {second} 3B {third}, "
+                      f"pitchers home {home_pitcher} away {away_pitcher}\n")
+        out.write("=================\n")
+        out.flush()
+
+# Shared by main.py and anything that wants to record into the current game's trace
+tracer = Tracer()
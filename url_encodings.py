@@ -0,0 +1,76 @@
+import re
+
+# 664285(Top1) -> who and from which half-inning, for the *_pitchers and *_batters columns
+APPEARANCE_PATTERN = re.compile(r'(\d+)\((Top|Bot)(\d+)\)')
+# 455117(Top1)(c) -> the same plus the position taken, for the *_position_players columns
+POSITION_APPEARANCE_PATTERN = re.compile(r'(\d+)\((Top|Bot)(\d+)\)\(([^)]*)\)')
+
+
+def parse_appearances(encoded):
+    """[(player_id, half, inning)] in listed order, half being 'Top' or 'Bot'"""
+    if not isinstance(encoded, str):
+        return []
+    return [(int(player_id), half, int(inning)) for player_id, half, inning in APPEARANCE_PATTERN.findall(encoded)]
+
+
+def parse_position_appearances(encoded):
+    """[(player_id, half, inning, position)] in listed order, positions upper cased like the box page ('1B', 'C')"""
+    if not isinstance(encoded, str):
+        return []
+    return [(int(player_id), half, int(inning), position.upper())
+            for player_id, half, inning, position in POSITION_APPEARANCE_PATTERN.findall(encoded)]
+
+
+def _half_inning_key(half, inning):
+    return inning, 0 if half == 'Top' else 1
+
+
+def parse_team_encodings(pitchers, batters, position_players):
+    """
+    The lineup, substitutes, bullpen and position map of one team, the way the box page would list them.
+    The first nine batters to come up are the batting order. A substitute's position is the first one they had,
+    which is PH when they batted before they ever took the field.
+    """
+    bullpen = [player_id for player_id, _, _ in parse_appearances(pitchers)]
+
+    batter_entries = {}
+    for player_id, half, inning in parse_appearances(batters):
+        batter_entries.setdefault(player_id, _half_inning_key(half, inning))
+    lineup = list(batter_entries)[:9]
+
+    position_map = {}
+    fielder_entries = {}
+    for player_id, half, inning, position in parse_position_appearances(position_players):
+        if player_id not in fielder_entries:
+            fielder_entries[player_id] = _half_inning_key(half, inning)
+            position_map[player_id] = position
+
+    sub_ins = []
+    for player_id in list(batter_entries)[9:] + list(fielder_entries):
+        if player_id in lineup or player_id in sub_ins:
+            continue
+        sub_ins.append(player_id)
+        if player_id in batter_entries and batter_entries[player_id] < fielder_entries.get(player_id, (99, 0)):
+            position_map[player_id] = 'PH'
+
+    # A starter without a fielding position was the DH, or a pitcher hitting for himself (listed as P-DH)
+    for player_id in lineup:
+        if position_map.get(player_id) is None or fielder_entries[player_id] != min(fielder_entries.values()):
+            position_map[player_id] = 'P' if player_id in bullpen else 'DH'
+
+    return {'lineup': lineup, 'sub_ins': sub_ins, 'bullpen': bullpen,
+            'position_map': {player_id: position_map[player_id] for player_id in lineup + sub_ins}}
+
+
+def parse_game_encodings(row):
+    """
+    Lineups, substitutes, bullpens and position maps of both teams from a urls CSV row, keyed like GameData
+    (away_lineup, home_bullpen, ...). Everything the box page is loaded for except the player names.
+    """
+    seeded = {}
+    for team in ['away', 'home']:
+        team_data = parse_team_encodings(row[f'{team}_pitchers'], row[f'{team}_batters'],
+                                         row[f'{team}_position_players'])
+        for key, value in team_data.items():
+            seeded[f'{team}_{key}'] = value
+    return seeded